@@ -0,0 +1,44 @@
+"""
+Общие части очередей в базе данных: задач `api.jobs` и отправок событий
+`api.events`.
+
+Записи захватываются условным UPDATE без SELECT FOR UPDATE, поэтому
+захват одинаково безопасен в SQLite, PostgreSQL и MySQL: кандидаты
+выбираются без блокировок, а UPDATE повторно проверяет условие очереди
+и записывает токен захвата, так что каждую запись получает только один
+обработчик.
+"""
+import uuid
+from datetime import timedelta
+
+from django.utils import timezone
+
+
+def backoff(attempts, base, maximum):
+    """
+    Задержка перед следующей попыткой после `attempts` неудачных:
+    удваивается от `base` до `maximum` секунд.
+    """
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), maximum))
+
+
+def claim(pending, ordering, limit, lease_field, lease, **changes):
+    """
+    Захватывает до `limit` записей очереди `pending` в порядке `ordering`
+    и сдвигает `lease_field` на `lease` секунд вперёд: если обработчик
+    упадёт, записи снова станут доступны после окончания аренды.
+    Возвращает queryset захваченных записей.
+    """
+    model = pending.model
+    candidates = list(
+        pending.order_by(*ordering).values_list('pk', flat=True)[:limit]
+    )
+    if not candidates:
+        return model.objects.none()
+    token = uuid.uuid4().hex
+    pending.filter(pk__in=candidates).update(
+        claimed_by=token,
+        **{lease_field: timezone.now() + timedelta(seconds=lease)},
+        **changes,
+    )
+    return model.objects.filter(pk__in=candidates, claimed_by=token)
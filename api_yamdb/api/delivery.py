@@ -0,0 +1,219 @@
+"""
+Доставка кодов подтверждения через подключаемые транспорты.
+
+Транспорт выбирается настройкой CONFIRMATION_TRANSPORT: `smtp` (почта
+через EMAIL_BACKEND), `file` (файлы в CONFIRMATION_FILE_DIR) или `webhook`
+(POST на CONFIRMATION_WEBHOOK_URL). При CONFIRMATION_DELIVERY_JOBS коды
+отправляются задачами очереди `run_workers`, при CONFIRMATION_DELIVERY_ASYNC —
+фоновым пулом потоков пачками до CONFIRMATION_BATCH_SIZE, иначе — сразу
+в обработчике запроса; ошибка такой отправки возвращается клиенту
+ответом 503. Статус каждой доставки хранится в модели
+`ConfirmationDelivery`.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from reviews.models import ConfirmationDelivery, DeliveryStatus
+
+from .jobs import job
+
+logger = logging.getLogger(__name__)
+
+Message = namedtuple('Message', ('delivery_id', 'email', 'subject', 'body'))
+
+
+class DeliveryFailed(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Не удалось отправить код подтверждения, повторите позже.'
+    default_code = 'delivery_failed'
+
+
+class SMTPTransport:
+    """Отправляет пачку писем через одно соединение EMAIL_BACKEND."""
+
+    def send(self, messages):
+        from django.core.mail import EmailMessage, get_connection
+
+        connection = get_connection()
+        connection.send_messages([
+            EmailMessage(
+                message.subject,
+                message.body,
+                settings.EMAIL_FROM,
+                [message.email],
+                connection=connection,
+            )
+            for message in messages
+        ])
+
+
+class FileTransport:
+    """Складывает сообщения JSON-файлами; удобно для локальной работы."""
+
+    def send(self, messages):
+        os.makedirs(settings.CONFIRMATION_FILE_DIR, exist_ok=True)
+        for message in messages:
+            path = os.path.join(
+                settings.CONFIRMATION_FILE_DIR, f'{message.delivery_id}.json'
+            )
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump(message._asdict(), file, ensure_ascii=False)
+
+
+class WebhookTransport:
+    """Отправляет пачку сообщений одним POST-запросом."""
+
+    def send(self, messages):
+        import requests
+
+        response = requests.post(
+            settings.CONFIRMATION_WEBHOOK_URL,
+            json={'messages': [message._asdict() for message in messages]},
+            timeout=settings.CONFIRMATION_WEBHOOK_TIMEOUT,
+        )
+        response.raise_for_status()
+
+
+TRANSPORTS = {
+    'smtp': SMTPTransport,
+    'file': FileTransport,
+    'webhook': WebhookTransport,
+}
+
+
+def deliver(transport, messages, raise_errors=False):
+    """
+    Отправляет пачку и одним UPDATE отмечает её статус. С `raise_errors`
+    ошибка транспорта пробрасывается дальше, чтобы задача очереди
+    была повторена.
+    """
+    deliveries = ConfirmationDelivery.objects.filter(
+        pk__in=[message.delivery_id for message in messages]
+    )
+    try:
+        TRANSPORTS[transport]().send(messages)
+    except Exception as error:
+        logger.exception('Не удалось доставить коды через %s', transport)
+        deliveries.update(status=DeliveryStatus.failed.value, error=str(error))
+        if raise_errors:
+            raise
+        return
+    deliveries.update(
+        status=DeliveryStatus.sent.value, sent_at=timezone.now(), error=''
+    )
+
+
+def confirmation_message(delivery, confirmation_code):
+    return Message(
+        delivery.pk, delivery.email, 'Welcome to yamdb',
+        f'code: {confirmation_code}',
+    )
+
+
+@job(priority=10)
+def deliver_confirmation(delivery_id):
+    """
+    Задача очереди: создаёт код и отправляет его. В очереди хранится
+    только номер доставки, чтобы код не попадал в `Job.payload`.
+    """
+    from django.contrib.auth.tokens import PasswordResetTokenGenerator
+
+    delivery = ConfirmationDelivery.objects.select_related('user').filter(
+        pk=delivery_id
+    ).exclude(status=DeliveryStatus.sent.value).first()
+    if delivery is None:
+        return
+    confirmation_code = PasswordResetTokenGenerator().make_token(
+        delivery.user
+    )
+    deliver(
+        delivery.transport,
+        [confirmation_message(delivery, confirmation_code)],
+        raise_errors=True,
+    )
+
+
+class DeliveryDispatcher:
+    """
+    Фоновая отправка: на каждый транспорт своя очередь и
+    CONFIRMATION_WORKERS потоков, которые забирают сообщения пачками.
+    """
+
+    def __init__(self):
+        self.queues = {}
+        self.lock = threading.Lock()
+
+    def submit(self, transport, message):
+        self.get_queue(transport).put(message)
+
+    def get_queue(self, transport):
+        with self.lock:
+            if transport not in self.queues:
+                self.queues[transport] = queue.Queue()
+                for number in range(settings.CONFIRMATION_WORKERS):
+                    threading.Thread(
+                        target=self.work,
+                        args=(transport, self.queues[transport]),
+                        name=f'delivery-{transport}-{number}',
+                        daemon=True,
+                    ).start()
+            return self.queues[transport]
+
+    def work(self, transport, messages):
+        while True:
+            batch = [messages.get()]
+            while len(batch) < settings.CONFIRMATION_BATCH_SIZE:
+                try:
+                    batch.append(messages.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                deliver(transport, batch)
+            except Exception:
+                logger.exception('Ошибка фоновой доставки кодов')
+            finally:
+                close_old_connections()
+                for _ in batch:
+                    messages.task_done()
+
+    def join(self):
+        """Ждёт, пока все поставленные сообщения будут обработаны."""
+        for messages in list(self.queues.values()):
+            messages.join()
+
+
+dispatcher = DeliveryDispatcher()
+
+
+def send_confirmation_code(user, confirmation_code):
+    """
+    Регистрирует доставку кода и отправляет его выбранным транспортом.
+    При CONFIRMATION_DELIVERY_JOBS код заново создаёт задача очереди;
+    ошибка синхронной отправки поднимает DeliveryFailed.
+    """
+    transport = settings.CONFIRMATION_TRANSPORT
+    delivery = ConfirmationDelivery.objects.create(
+        user=user, email=user.email, transport=transport
+    )
+    if settings.CONFIRMATION_DELIVERY_JOBS:
+        deliver_confirmation.delay(delivery.pk)
+        return delivery
+    message = confirmation_message(delivery, confirmation_code)
+    if settings.CONFIRMATION_DELIVERY_ASYNC:
+        dispatcher.submit(transport, message)
+    else:
+        try:
+            deliver(transport, [message], raise_errors=True)
+        except Exception as error:
+            raise DeliveryFailed from error
+    return delivery
@@ -0,0 +1,203 @@
+"""
+Рассылка событий подписчикам.
+
+События `title.created`, `review.created` и `comment.created` ставятся
+в очередь `EventDelivery` после фиксации транзакции. Команда
+`deliver_events` забирает наступившие отправки, группирует их по
+подписчикам и отправляет пачками до EVENTS_BATCH_SIZE одним POST, не
+больше EVENTS_CONCURRENCY запросов одновременно. Неудачные отправки
+повторяются с экспоненциальной задержкой, после EVENTS_MAX_ATTEMPTS
+попыток событие помечается как `dead`. Доставка — «хотя бы один раз»:
+получатель должен различать повторы по `id` события.
+"""
+import hashlib
+import hmac
+import json
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from reviews.models import (
+    Comments,
+    EventDelivery,
+    EventStatus,
+    Review,
+    Subscriber,
+    Title,
+)
+
+from . import claims
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = 'X-Yamdb-Signature'
+
+
+def publish(event, payload):
+    """Ставит событие в очередь подписчикам после фиксации транзакции."""
+    transaction.on_commit(lambda: enqueue(event, payload))
+
+
+def enqueue(event, payload):
+    now = timezone.now()
+    data = json.dumps(payload, cls=DjangoJSONEncoder)
+    EventDelivery.objects.bulk_create(
+        EventDelivery(
+            subscriber=subscriber,
+            event=event,
+            payload=data,
+            next_attempt_at=now,
+        )
+        for subscriber in Subscriber.objects.filter(is_active=True)
+        if subscriber.wants(event)
+    )
+
+
+@receiver(post_save, sender=Title)
+def title_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        publish('title.created', {
+            'id': instance.pk,
+            'name': instance.name,
+            'year': instance.year,
+            'category_id': instance.category_id,
+        })
+
+
+@receiver(post_save, sender=Review)
+def review_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        publish('review.created', {
+            'id': instance.pk,
+            'title_id': instance.title_id,
+            'author_id': instance.author_id,
+            'score': instance.score,
+            'pub_date': instance.pub_date,
+        })
+
+
+@receiver(post_save, sender=Comments)
+def comment_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        publish('comment.created', {
+            'id': instance.pk,
+            'review_id': instance.review_id,
+            'author_id': instance.author_id,
+            'pub_date': instance.pub_date,
+        })
+
+
+def claim(limit):
+    """
+    Захватывает наступившие отправки на EVENTS_LEASE секунд, чтобы их
+    не взяли другие процессы; если процесс упадёт, отправки снова станут
+    доступны после этого срока.
+    """
+    pending = EventDelivery.objects.filter(
+        status=EventStatus.pending.value, next_attempt_at__lte=timezone.now()
+    )
+    return list(claims.claim(
+        pending, ('next_attempt_at',), limit,
+        'next_attempt_at', settings.EVENTS_LEASE,
+    ).select_related('subscriber'))
+
+
+def sign(secret, body):
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return f'sha256={digest}'
+
+
+def send_batch(subscriber, deliveries):
+    """Отправляет пачку событий подписчику и отмечает результат."""
+    import requests
+
+    body = json.dumps({'events': [
+        {
+            'id': delivery.pk,
+            'event': delivery.event,
+            'data': json.loads(delivery.payload),
+        }
+        for delivery in deliveries
+    ]}).encode()
+    headers = {'Content-Type': 'application/json'}
+    if subscriber.secret:
+        headers[SIGNATURE_HEADER] = sign(subscriber.secret, body)
+    try:
+        response = requests.post(
+            subscriber.url,
+            data=body,
+            headers=headers,
+            timeout=settings.EVENTS_TIMEOUT,
+        )
+        response.raise_for_status()
+    except Exception as error:
+        logger.warning(
+            'Не удалось отправить события %s: %s', subscriber, error
+        )
+        mark_failed(deliveries, str(error))
+    else:
+        claimed(deliveries).update(
+            status=EventStatus.sent.value,
+            attempts=F('attempts') + 1,
+            sent_at=timezone.now(),
+            error='',
+        )
+    finally:
+        close_old_connections()
+
+
+def claimed(deliveries):
+    """Отправки пачки, пока их не захватил другой процесс."""
+    return EventDelivery.objects.filter(
+        pk__in=[delivery.pk for delivery in deliveries],
+        claimed_by=deliveries[0].claimed_by,
+    )
+
+
+def mark_failed(deliveries, error):
+    """
+    Назначает повтор одним UPDATE на каждое число попыток; исчерпавшие
+    EVENTS_MAX_ATTEMPTS отправки переводятся в `dead`.
+    """
+    now = timezone.now()
+    groups = defaultdict(list)
+    for delivery in deliveries:
+        groups[delivery.attempts + 1].append(delivery)
+    for attempts, group in groups.items():
+        if attempts >= settings.EVENTS_MAX_ATTEMPTS:
+            changes = {'status': EventStatus.dead.value}
+        else:
+            changes = {'next_attempt_at': now + claims.backoff(
+                attempts, settings.EVENTS_RETRY_BASE,
+                settings.EVENTS_RETRY_MAX,
+            )}
+        claimed(group).update(attempts=attempts, error=error, **changes)
+
+
+def deliver_pending():
+    """Отправляет наступившие события; возвращает число обработанных."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    deliveries = claim(
+        settings.EVENTS_BATCH_SIZE * settings.EVENTS_CONCURRENCY
+    )
+    by_subscriber = defaultdict(list)
+    for delivery in deliveries:
+        by_subscriber[delivery.subscriber].append(delivery)
+    size = settings.EVENTS_BATCH_SIZE
+    batches = [
+        (subscriber, items[start:start + size])
+        for subscriber, items in by_subscriber.items()
+        for start in range(0, len(items), size)
+    ]
+    with ThreadPoolExecutor(settings.EVENTS_CONCURRENCY) as pool:
+        for _ in pool.map(lambda batch: send_batch(*batch), batches):
+            pass
+    return len(deliveries)
@@ -1,16 +1,15 @@
 import django_filters
+from django.db.models import Q
+from rest_framework import filters
 
-from reviews.models import Title
+from reviews.models import Title, TitleListing
+from .taxonomy import categories_cache, genres_cache
 
 
 class TitleFilter(django_filters.FilterSet):
     name = django_filters.CharFilter(field_name='name', lookup_expr='contains')
-    category = django_filters.CharFilter(
-        field_name='category__slug', lookup_expr='contains'
-    )
-    genre = django_filters.CharFilter(
-        field_name='genre__slug', lookup_expr='contains'
-    )
+    category = django_filters.CharFilter(method='filter_category')
+    genre = django_filters.CharFilter(method='filter_genre')
     year = django_filters.NumberFilter(
         field_name='year',
     )
@@ -23,3 +22,61 @@ class TitleFilter(django_filters.FilterSet):
             'category',
             'year',
         ]
+
+    def filter_category(self, queryset, name, value):
+        """Подходящие по slug категории находятся в кэше, без JOIN."""
+        return queryset.filter(
+            category__in=categories_cache.ids_containing(value)
+        )
+
+    def filter_genre(self, queryset, name, value):
+        """
+        Связи проверяются подзапросом, а не JOIN: произведение с
+        несколькими подходящими жанрами попадает в выдачу один раз.
+        """
+        links = Title.genre.through.objects.filter(
+            genres__in=genres_cache.ids_containing(value)
+        )
+        return queryset.filter(pk__in=links.values('title'))
+
+
+class TitleListingFilter(TitleFilter):
+    """Те же фильтры для витрины: поля и id у неё совпадают с Title."""
+
+    class Meta(TitleFilter.Meta):
+        model = TitleListing
+
+
+class TitleOrderingFilter(filters.OrderingFilter):
+    """
+    Сортировка произведений с добавлением `id` для устойчивой пагинации.
+
+    Сортировка по `rating` и `reviews_count` идёт по сохранённым полям
+    модели и покрывается составными индексами `(поле, id)`.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = list(super().get_ordering(request, queryset, view))
+        if not any(field.lstrip('-') == 'id' for field in ordering):
+            last = ordering[-1] if ordering else ''
+            ordering.append('-id' if last.startswith('-') else 'id')
+        return ordering
+
+
+class UserSearchFilter(filters.SearchFilter):
+    """
+    Поиск пользователей по началу username или email без учёта регистра.
+
+    Сравнение идёт с колонками в нижнем регистре, поэтому `LIKE 'abc%'`
+    использует их индексы вместо просмотра всей таблицы.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, '').strip()
+        if not term:
+            return queryset
+        term = term.lower()
+        return queryset.filter(
+            Q(username_normalized__startswith=term)
+            | Q(email_normalized__startswith=term)
+        )
@@ -0,0 +1,140 @@
+"""
+Очередь отложенных задач в базе данных.
+
+Функция, помеченная `@job`, ставится в очередь вызовом `.delay(...)`
+или `.enqueue(...)` с приоритетом и временем запуска, а выполняется
+командой `run_workers`. Задача записывается в транзакции обработчика
+запроса, поэтому при откате она не появится. Обработчик захватывает
+задачи условным UPDATE, который сдвигает `run_at` на JOBS_LEASE секунд
+вперёд: это одинаково безопасно в SQLite и PostgreSQL, а задачи упавшего
+обработчика снова станут доступны после окончания аренды. Неудачные
+задачи повторяются с растущей задержкой до `max_attempts` раз. Запуск —
+«хотя бы один раз», поэтому задачи должны быть идемпотентными.
+"""
+import functools
+import json
+import logging
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, connections
+from django.db.models import F
+from django.utils import timezone
+
+from reviews.models import Job, JobStatus
+
+from . import claims
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+class JobFunction:
+    """Функция, зарегистрированная как задача; вызов выполняет её сразу."""
+
+    def __init__(self, func, name, priority, max_attempts):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.name = name
+        self.priority = priority
+        self.max_attempts = max_attempts
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def delay(self, *args, **kwargs):
+        """Ставит вызов в очередь на ближайшее выполнение."""
+        return self.enqueue(args, kwargs)
+
+    def enqueue(self, args=(), kwargs=None, priority=None, run_at=None):
+        """Ставит вызов в очередь с приоритетом и временем запуска."""
+        payload = {'args': list(args), 'kwargs': kwargs or {}}
+        return Job.objects.create(
+            name=self.name,
+            payload=json.dumps(payload, cls=DjangoJSONEncoder),
+            priority=self.priority if priority is None else priority,
+            run_at=run_at or timezone.now(),
+            max_attempts=self.max_attempts or settings.JOBS_MAX_ATTEMPTS,
+        )
+
+
+def job(func=None, *, name=None, priority=0, max_attempts=None):
+    """
+    Регистрирует функцию как задачу: `@job` или `@job(priority=10)`.
+    Задачи с большим приоритетом выполняются раньше.
+    """
+    def register(func):
+        job_name = name or f'{func.__module__}.{func.__qualname__}'
+        registry[job_name] = JobFunction(
+            func, job_name, priority, max_attempts
+        )
+        return registry[job_name]
+
+    if func is None:
+        return register
+    return register(func)
+
+
+def claim(limit):
+    """
+    Захватывает до `limit` наступивших задач по приоритету; каждую задачу
+    получает только один обработчик.
+    """
+    pending = Job.objects.filter(
+        status=JobStatus.pending.value, run_at__lte=timezone.now()
+    )
+    return list(claims.claim(
+        pending, ('-priority', 'run_at'), limit,
+        'run_at', settings.JOBS_LEASE, attempts=F('attempts') + 1,
+    ).order_by('-priority', 'pk'))
+
+
+def run(job):
+    """Выполняет захваченную задачу и отмечает результат."""
+    claimed = Job.objects.filter(pk=job.pk, claimed_by=job.claimed_by)
+    try:
+        func = registry.get(job.name)
+        if func is None:
+            raise LookupError(f'Задача {job.name} не зарегистрирована')
+        payload = json.loads(job.payload)
+        func(*payload['args'], **payload['kwargs'])
+    except Exception as error:
+        logger.exception(
+            'Задача %s (%s) завершилась ошибкой', job.pk, job.name
+        )
+        if job.attempts >= job.max_attempts:
+            changes = {
+                'status': JobStatus.failed.value,
+                'finished_at': timezone.now(),
+            }
+        else:
+            changes = {'run_at': timezone.now() + claims.backoff(
+                job.attempts, settings.JOBS_RETRY_BASE,
+                settings.JOBS_RETRY_MAX,
+            )}
+        claimed.update(error=str(error), **changes)
+    else:
+        claimed.update(
+            status=JobStatus.done.value, finished_at=timezone.now(), error=''
+        )
+    finally:
+        close_old_connections()
+
+
+def work(stop, once=False):
+    """
+    Цикл обработчика: выполняет задачи по одной, пока не установлен
+    `stop`; с `once` завершается, когда наступивших задач не осталось.
+    """
+    try:
+        while not stop.is_set():
+            jobs = claim(1)
+            for claimed in jobs:
+                run(claimed)
+            if not jobs:
+                if once:
+                    return
+                stop.wait(settings.JOBS_POLL_INTERVAL)
+    finally:
+        connections.close_all()
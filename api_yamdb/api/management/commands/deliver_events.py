@@ -0,0 +1,37 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections
+
+from api.events import deliver_pending
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Отправляет события подписчикам из очереди.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Обработать наступившие события и завершиться',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                processed = deliver_pending()
+            except DatabaseError:
+                if options['once']:
+                    raise
+                # например, занятая база: отправки вернутся после аренды
+                logger.exception('Не удалось обработать очередь событий')
+                close_old_connections()
+                processed = 0
+            if options['once']:
+                self.stdout.write(f'Обработано событий: {processed}')
+                return
+            if not processed:
+                time.sleep(settings.EVENTS_POLL_INTERVAL)
@@ -0,0 +1,106 @@
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# холодный старт процесса: от `import django` до готового wsgi.application
+STARTUP = '''
+import sys
+import time
+start = time.perf_counter()
+import django
+django.setup()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+if {urls}:
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+print((time.perf_counter() - start) * 1000, len(sys.modules))
+'''
+
+
+def parse_importtime(output):
+    """Разбирает вывод `-X importtime` в список (модуль, self, cumulative)."""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or '[us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        modules.append((name.strip(), int(own), int(cumulative)))
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет холодный старт wsgi.application в отдельном процессе '
+        'и выводит самые медленные при импорте модули.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit', type=int, default=20,
+            help='Сколько модулей показать',
+        )
+        parser.add_argument(
+            '--sort', choices=('self', 'cumulative'), default='cumulative',
+            help='Сортировать по собственному или полному времени импорта',
+        )
+        parser.add_argument(
+            '--prefix', nargs='*', default=(),
+            help='Показывать только модули с этими префиксами, например api',
+        )
+        parser.add_argument(
+            '--urls', action='store_true',
+            help='Загружать и URLconf, как при первом запросе',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Сколько раз запускать процесс для замера времени старта',
+        )
+
+    def run(self, urls, importtime=False):
+        command = [sys.executable, '-W', 'ignore']
+        if importtime:
+            command += ['-X', 'importtime']
+        env = dict(
+            os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE
+        )
+        return subprocess.run(
+            command + ['-c', STARTUP.format(urls=urls)],
+            cwd=settings.BASE_DIR, env=env, check=True,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+
+    def handle(self, *args, **options):
+        # время старта меряется без -X importtime, который сам замедляет импорт
+        starts = [
+            self.run(options['urls']).stdout.split()
+            for _ in range(options['repeat'])
+        ]
+        startup = statistics.median(float(start[0]) for start in starts)
+        self.stdout.write(
+            f'Холодный старт wsgi.application: {startup:.1f} мс '
+            f'(медиана из {options["repeat"]}), модулей: {starts[0][1]}'
+        )
+        modules = parse_importtime(
+            self.run(options['urls'], importtime=True).stderr
+        )
+        if options['prefix']:
+            modules = [
+                module for module in modules
+                if module[0] in options['prefix']
+                or module[0].startswith(
+                    tuple(f'{prefix}.' for prefix in options['prefix'])
+                )
+            ]
+        column = 1 if options['sort'] == 'self' else 2
+        modules.sort(key=lambda module: module[column], reverse=True)
+        self.stdout.write(f'{"self, мс":>10} {"всего, мс":>10}  модуль')
+        for name, own, cumulative in modules[:options['limit']]:
+            self.stdout.write(
+                f'{own / 1000:>10.1f} {cumulative / 1000:>10.1f}  {name}'
+            )
@@ -0,0 +1,71 @@
+import multiprocessing
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from api.jobs import work
+
+
+def work_in_process(once):
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *args: stop.set())
+    work(stop, once)
+
+
+class Command(BaseCommand):
+    help = 'Выполняет отложенные задачи из очереди.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=settings.JOBS_CONCURRENCY,
+            help='Число обработчиков',
+        )
+        parser.add_argument(
+            '--processes', action='store_true',
+            help='Запускать обработчики процессами, а не потоками',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить наступившие задачи и завершиться',
+        )
+
+    def handle(self, *args, **options):
+        start = self.processes if options['processes'] else self.threads
+        workers, stop = start(options['concurrency'], options['once'])
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda *args: stop())
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            stop()
+            for worker in workers:
+                worker.join()
+        self.stdout.write('Обработчики задач остановлены')
+
+    def threads(self, concurrency, once):
+        event = threading.Event()
+        workers = [
+            threading.Thread(target=work, args=(event, once))
+            for _ in range(concurrency)
+        ]
+        return workers, event.set
+
+    def processes(self, concurrency, once):
+        # дочерние процессы не должны наследовать соединения с БД
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        workers = [
+            context.Process(target=work_in_process, args=(once,))
+            for _ in range(concurrency)
+        ]
+
+        def stop():
+            for worker in workers:
+                worker.terminate()
+        return workers, stop
@@ -0,0 +1,139 @@
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def parse_accept_encoding(header):
+    """Разбирает Accept-Encoding в словарь {кодировка: вес}."""
+    accepted = {}
+    for part in header.lower().split(','):
+        coding, _, params = part.partition(';')
+        name, _, value = params.partition('=')
+        quality = 1.0
+        if name.strip() == 'q':
+            try:
+                quality = float(value)
+            except ValueError:
+                continue
+        if coding.strip():
+            accepted[coding.strip()] = quality
+    return accepted
+
+
+def quality(accepted, coding):
+    return accepted.get(coding, accepted.get('*', 0))
+
+
+def gzip_compressor():
+    return zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+
+class GzipEncoder:
+    name = 'gzip'
+
+    @staticmethod
+    def compress(content):
+        compressor = gzip_compressor()
+        return compressor.compress(content) + compressor.flush()
+
+    @staticmethod
+    def compress_sequence(sequence):
+        compressor = gzip_compressor()
+        for item in sequence:
+            data = compressor.compress(item) + compressor.flush(
+                zlib.Z_SYNC_FLUSH
+            )
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+class BrotliEncoder:
+    name = 'br'
+
+    @staticmethod
+    def compress(content):
+        return brotli.compress(
+            content, quality=settings.COMPRESSION_BROTLI_QUALITY
+        )
+
+    @staticmethod
+    def compress_sequence(sequence):
+        compressor = brotli.Compressor(
+            quality=settings.COMPRESSION_BROTLI_QUALITY
+        )
+        for item in sequence:
+            data = compressor.process(item) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+
+
+ENCODERS = (BrotliEncoder, GzipEncoder) if brotli else (GzipEncoder,)
+
+
+def choose_encoder(accepted):
+    """
+    Кодировка с наибольшим весом клиента; при равных весах — первая
+    в ENCODERS, то есть br раньше gzip.
+    """
+    encoder = max(ENCODERS, key=lambda item: quality(accepted, item.name))
+    if quality(accepted, encoder.name) > 0:
+        return encoder
+    return None
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Сжимает ответы API в br или gzip по заголовку Accept-Encoding.
+
+    Сжимаются только ответы с типом из COMPRESSION_CONTENT_TYPES и не
+    короче COMPRESSION_MIN_SIZE байт, потоковые ответы — по мере отдачи.
+    Brotli используется, если установлен пакет brotli и клиент его
+    поддерживает.
+    """
+
+    def process_response(self, request, response):
+        content_type = response.get('Content-Type', '').partition(';')[0]
+        if content_type.strip() not in settings.COMPRESSION_CONTENT_TYPES:
+            return response
+        if (
+            not response.streaming
+            and len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+        if response.has_header('Content-Encoding'):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accepted = parse_accept_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        encoder = choose_encoder(accepted)
+        if encoder is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = encoder.compress_sequence(
+                response.streaming_content
+            )
+            del response['Content-Length']
+        else:
+            compressed_content = encoder.compress(response.content)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response['Content-Length'] = str(len(response.content))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoder.name
+        return response
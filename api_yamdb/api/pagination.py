@@ -0,0 +1,164 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from reviews.paginators import EstimatedCountPaginator
+
+
+class KeysetPagination(BasePagination):
+    """
+    Пагинация по ключу: страница — строки с `id` больше значения `since`.
+    В отличие от смещения стоимость запроса не растёт с номером страницы.
+    """
+
+    cursor_query_param = 'since'
+    limit_query_param = 'limit'
+    default_limit = 100
+    max_limit = 1000
+
+    def get_int(self, request, param, default):
+        value = request.query_params.get(param)
+        if value is None:
+            return default
+        try:
+            value = int(value)
+        except ValueError:
+            value = -1
+        if value < 0:
+            raise ValidationError(
+                {param: ['Ожидается неотрицательное целое число']}
+            )
+        return value
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.since = self.get_int(request, self.cursor_query_param, 0)
+        self.limit = min(
+            self.get_int(request, self.limit_query_param, self.default_limit)
+            or self.default_limit,
+            self.max_limit,
+        )
+        page = list(
+            queryset.filter(pk__gt=self.since).order_by('pk')[:self.limit + 1]
+        )
+        self.has_next = len(page) > self.limit
+        page = page[:self.limit]
+        self.last = page[-1].pk if page else self.since
+        return page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.last,
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'last': self.last,
+            'results': data,
+        })
+
+
+class CountedKeysetPagination(KeysetPagination):
+    """
+    Пагинация по `id` в формате ответа LimitOffsetPagination. `count`
+    считается не дальше `EstimatedCountPaginator.count_limit` строк, на
+    больших таблицах — по статистике PostgreSQL; `previous` не
+    поддерживается. Параметр `offset` отклоняется, чтобы клиент, листающий
+    смещением, не получал бесконечно первую страницу.
+    """
+
+    default_limit = 10
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if 'offset' in request.query_params:
+            raise ValidationError({'offset': [
+                'Параметр не поддерживается: следующая страница '
+                'запрашивается по ссылке `next` (параметр `since`)'
+            ]})
+        self.count = EstimatedCountPaginator(queryset.order_by('pk'), 1).count
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.count,
+            'next': self.get_next_link(),
+            'previous': None,
+            'results': data,
+        })
+
+
+class DateKeysetPagination(KeysetPagination):
+    """
+    Пагинация по ключу `(pub_date, id)` от новых записей к старым.
+
+    Курсор `cursor` — непрозрачная строка с ключом последней записи
+    страницы; следующая страница читается по составному индексу с этого
+    места, поэтому глубокие страницы не дороже первой.
+    """
+
+    cursor_query_param = 'cursor'
+    default_limit = 20
+    max_limit = 100
+
+    @staticmethod
+    def get_key(item):
+        if isinstance(item, dict):
+            return item['pub_date'], item['pk']
+        return item.pub_date, item.pk
+
+    @staticmethod
+    def encode_cursor(key):
+        pub_date, pk = key
+        value = f'{pub_date.isoformat()}|{pk}'
+        return urlsafe_b64encode(value.encode()).decode()
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor is None:
+            return None
+        try:
+            pub_date, pk = (
+                urlsafe_b64decode(cursor.encode()).decode().split('|')
+            )
+            key = parse_datetime(pub_date), int(pk)
+        except ValueError:
+            key = None, None
+        if key[0] is None:
+            raise ValidationError(
+                {self.cursor_query_param: ['Неверный курсор']}
+            )
+        return key
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        key = self.decode_cursor(request)
+        self.limit = min(
+            self.get_int(request, self.limit_query_param, self.default_limit)
+            or self.default_limit,
+            self.max_limit,
+        )
+        if key is not None:
+            pub_date, pk = key
+            queryset = queryset.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+            )
+        page = list(queryset.order_by('-pub_date', '-pk')[:self.limit + 1])
+        self.has_next = len(page) > self.limit
+        page = page[:self.limit]
+        self.last = None
+        if page:
+            self.last = self.encode_cursor(self.get_key(page[-1]))
+        return page
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
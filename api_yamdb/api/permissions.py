@@ -34,6 +34,17 @@ class IsAdminOrReadOnly(permissions.BasePermission):
         )
 
 
+class IsAdminOrModerator(permissions.BasePermission):
+    """
+    Разрешение доступа только для администратора и модератора.
+    """
+
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and (
+            request.user.is_admin or request.user.is_moderator
+        )
+
+
 class AdminOnly(permissions.BasePermission):
     """
     Разрешение на редактирование только для администратора.
@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+UTF8_ENCODINGS = ('utf-8', 'utf8')
+
+
+def orjson_enabled():
+    """
+    Выбирает бэкенд по настройке JSON_BACKEND: `auto` — orjson, если он
+    установлен, `orjson` — только orjson, `json` — стандартная библиотека.
+    """
+    backend = getattr(settings, 'JSON_BACKEND', 'auto')
+    if backend == 'json':
+        return False
+    if orjson is None:
+        if backend == 'orjson':
+            raise ImproperlyConfigured(
+                'JSON_BACKEND = "orjson", но пакет orjson не установлен'
+            )
+        return False
+    return True
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """
+    JSON-рендерер с подключаемым бэкендом.
+
+    Даты, Decimal и ленивые строки переводов кодируются тем же
+    `JSONEncoder.default`, что и в DRF, поэтому ответ совпадает побайтно.
+    Ответы с отступами рендерятся стандартной библиотекой.
+    """
+
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            data is None
+            or not orjson_enabled()
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder.default, option=ORJSON_OPTIONS
+            )
+        except orjson.JSONEncodeError:
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        # как и DRF, экранируем \u2028 и \u2029 для совместимости с JS
+        ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028')
+        return ret.replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class JSONParser(parsers.JSONParser):
+    """JSON-парсер с тем же выбором бэкенда, что и у `JSONRenderer`."""
+
+    renderer_class = JSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if not orjson_enabled():
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            data = stream.read()
+            if encoding.lower() not in UTF8_ENCODINGS:
+                data = data.decode(encoding)
+            return orjson.loads(data)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -1,10 +1,171 @@
+import json
+import math
+
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
 from django.forms import ValidationError
 
 from rest_framework import serializers
-from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import MANY_RELATION_KWARGS
+from rest_framework.settings import api_settings
 from django.core.validators import RegexValidator
 
-from reviews.models import Comments, Review, Title, User, Categories, Genres
+from reviews.models import (
+    Change,
+    Comments,
+    Review,
+    Title,
+    TitleListing,
+    User,
+    Categories,
+    Genres,
+    Visibility,
+)
+from .taxonomy import categories_cache, genres_cache
+
+
+def parse_query_list(request, param):
+    """
+    Возвращает множество имён из параметра запроса вида `?fields=a,b`
+    или None, если параметр не передан.
+    """
+    if request is None or param not in request.query_params:
+        return None
+    return {
+        name.strip()
+        for name in request.query_params[param].split(',')
+        if name.strip()
+    }
+
+
+class SparseFieldsetMixin:
+    """
+    Ограничивает поля ответа параметром `?fields=`, а раскрытие вложенных
+    объектов — параметром `?expand=`. Параметры действуют только на чтение:
+    при записи сериализатор проверяет все поля.
+
+    `optimize_queryset` сужает запрос к БД под те же поля: невостребованные
+    колонки откладываются через `only()`, связи не подгружаются.
+    """
+
+    # поле сериализатора -> поля модели для only()
+    only_fields = {}
+    # поле сериализатора -> связь для select_related()
+    select_fields = {}
+    # поле сериализатора -> связь для prefetch_related()
+    prefetch_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is not None and request.method not in SAFE_METHODS:
+            return
+        fields = parse_query_list(request, 'fields')
+        if fields is not None:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+        expand = parse_query_list(request, 'expand')
+        if expand is not None:
+            for name, field in self.get_collapsed_fields().items():
+                if name in self.fields and name not in expand:
+                    self.fields[name] = field
+
+    def get_collapsed_fields(self):
+        """Поля, которыми заменяются нераскрытые вложенные объекты."""
+        return {}
+
+    @classmethod
+    def optimize_queryset(cls, queryset, request):
+        fields = parse_query_list(request, 'fields')
+        names = [
+            name for name in cls.Meta.fields
+            if fields is None or name in fields
+        ]
+        select = [
+            cls.select_fields[name] for name in names
+            if name in cls.select_fields
+        ]
+        prefetch = [
+            cls.prefetch_fields[name] for name in names
+            if name in cls.prefetch_fields
+        ]
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        if fields is None:
+            return queryset
+        only = ['pk']
+        for name in names:
+            only.extend(cls.only_fields.get(name, (name,)))
+        return queryset.only(*only)
+
+
+class ValuesRepresentationMixin:
+    """
+    Быстрый путь для списков: ответ собирается напрямую из строк `values()`
+    без создания экземпляров моделей и обхода полей DRF.
+
+    Результат совпадает с `to_representation`: для простых полей
+    используются заранее подготовленные `to_representation` полей
+    сериализатора, связи читаются готовыми значениями из `values()`.
+    """
+
+    # поле сериализатора -> путь для values(); None — поле вложенное
+    value_paths = {}
+
+    @classmethod
+    def supports_values_path(cls, request):
+        return (
+            parse_query_list(request, 'fields') is None
+            and parse_query_list(request, 'expand') is None
+        )
+
+    @classmethod
+    def get_value_fields(cls):
+        """Список троек (поле, путь в values(), преобразование)."""
+        if '_value_fields' not in cls.__dict__:
+            value_fields = []
+            for name, field in cls().fields.items():
+                path = cls.value_paths.get(name, name)
+                if path is None or isinstance(
+                    field, serializers.RelatedField
+                ):
+                    convert = None
+                else:
+                    convert = field.to_representation
+                value_fields.append((name, path, convert))
+            cls._value_fields = value_fields
+        return cls._value_fields
+
+    @classmethod
+    def values_queryset(cls, queryset, *extra):
+        paths = [path for _, path, _ in cls.get_value_fields() if path]
+        return queryset.prefetch_related(None).values('pk', *paths, *extra)
+
+    @classmethod
+    def get_nested_values(cls, rows):
+        """Значения вложенных полей: {поле: {pk: значение}}."""
+        return {}
+
+    @classmethod
+    def represent_rows(cls, rows):
+        value_fields = cls.get_value_fields()
+        nested = cls.get_nested_values(rows)
+        data = []
+        for row in rows:
+            item = {}
+            for name, path, convert in value_fields:
+                if path is None:
+                    item[name] = nested[name][row['pk']]
+                    continue
+                value = row[path]
+                if value is not None and convert is not None:
+                    value = convert(value)
+                item[name] = value
+            data.append(item)
+        return data
 
 
 class SendEmailSerializer(serializers.Serializer):
@@ -47,7 +208,34 @@ class SendTokenSerializer(serializers.Serializer):
         fields = ('username', 'confirmation_code')
 
 
-class UserSerializer(serializers.ModelSerializer):
+class ModerationSerializer(serializers.Serializer):
+    """Сериализатор массовой модерации отзывов и комментариев."""
+
+    author = serializers.SlugRelatedField(
+        slug_field='username', queryset=User.objects.all(), required=False
+    )
+    reviews = serializers.ListField(
+        child=serializers.IntegerField(), required=False, max_length=1000
+    )
+    comments = serializers.ListField(
+        child=serializers.IntegerField(), required=False, max_length=1000
+    )
+    visibility = serializers.ChoiceField(
+        choices=(Visibility.hidden.value, Visibility.deleted.value),
+        default=Visibility.deleted.value,
+    )
+
+    def validate(self, attrs):
+        if not any(attrs.get(name) for name in (
+            'author', 'reviews', 'comments'
+        )):
+            raise ValidationError(
+                'Укажите автора или список отзывов и комментариев'
+            )
+        return attrs
+
+
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Сериализатор данных пользователя"""
 
     class Meta:
@@ -78,9 +266,21 @@ class UserNotAdminSerializer(serializers.ModelSerializer):
         read_only_fields = ('role',)
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(
+    SparseFieldsetMixin,
+    ValuesRepresentationMixin,
+    serializers.ModelSerializer,
+):
     """Класс для преобразования данных отзыва."""
 
+    value_paths = {'title': 'title__name', 'author': 'author__username'}
+
+    only_fields = {
+        'title': ('title', 'title__name'),
+        'author': ('author', 'author__username'),
+    }
+    select_fields = {'title': 'title', 'author': 'author'}
+
     title = serializers.SlugRelatedField(
         slug_field='name',
         read_only=True,
@@ -93,24 +293,52 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        fields = ('id', 'title', 'text', 'author', 'score', 'pub_date')
+        fields = (
+            'id',
+            'title',
+            'text',
+            'author',
+            'score',
+            'pub_date',
+            'comments_count',
+            'last_comment_at',
+        )
 
-    def validate(self, attr):
-        request = self.context['request']
-        if request.method != 'POST':
-            return attr
-        author = request.user
-        title_id = self.context['view'].kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        if Review.objects.filter(title=title, author=author).exists():
-            raise serializers.ValidationError(
-                'Вы уже оставили отзыв на данное произведение'
-            )
-        return attr
+    def create(self, validated_data):
+        """
+        Повторный отзыв отсекается ограничением `unique_review` в БД,
+        а не предварительным запросом, поэтому одновременные запросы
+        не создают дубликатов. Существующий отзыв проверяется только после
+        ошибки, остальные нарушения целостности пробрасываются дальше.
+        """
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            duplicate = Review.all_objects.filter(
+                author=validated_data['author'],
+                title=validated_data['title'],
+            ).exclude(visibility=Visibility.deleted.value).exists()
+            if not duplicate:
+                raise
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Вы уже оставили отзыв на данное произведение'
+                ]
+            })
+
+
+class CommentsSerializer(
+    SparseFieldsetMixin,
+    ValuesRepresentationMixin,
+    serializers.ModelSerializer,
+):
+    """Класс для преобразования данных комментария."""
 
+    value_paths = {'author': 'author__username'}
 
-class CommentsSerializer(serializers.ModelSerializer):
-    """Класс для преобразования данных комментария."""
+    only_fields = {'author': ('author', 'author__username')}
+    select_fields = {'author': 'author'}
 
     author = serializers.SlugRelatedField(
         slug_field='username', read_only=True
@@ -121,6 +349,53 @@ class CommentsSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'pub_date')
 
 
+class UserReviewSerializer(
+    ValuesRepresentationMixin,
+    serializers.ModelSerializer,
+):
+    """Отзыв в истории пользователя: с id и названием произведения."""
+
+    value_paths = {'title_id': 'title', 'title': 'title__name'}
+
+    title_id = serializers.IntegerField(read_only=True)
+    title = serializers.SlugRelatedField(slug_field='name', read_only=True)
+
+    class Meta:
+        model = Review
+        fields = (
+            'id',
+            'title_id',
+            'title',
+            'text',
+            'score',
+            'pub_date',
+            'comments_count',
+        )
+
+
+class UserCommentSerializer(
+    ValuesRepresentationMixin,
+    serializers.ModelSerializer,
+):
+    """Комментарий в истории пользователя: с отзывом и произведением."""
+
+    value_paths = {
+        'review_id': 'review',
+        'title_id': 'review__title',
+        'title': 'review__title__name',
+    }
+
+    review_id = serializers.IntegerField(read_only=True)
+    title_id = serializers.IntegerField(
+        source='review.title_id', read_only=True
+    )
+    title = serializers.CharField(source='review.title.name', read_only=True)
+
+    class Meta:
+        model = Comments
+        fields = ('id', 'review_id', 'title_id', 'title', 'text', 'pub_date')
+
+
 class CategoriesSerializer(serializers.ModelSerializer):
     """Класс сериализатор категории."""
 
@@ -137,8 +412,32 @@ class GenresSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
-    rating = serializers.IntegerField()
+class RatingField(serializers.ReadOnlyField):
+    """
+    Средняя оценка, округлённая до целого: половина округляется вверх
+    (3.5 → 4), а не отбрасывается, как в IntegerField.
+    """
+
+    def to_representation(self, value):
+        return math.floor(value + 0.5)
+
+
+class TitleReadSerializer(
+    SparseFieldsetMixin,
+    ValuesRepresentationMixin,
+    serializers.ModelSerializer,
+):
+    value_paths = {'genre': None, 'category': None}
+    only_fields = {
+        'genre': (),
+        'category': ('category', 'category__name', 'category__slug'),
+    }
+    select_fields = {'category': 'category'}
+    prefetch_fields = {
+        'genre': Prefetch('genre', queryset=Genres.objects.order_by('pk')),
+    }
+
+    rating = RatingField()
 
     genre = GenresSerializer(many=True, read_only=True)
     category = CategoriesSerializer(many=False, read_only=True)
@@ -164,15 +463,172 @@ class TitleReadSerializer(serializers.ModelSerializer):
             'category',
         )
 
+    def get_collapsed_fields(self):
+        return {
+            'genre': serializers.SlugRelatedField(
+                slug_field='slug', many=True, read_only=True
+            ),
+            'category': serializers.SlugRelatedField(
+                slug_field='slug', read_only=True
+            ),
+        }
+
+    @classmethod
+    def values_queryset(cls, queryset):
+        return super().values_queryset(queryset, 'category')
+
+    @classmethod
+    def get_nested_values(cls, rows):
+        """Жанры и категории берутся из кэша, из БД — только связи."""
+        genres = {row['pk']: [] for row in rows}
+        if genres:
+            links = Title.genre.through.objects.filter(
+                title__in=genres
+            ).order_by('genres').values_list('title', 'genres')
+            for title_id, genre_id in links:
+                genre = genres_cache.get(genre_id)
+                if genre is not None:
+                    genres[title_id].append(
+                        {'name': genre.name, 'slug': genre.slug}
+                    )
+        categories = {}
+        for row in rows:
+            category = categories_cache.get(row['category'])
+            categories[row['pk']] = None if category is None else {
+                'name': category.name, 'slug': category.slug,
+            }
+        return {'genre': genres, 'category': categories}
+
+
+class JSONTextField(serializers.ReadOnlyField):
+    """Значение, хранящееся в базе строкой JSON."""
+
+    def to_representation(self, value):
+        return json.loads(value)
+
+
+class GenreSlugsField(JSONTextField):
+    """Только slug жанров из JSON витрины."""
+
+    def to_representation(self, value):
+        return [genre['slug'] for genre in super().to_representation(value)]
+
+
+class ListingCategoryField(serializers.Field):
+    """Категория, собранная из колонок витрины."""
+
+    def __init__(self, **kwargs):
+        kwargs.update(source='*', read_only=True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, listing):
+        if listing.category_slug is None:
+            return None
+        return {'name': listing.category_name, 'slug': listing.category_slug}
+
+
+class CachedManyRelatedField(serializers.ManyRelatedField):
+    """Список жанров: из БД читаются только id связей, объекты — из кэша."""
+
+    def get_attribute(self, instance):
+        manager = getattr(instance, self.source)
+        ids = manager.through.objects.filter(
+            **{manager.source_field_name: instance}
+        ).order_by(manager.target_field_name).values_list(
+            manager.target_field_name, flat=True
+        )
+        cache = self.child_relation.cache
+        return [obj for obj in map(cache.get, ids) if obj is not None]
+
+
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    """Поле slug жанра или категории, которое ищет объект в кэше."""
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return CachedManyRelatedField(**list_kwargs)
+
+    def __init__(self, cache, **kwargs):
+        self.cache = cache
+        super().__init__(
+            queryset=cache.model.objects.all(), slug_field='slug', **kwargs
+        )
+
+    def to_internal_value(self, data):
+        obj = self.cache.get_by_slug(str(data))
+        if obj is None:
+            self.fail('does_not_exist', slug_name='slug', value=str(data))
+        return obj
+
 
 class TitleCreateSerializer(serializers.ModelSerializer):
-    genre = serializers.SlugRelatedField(
-        queryset=Genres.objects.all(), slug_field='slug', many=True
-    )
-    category = serializers.SlugRelatedField(
-        queryset=Categories.objects.all(), slug_field='slug'
-    )
+    genre = CachedSlugRelatedField(genres_cache, many=True)
+    category = CachedSlugRelatedField(categories_cache)
 
     class Meta:
-        fields = '__all__'
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
         model = Title
+
+    def create(self, validated_data):
+        genres = validated_data.pop('genre')
+        title = Title.objects.create(**validated_data)
+        title.genre.add(*genres)
+        return title
+
+
+class ChangeSerializer(serializers.ModelSerializer):
+    """Сериализатор записи журнала изменений."""
+
+    sequence = serializers.IntegerField(source='id', read_only=True)
+
+    class Meta:
+        model = Change
+        fields = ('sequence', 'model', 'object_id', 'action', 'created')
+
+
+class TitleListingSerializer(
+    SparseFieldsetMixin,
+    ValuesRepresentationMixin,
+    serializers.ModelSerializer,
+):
+    """Произведение из витрины; ответ совпадает с TitleReadSerializer."""
+
+    value_paths = {'genre': 'genres', 'category': None}
+    only_fields = {
+        'genre': ('genres',),
+        'category': ('category_name', 'category_slug'),
+    }
+
+    rating = RatingField()
+    genre = JSONTextField(source='genres')
+    category = ListingCategoryField()
+
+    class Meta:
+        model = TitleListing
+        fields = TitleReadSerializer.Meta.fields
+        read_only_fields = fields
+
+    def get_collapsed_fields(self):
+        return {
+            'genre': GenreSlugsField(source='genres'),
+            'category': serializers.ReadOnlyField(source='category_slug'),
+        }
+
+    @classmethod
+    def values_queryset(cls, queryset):
+        return super().values_queryset(
+            queryset, 'category_name', 'category_slug'
+        )
+
+    @classmethod
+    def get_nested_values(cls, rows):
+        return {'category': {
+            row['pk']: None if row['category_slug'] is None else {
+                'name': row['category_name'], 'slug': row['category_slug'],
+            }
+            for row in rows
+        }}
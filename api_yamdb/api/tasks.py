@@ -0,0 +1,64 @@
+"""
+Задачи для `run_workers`: обслуживание, которое не должно выполняться
+в обработчике запроса. Их можно ставить в очередь из кода
+(`update_ratings.delay()`) или по расписанию (`.enqueue(run_at=...)`).
+"""
+from django.conf import settings
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews.models import (
+    Change,
+    ChangeAction,
+    Job,
+    JobStatus,
+    Review,
+    Title,
+    TitleListing,
+)
+
+from .jobs import job
+
+
+@job(priority=-10)
+def update_ratings(title_ids=None):
+    titles = Title.objects.all()
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+    titles.update_rating()
+    if title_ids is not None:
+        Change.objects.record(Title, title_ids, ChangeAction.updated)
+
+
+@job(priority=-10)
+def update_comments_stats():
+    Review.all_objects.update_comments_stats()
+
+
+@job(priority=-10)
+def refresh_title_listing(title_ids):
+    TitleListing.objects.refresh(title_ids)
+
+
+@job(priority=-20)
+def purge_deleted():
+    call_command('purge_deleted')
+
+
+@job(priority=-20)
+def compact_changes():
+    call_command('compact_changes')
+
+
+@job(priority=-20)
+def purge_jobs():
+    """Удаляет выполненные и окончательно упавшие задачи."""
+    Job.objects.filter(
+        status__in=[JobStatus.done.value, JobStatus.failed.value],
+        finished_at__lt=timezone.now() - settings.JOBS_RETENTION,
+    ).delete()
+
+
+@job(priority=-20)
+def purge_throttle_counters():
+    call_command('purge_throttle_counters')
@@ -0,0 +1,105 @@
+"""
+Кэш жанров и категорий в памяти процесса.
+
+Таблицы маленькие и меняются редко, поэтому каждый процесс держит их
+целиком: `slug → id` и `id → объект`. Актуальность проверяется по общей
+версии `CacheVersion` не чаще раза в TAXONOMY_CACHE_CHECK_INTERVAL
+секунд; при изменении жанра или категории версия увеличивается после
+фиксации транзакции, и остальные процессы перечитывают таблицу при
+следующей проверке.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from reviews.models import CacheVersion, Categories, Genres
+
+
+class TaxonomyCache:
+    """Кэш одной модели с полями `name` и `slug`."""
+
+    fields = ('id', 'name', 'slug')
+
+    def __init__(self, model):
+        self.model = model
+        self.key = model._meta.model_name
+        self.lock = threading.Lock()
+        self.version = None
+        self.checked = None
+        self.by_id = {}
+        self.by_slug = {}
+
+    def __deepcopy__(self, memo):
+        # Поля DRF копируются для каждого сериализатора, а кэш общий.
+        return self
+
+    def load(self):
+        now = time.monotonic()
+        interval = settings.TAXONOMY_CACHE_CHECK_INTERVAL
+        if self.checked is not None and now - self.checked < interval:
+            return
+        with self.lock:
+            version = CacheVersion.objects.current(self.key)
+            if version != self.version:
+                db = self.model.objects.db
+                by_id = {
+                    row[0]: self.model.from_db(db, self.fields, row)
+                    for row in self.model.objects.values_list(*self.fields)
+                }
+                self.by_id = by_id
+                self.by_slug = {obj.slug: obj for obj in by_id.values()}
+                self.version = version
+            self.checked = now
+
+    def lookup(self, mapping, key):
+        """
+        Ищет объект; при промахе один раз сверяет версию досрочно, чтобы
+        найти объект, только что созданный в другом процессе.
+        """
+        self.load()
+        if key not in getattr(self, mapping) and key is not None:
+            self.checked = None
+            self.load()
+        return getattr(self, mapping).get(key)
+
+    def get(self, pk):
+        return self.lookup('by_id', pk)
+
+    def get_by_slug(self, slug):
+        return self.lookup('by_slug', slug)
+
+    def ids_containing(self, value):
+        """
+        id объектов, в slug которых входит `value` без учёта регистра,
+        как при фильтре `icontains`.
+        """
+        self.load()
+        value = value.lower()
+        return [
+            obj.pk for slug, obj in self.by_slug.items()
+            if value in slug.lower()
+        ]
+
+    def reset(self):
+        self.version = None
+        self.checked = None
+
+    def invalidate(self, **kwargs):
+        """Сбрасывает кэш процесса и после фиксации увеличивает версию."""
+        self.reset()
+
+        def bump():
+            CacheVersion.objects.bump(self.key)
+            self.reset()
+        transaction.on_commit(bump)
+
+
+genres_cache = TaxonomyCache(Genres)
+categories_cache = TaxonomyCache(Categories)
+
+for cache in (genres_cache, categories_cache):
+    post_save.connect(cache.invalidate, sender=cache.model, weak=False)
+    post_delete.connect(cache.invalidate, sender=cache.model, weak=False)
@@ -0,0 +1,95 @@
+from django.conf import settings
+from django.db.models import F
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from reviews.models import ThrottleCounter
+
+ANON = 'anon'
+
+
+def get_role(user):
+    """Роль пользователя для выбора лимита: anon, user, moderator, admin."""
+    if not user or not user.is_authenticated:
+        return ANON
+    if user.is_admin:
+        return 'admin'
+    if user.is_moderator:
+        return 'moderator'
+    return 'user'
+
+
+class RoleRateThrottle(SimpleRateThrottle):
+    """
+    Ограничение частоты запросов по группе эндпоинтов и роли.
+
+    Группа задаётся атрибутом `throttle_scope` представления, лимит ищется
+    в `DEFAULT_THROTTLE_RATES` по ключу `<группа>.<роль>`, затем по роли;
+    `None` снимает ограничение. Счётчики хранятся в базе данных
+    `THROTTLE_DATABASE`, поэтому общие для всех процессов, а оценка
+    ведётся по скользящему окну из двух соседних фиксированных окон.
+    """
+
+    def __init__(self):
+        # Лимит зависит от запроса и выбирается в allow_request.
+        pass
+
+    def get_rate_for(self, scope, role):
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        key = f'{scope}.{role}'
+        if key in rates:
+            return rates[key]
+        return rates.get(role)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def allow_request(self, request, view):
+        group = getattr(view, 'throttle_scope', None) or 'default'
+        role = get_role(request.user)
+        self.scope = f'{group}.{role}'
+        self.rate = self.get_rate_for(group, role)
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.key = self.get_cache_key(request, view)
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        counters = ThrottleCounter.objects.using(settings.THROTTLE_DATABASE)
+        # решение принимается по счётчику, уже увеличенному этим запросом:
+        # одновременные запросы на границе лимита не проходят все разом
+        counters.hit(self.key, window, self.duration)
+        counts = dict(counters.filter(
+            key=self.key, window__in=(window - 1, window)
+        ).values_list('window', 'count'))
+        self.previous = counts.get(window - 1, 0)
+        self.current = counts.get(window, 0) - 1
+        self.elapsed = self.now - window * self.duration
+        weight = 1 - self.elapsed / self.duration
+        if self.previous * weight + self.current >= self.num_requests:
+            # отклонённый запрос не расходует лимит
+            counters.filter(key=self.key, window=window).update(
+                count=F('count') - 1
+            )
+            return self.throttle_failure()
+        return True
+
+    def wait(self):
+        """Время до момента, когда оценка опустится ниже лимита."""
+        if not self.num_requests:
+            # нулевой лимит закрывает эндпоинт: ожидание не поможет
+            return None
+        if self.current >= self.num_requests:
+            rest = self.duration - self.elapsed
+            return rest + self.duration * (
+                1 - self.num_requests / self.current
+            )
+        free = self.num_requests - self.current
+        return max(
+            0, self.duration * (1 - free / self.previous) - self.elapsed
+        )
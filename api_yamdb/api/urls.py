@@ -2,10 +2,12 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from .views import (
+    ChangeViewSet,
     CommentsViewSet,
     CategoriesViewSet,
     UserViewSet,
     GenresViewSet,
+    ModerationView,
     TitleViewSet,
     Registration,
     ReviewViewSet,
@@ -27,9 +29,11 @@ router.register(
 router.register('categories', CategoriesViewSet, basename='categories')
 router.register('genres', GenresViewSet, basename='genres')
 router.register('titles', TitleViewSet, basename='titles')
+router.register('changes', ChangeViewSet, basename='changes')
 
 urlpatterns = [
     path('v1/', include(router.urls)),
     path('v1/auth/signup/', Registration.as_view()),
     path('v1/auth/token/', SendToken.as_view()),
+    path('v1/moderation/', ModerationView.as_view()),
 ]
@@ -1,15 +1,14 @@
-from django.db import IntegrityError
-from django.contrib.auth.tokens import PasswordResetTokenGenerator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import OuterRef, Q, Subquery
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status, viewsets, filters
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.mixins import (
     CreateModelMixin,
@@ -17,11 +16,22 @@ from rest_framework.mixins import (
     ListModelMixin,
 )
 
-from reviews.models import Review, Title, User, Categories, Genres
-from api_yamdb.settings import EMAIL_FROM
+from reviews.models import (
+    Categories,
+    Change,
+    Comments,
+    ConfirmationAttempt,
+    Genres,
+    Review,
+    Title,
+    TitleListing,
+    User,
+    Visibility,
+)
 from .permissions import (
     AdminOnly,
     IsAdminModeratorOwnerOrReadOnly,
+    IsAdminOrModerator,
     IsAdminOrReadOnly,
 )
 from .serializers import (
@@ -34,9 +44,25 @@ from .serializers import (
     CategoriesSerializer,
     GenresSerializer,
     TitleCreateSerializer,
+    TitleListingSerializer,
     TitleReadSerializer,
+    ModerationSerializer,
+    ChangeSerializer,
+    UserCommentSerializer,
+    UserReviewSerializer,
+)
+from .delivery import send_confirmation_code
+from .filters import (
+    TitleFilter,
+    TitleListingFilter,
+    TitleOrderingFilter,
+    UserSearchFilter,
+)
+from .pagination import (
+    CountedKeysetPagination,
+    DateKeysetPagination,
+    KeysetPagination,
 )
-from .filters import TitleFilter
 
 
 class CreateListDestroyViewSet(
@@ -48,14 +74,86 @@ class CreateListDestroyViewSet(
     pass
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class SparseFieldsetViewMixin:
+    """Сужает запрос к БД под поля, запрошенные через `?fields=`."""
+
+    def get_queryset(self):
+        return self.optimize_queryset(super().get_queryset())
+
+    def optimize_queryset(self, queryset):
+        serializer_class = self.get_serializer_class()
+        if self.request.method != 'GET' or not hasattr(
+            serializer_class, 'optimize_queryset'
+        ):
+            return queryset
+        return serializer_class.optimize_queryset(queryset, self.request)
+
+
+class ValuesListMixin:
+    """
+    Отдаёт списки через быстрый путь сериализатора на строках `values()`,
+    если клиент не запросил `?fields=` или `?expand=`.
+    """
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        if not serializer_class.supports_values_path(request):
+            return super().list(request, *args, **kwargs)
+        queryset = serializer_class.values_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                serializer_class.represent_rows(page)
+            )
+        return Response(serializer_class.represent_rows(list(queryset)))
+
+
+class TitleParentMixin:
+    """
+    Загружает произведение из `title_id` один раз за запрос.
+
+    Используется представлением, сериализатором (через `context['view']`)
+    и разрешениями вложенных маршрутов.
+    """
+
+    def get_title(self):
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title, pk=self.kwargs.get('title_id')
+            )
+        return self._title
+
+
+class ReviewParentMixin:
+    """
+    Загружает отзыв из `review_id` вместе с произведением одним запросом,
+    проверяя, что отзыв относится к произведению из `title_id`.
+    """
+
+    def get_review(self):
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review.objects.select_related('title'),
+                pk=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id'),
+            )
+        return self._review
+
+    def get_title(self):
+        return self.get_review().title
+
+
+class UserViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     serializer_class = UserSerializer
     queryset = User.objects.all()
     permission_classes = (IsAuthenticated, AdminOnly)
-    pagination_class = LimitOffsetPagination
+    pagination_class = CountedKeysetPagination
     lookup_field = 'username'
-    filter_backend = filters.SearchFilter
-    search_fields = ('username',)
+    throttle_scope = 'users'
+    filter_backends = (UserSearchFilter, DjangoFilterBackend)
+    filterset_fields = ('role',)
 
     @action(
         methods=['GET', 'PATCH'],
@@ -79,13 +177,84 @@ class UserViewSet(viewsets.ModelViewSet):
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.data)
 
+    def history(self, author_id, model, serializer_class, **filters):
+        """
+        Записи автора от новых к старым; страницы читаются по индексу
+        `(author, pub_date, id)`, название произведения — через JOIN.
+        """
+        queryset = serializer_class.values_queryset(
+            model.objects.filter(author_id=author_id, **filters)
+        )
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(
+            serializer_class.represent_rows(page)
+        )
+
+    # комментарии к скрытым и удалённым отзывам недоступны, как и в
+    # /titles/{title_id}/reviews/{review_id}/comments/
+    visible_reviews = {'review__visibility': Visibility.visible.value}
+
+    def get_author_id(self, username):
+        return get_object_or_404(
+            User.objects.values_list('pk', flat=True), username=username
+        )
+
+    @action(
+        detail=True,
+        permission_classes=[AllowAny],
+        pagination_class=DateKeysetPagination,
+        filter_backends=[],
+    )
+    def reviews(self, request, username=None):
+        return self.history(
+            self.get_author_id(username), Review, UserReviewSerializer
+        )
+
+    @action(
+        detail=True,
+        permission_classes=[AllowAny],
+        pagination_class=DateKeysetPagination,
+        filter_backends=[],
+    )
+    def comments(self, request, username=None):
+        return self.history(
+            self.get_author_id(username), Comments, UserCommentSerializer,
+            **self.visible_reviews,
+        )
+
+    @action(
+        detail=False,
+        permission_classes=[IsAuthenticated],
+        pagination_class=DateKeysetPagination,
+        filter_backends=[],
+        url_path='me/reviews',
+    )
+    def my_reviews(self, request):
+        return self.history(request.user.pk, Review, UserReviewSerializer)
+
+    @action(
+        detail=False,
+        permission_classes=[IsAuthenticated],
+        pagination_class=DateKeysetPagination,
+        filter_backends=[],
+        url_path='me/comments',
+    )
+    def my_comments(self, request):
+        return self.history(
+            request.user.pk, Comments, UserCommentSerializer,
+            **self.visible_reviews,
+        )
+
 
 class Registration(APIView):
     """Первый этап регистрации"""
     permission_classes = [AllowAny]
+    throttle_scope = 'auth'
     pagination_class = LimitOffsetPagination
 
     def post(self, request):
+        from django.contrib.auth.tokens import PasswordResetTokenGenerator
+
         serializer = SendEmailSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         email = serializer.validated_data['email']
@@ -103,82 +272,148 @@ class Registration(APIView):
 
             return Response('Email занят', status.HTTP_400_BAD_REQUEST)
         confirmation_code = PasswordResetTokenGenerator().make_token(user)
-        send_mail(
-            'Welcome to yamdb',
-            f'code: {confirmation_code}',
-            EMAIL_FROM,
-            [email],
-            fail_silently=True,
-        )
+        send_confirmation_code(user, confirmation_code)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class SendToken(APIView):
     """Второй этап регистрации"""
     permission_classes = [AllowAny]
+    throttle_scope = 'auth'
     pagination_class = LimitOffsetPagination
 
     def post(self, request):
+        from django.contrib.auth.tokens import PasswordResetTokenGenerator
+        from rest_framework_simplejwt.tokens import RefreshToken
+
         serializer = SendTokenSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         username = serializer.validated_data['username']
         confirmation_code = serializer.validated_data['confirmation_code']
-        try:
-            user = get_object_or_404(
-                User,
-                username=username,
-            )
-        except User.DoesNotExist:
+        now = timezone.now()
+        window_start = now - settings.CONFIRMATION_LOCKOUT
+        recent_failures = ConfirmationAttempt.objects.filter(
+            username=OuterRef('username'), last_failure__gte=window_start
+        ).values('failures')
+        user = (
+            User.objects.annotate(recent_failures=Subquery(recent_failures))
+            .filter(username=username)
+            .first()
+        )
+        if user is None:
             return Response('Ошибка в username',
                             status=status.HTTP_404_NOT_FOUND)
+        failures = user.recent_failures or 0
+        if failures >= settings.CONFIRMATION_MAX_ATTEMPTS:
+            return Response('Слишком много попыток, повторите позже',
+                            status=status.HTTP_429_TOO_MANY_REQUESTS)
         if not PasswordResetTokenGenerator().check_token(user,
                                                          confirmation_code):
+            ConfirmationAttempt.objects.register_failure(
+                username, now, window_start
+            )
             return Response('Неверный код подтверждения',
                             status=status.HTTP_400_BAD_REQUEST)
+        if failures:
+            ConfirmationAttempt.objects.filter(username=username).delete()
         token = RefreshToken.for_user(user).access_token
-        user.is_active = True
-        user.save()
+        if not user.is_active:
+            user.is_active = True
+            user.save(update_fields=['is_active'])
         return Response(f'token: {str(token)}', status=status.HTTP_200_OK)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    TitleParentMixin,
+    ValuesListMixin,
+    SparseFieldsetViewMixin,
+    viewsets.ModelViewSet,
+):
     """Класс для работы с оценками."""
 
     serializer_class = ReviewSerializer
     permission_classes = [IsAdminModeratorOwnerOrReadOnly]
+    throttle_scope = 'reviews'
     pagination_class = LimitOffsetPagination
 
     def get_queryset(self):
-        title = get_object_or_404(Title, pk=self.kwargs.get('title_id'))
-        return title.reviews.all()
+        return self.optimize_queryset(self.get_title().reviews.all())
 
     def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, id=title_id)
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(author=self.request.user, title=self.get_title())
+
+    def perform_destroy(self, instance):
+        Review.objects.filter(pk=instance.pk).set_visibility(
+            Visibility.deleted
+        )
 
 
-class CommentsViewSet(viewsets.ModelViewSet):
+class CommentsViewSet(
+    ReviewParentMixin,
+    ValuesListMixin,
+    SparseFieldsetViewMixin,
+    viewsets.ModelViewSet,
+):
     """Класс для работы с комментариями."""
 
     serializer_class = CommentsSerializer
     permission_classes = [IsAdminModeratorOwnerOrReadOnly]
+    throttle_scope = 'reviews'
     pagination_class = LimitOffsetPagination
 
     def get_queryset(self):
-        review = get_object_or_404(Review, pk=self.kwargs.get('review_id'))
-        return review.comments.all()
+        return self.optimize_queryset(self.get_review().comments.all())
 
     def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id')
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, id=review_id, title=title_id)
-        serializer.save(author=self.request.user, review=review)
+        with transaction.atomic():
+            serializer.save(
+                author=self.request.user, review=self.get_review()
+            )
+
+    def perform_destroy(self, instance):
+        Comments.objects.filter(pk=instance.pk).set_visibility(
+            Visibility.deleted
+        )
+
+
+class ModerationView(APIView):
+    """
+    Массовое скрытие или удаление отзывов и комментариев: всех записей
+    автора или перечисленных по id. Видимость меняется набором запросов,
+    рейтинг и счётчики затронутых произведений и отзывов пересчитываются
+    один раз.
+    """
+    permission_classes = [IsAuthenticated, IsAdminOrModerator]
+    throttle_scope = 'reviews'
+
+    def post(self, request):
+        serializer = ModerationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        author = data.get('author')
+        comments = Q(pk__in=data.get('comments', []))
+        reviews = Q(pk__in=data.get('reviews', []))
+        if author is not None:
+            comments |= Q(author=author)
+            reviews |= Q(author=author)
+        visibility = Visibility(data['visibility'])
+        with transaction.atomic():
+            updated_comments = Comments.objects.filter(
+                comments
+            ).set_visibility(visibility)
+            updated_reviews = Review.objects.filter(
+                reviews
+            ).set_visibility(visibility)
+        return Response(
+            {'reviews': updated_reviews, 'comments': updated_comments},
+            status=status.HTTP_200_OK,
+        )
 
 
 class BaseCaregoriesGenresViewSet(CreateListDestroyViewSet):
     """Класс общих параметров для Жанров и Категорий"""
     permission_classes = (IsAdminOrReadOnly,)
+    throttle_scope = 'catalog'
     filter_backends = (filters.SearchFilter,)
     pagination_class = LimitOffsetPagination
     search_fields = ('=name',)
@@ -199,20 +434,64 @@ class GenresViewSet(BaseCaregoriesGenresViewSet):
     serializer_class = GenresSerializer
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(
+    ValuesListMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet
+):
     """Вьюсет для произведений"""
 
-    queryset = (
-        Title.objects.all()
-        .annotate(rating=Avg('reviews__score'))
-        .order_by('id')
-    )
-    filter_backends = [DjangoFilterBackend]
-    filterset_class = TitleFilter
+    queryset = Title.objects.all()
+    filter_backends = [DjangoFilterBackend, TitleOrderingFilter]
+    ordering_fields = ('rating', 'year', 'name', 'reviews_count')
+    ordering = ('id',)
     permission_classes = (IsAdminOrReadOnly,)
+    throttle_scope = 'catalog'
     pagination_class = LimitOffsetPagination
 
+    def use_read_model(self):
+        return settings.TITLES_READ_MODEL and self.request.method == 'GET'
+
+    @property
+    def filterset_class(self):
+        if self.use_read_model():
+            return TitleListingFilter
+        return TitleFilter
+
+    def get_queryset(self):
+        if self.use_read_model():
+            return self.optimize_queryset(TitleListing.objects.all())
+        return super().get_queryset()
+
     def get_serializer_class(self):
+        if self.use_read_model():
+            return TitleListingSerializer
         if self.request.method == 'GET':
             return TitleReadSerializer
         return TitleCreateSerializer
+
+
+class ChangeViewSet(ListModelMixin, viewsets.GenericViewSet):
+    """
+    Журнал изменений произведений, отзывов, комментариев, жанров и
+    категорий для инкрементальной синхронизации по `?since=`.
+
+    Курсор — автоинкрементный id записи, а транзакции могут фиксироваться
+    не в порядке id. Поэтому отдаются только записи до первой, созданной
+    позже CHANGES_COMMIT_LAG назад: транзакции с меньшими id к этому
+    времени уже зафиксированы, и курсор их не перешагнёт.
+    """
+
+    queryset = Change.objects.all()
+    serializer_class = ChangeSerializer
+    permission_classes = (AllowAny,)
+    pagination_class = KeysetPagination
+    throttle_scope = 'catalog'
+
+    def get_queryset(self):
+        cutoff = timezone.now() - settings.CHANGES_COMMIT_LAG
+        boundary = (
+            Change.objects.filter(created__gte=cutoff)
+            .order_by('pk').values_list('pk', flat=True).first()
+        )
+        if boundary is None:
+            return self.queryset.all()
+        return self.queryset.filter(pk__lt=boundary)
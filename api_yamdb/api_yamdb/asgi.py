@@ -1,7 +1,12 @@
 import os
 
-from django.core.asgi import get_asgi_application
-
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
+try:
+    from django.core.asgi import get_asgi_application
+except ImportError:
+    # Django 2.2 не поддерживает ASGI: обслуживаем WSGI-приложение
+    # через цикл событий и пул потоков.
+    from .asgi_adapter import get_asgi_application
+
 application = get_asgi_application()
@@ -20,6 +20,45 @@ EMAIL_FROM = os.getenv('EMAIL_FROM')
 EMAIL_PORT = os.getenv('EMAIL_PORT')
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
+
+# Доставка кодов подтверждения: транспорт smtp, file или webhook
+CONFIRMATION_TRANSPORT = os.getenv('CONFIRMATION_TRANSPORT', 'smtp')
+CONFIRMATION_DELIVERY_ASYNC = (
+    os.getenv('CONFIRMATION_DELIVERY_ASYNC', 'false').lower() == 'true'
+)
+CONFIRMATION_DELIVERY_JOBS = (
+    os.getenv('CONFIRMATION_DELIVERY_JOBS', 'false').lower() == 'true'
+)
+CONFIRMATION_WORKERS = int(os.getenv('CONFIRMATION_WORKERS', 4))
+CONFIRMATION_BATCH_SIZE = int(os.getenv('CONFIRMATION_BATCH_SIZE', 50))
+CONFIRMATION_FILE_DIR = os.getenv(
+    'CONFIRMATION_FILE_DIR', os.path.join(BASE_DIR, 'sent_codes')
+)
+CONFIRMATION_WEBHOOK_URL = os.getenv('CONFIRMATION_WEBHOOK_URL')
+CONFIRMATION_WEBHOOK_TIMEOUT = 5
+# Блокировка подбора кода: число неудачных попыток и окно блокировки
+CONFIRMATION_MAX_ATTEMPTS = 5
+CONFIRMATION_LOCKOUT = timedelta(minutes=15)
+# Рассылка событий подписчикам: размер пачки, число одновременных запросов,
+# повторы с задержкой от EVENTS_RETRY_BASE до EVENTS_RETRY_MAX секунд
+EVENTS_BATCH_SIZE = int(os.getenv('EVENTS_BATCH_SIZE', 100))
+EVENTS_CONCURRENCY = int(os.getenv('EVENTS_CONCURRENCY', 4))
+EVENTS_TIMEOUT = 5
+EVENTS_MAX_ATTEMPTS = 8
+EVENTS_RETRY_BASE = 30
+EVENTS_RETRY_MAX = 3600
+EVENTS_LEASE = 60
+EVENTS_POLL_INTERVAL = 1
+# Очередь задач run_workers: число обработчиков, аренда захваченной задачи
+# и повторы с задержкой от JOBS_RETRY_BASE до JOBS_RETRY_MAX секунд;
+# завершённые задачи старше JOBS_RETENTION удаляет задача purge_jobs
+JOBS_CONCURRENCY = int(os.getenv('JOBS_CONCURRENCY', 4))
+JOBS_LEASE = 300
+JOBS_MAX_ATTEMPTS = 5
+JOBS_RETRY_BASE = 30
+JOBS_RETRY_MAX = 3600
+JOBS_POLL_INTERVAL = 1
+JOBS_RETENTION = timedelta(days=int(os.getenv('JOBS_RETENTION_DAYS', 7)))
 # Application definition
 
 INSTALLED_APPS = [
@@ -30,7 +69,6 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'rest_framework',
-    'rest_framework.authtoken',
     'django_filters',
     'rest_framework_simplejwt',
     'api.apps.ApiConfig',
@@ -39,6 +77,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -47,6 +86,13 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Сжатие ответов: типы содержимого, минимальный размер тела в байтах
+# и уровни сжатия. HTML со CSRF-токенами не сжимается из-за атаки BREACH
+COMPRESSION_CONTENT_TYPES = ('application/json',)
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 4))
+
 ROOT_URLCONF = 'api_yamdb.urls'
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
@@ -68,6 +114,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
+# Число потоков для синхронных представлений при запуске через ASGI
+ASGI_THREADS = int(os.getenv('ASGI_THREADS', 16))
+
 
 # Database
 
@@ -75,6 +124,7 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'TEST': {'NAME': os.path.join(BASE_DIR, 'test_db.sqlite3')},
     }
 }
 
@@ -96,7 +146,45 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Бэкенд JSON для API: auto (orjson, если установлен), orjson или json
+JSON_BACKEND = os.getenv('JSON_BACKEND', 'auto')
+# Как часто, в секундах, кэш жанров и категорий сверяет общую версию
+TAXONOMY_CACHE_CHECK_INTERVAL = float(
+    os.getenv('TAXONOMY_CACHE_CHECK_INTERVAL', 1)
+)
+# Отдавать GET /titles/ из витрины TitleListing; перед включением витрину
+# нужно заполнить командой refresh_title_listing
+TITLES_READ_MODEL = os.getenv('TITLES_READ_MODEL', 'false').lower() == 'true'
+# База данных для счётчиков ограничения частоты запросов
+THROTTLE_DATABASE = os.getenv('THROTTLE_DATABASE', 'default')
+# Удалённые отзывы и комментарии физически стираются командой
+# purge_deleted через CONTENT_PURGE_AFTER пачками по CONTENT_PURGE_BATCH_SIZE
+CONTENT_PURGE_AFTER = timedelta(days=30)
+CONTENT_PURGE_BATCH_SIZE = 1000
+# Журнал изменений: записи старше CHANGES_COMPACT_AFTER сжимаются до
+# последней по объекту, записи старше CHANGES_RETENTION удаляются; записи
+# моложе CHANGES_COMMIT_LAG не отдаются, пока не зафиксируются транзакции
+# с меньшими id
+CHANGES_COMPACT_AFTER = timedelta(days=int(
+    os.getenv('CHANGES_COMPACT_AFTER_DAYS', 7)
+))
+CHANGES_RETENTION = timedelta(days=int(
+    os.getenv('CHANGES_RETENTION_DAYS', 90)
+))
+CHANGES_COMMIT_LAG = timedelta(seconds=int(
+    os.getenv('CHANGES_COMMIT_LAG_SECONDS', 5)
+))
+
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.renderers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
@@ -105,6 +193,17 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.throttling.RoleRateThrottle',
+    ],
+    # Лимиты: <группа>.<роль> или <роль>; None снимает ограничение
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': '120/min',
+        'user': '600/min',
+        'moderator': '1200/min',
+        'admin': None,
+        'auth.anon': '30/min',
+    },
 }
 
 SIMPLE_JWT = {
@@ -131,3 +230,26 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static/'),)
 
 AUTH_USER_MODEL = 'reviews.User'
+
+# Профиль процесса: full — API, админка и документация; api — только API
+# для отдельных API-воркеров (админка и /redoc/ остаются на воркерах full).
+# В профиле api не загружаются админка, сессии, сообщения, статика и
+# шаблонный Browsable API, а запросы проходят только нужные API middleware.
+APP_PROFILE = os.getenv('APP_PROFILE', 'full')
+if APP_PROFILE == 'api':
+    INSTALLED_APPS = [
+        app for app in INSTALLED_APPS
+        if app not in (
+            'django.contrib.admin',
+            'django.contrib.sessions',
+            'django.contrib.messages',
+            'django.contrib.staticfiles',
+        )
+    ]
+    MIDDLEWARE = [
+        'django.middleware.security.SecurityMiddleware',
+        'api.middleware.CompressionMiddleware',
+        'django.middleware.common.CommonMiddleware',
+    ]
+    TEMPLATES[0]['OPTIONS']['context_processors'] = []
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = ['api.renderers.JSONRenderer']
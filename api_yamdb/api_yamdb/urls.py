@@ -1,13 +1,20 @@
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path, include
-from django.views.generic import TemplateView
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
-    path(
-        'redoc/',
-        TemplateView.as_view(template_name='redoc.html'),
-        name='redoc'
-    ),
     path('api/', include('api.urls')),
 ]
+
+# в профиле api админки и документации нет
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+    from django.views.generic import TemplateView
+
+    urlpatterns = [
+        path('admin/', admin.site.urls),
+        path(
+            'redoc/',
+            TemplateView.as_view(template_name='redoc.html'),
+            name='redoc'
+        ),
+    ] + urlpatterns
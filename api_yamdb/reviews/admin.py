@@ -1,41 +1,177 @@
 from django.contrib import admin
+from django.db.models.functions import Substr
 
-from .models import Comments, Review, User, Categories, Genres, Title
+from .models import (
+    Categories,
+    Comments,
+    ConfirmationDelivery,
+    EventDelivery,
+    Genres,
+    Job,
+    Review,
+    Subscriber,
+    Title,
+    User,
+    Visibility,
+)
+from .paginators import EstimatedCountPaginator
+
+
+PREVIEW_LENGTH = 50
+
+
+class PreviewAdminMixin:
+    """
+    Показывает в списке только начало текстовых полей: текст обрезается
+    в запросе, а полные значения из базы не загружаются.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    preview_fields = {'text_preview': 'text'}
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if request.resolver_match.url_name.endswith('_changelist'):
+            queryset = queryset.defer('text').annotate(**{
+                name: Substr(field, 1, PREVIEW_LENGTH)
+                for name, field in self.preview_fields.items()
+            })
+        return queryset
+
+    def text_preview(self, obj):
+        return obj.text_preview
+    text_preview.short_description = 'Текст'
+
+
+def visibility_action(visibility, name, description):
+    def action(modeladmin, request, queryset):
+        updated = queryset.set_visibility(visibility)
+        modeladmin.message_user(request, f'Изменено записей: {updated}')
+    action.__name__ = name
+    action.short_description = description
+    action.allowed_permissions = ('change',)
+    return action
+
+
+hide_selected = visibility_action(
+    Visibility.hidden, 'hide_selected', 'Скрыть выбранные'
+)
+soft_delete_selected = visibility_action(
+    Visibility.deleted, 'soft_delete_selected', 'Удалить выбранные'
+)
+restore_selected = visibility_action(
+    Visibility.visible, 'restore_selected', 'Восстановить выбранные'
+)
+
+
+def delete_authors_content(modeladmin, request, queryset):
+    authors = list(
+        queryset.order_by().values_list('author', flat=True).distinct()
+    )
+    comments = Comments.objects.filter(
+        author__in=authors
+    ).set_visibility(Visibility.deleted)
+    reviews = Review.objects.filter(
+        author__in=authors
+    ).set_visibility(Visibility.deleted)
+    modeladmin.message_user(
+        request, f'Удалено отзывов: {reviews}, комментариев: {comments}'
+    )
+
+
+delete_authors_content.short_description = (
+    'Удалить все отзывы и комментарии авторов выбранных записей'
+)
+delete_authors_content.allowed_permissions = ('change',)
+
+
+class BulkModerationAdminMixin:
+    """
+    Массовое скрытие и удаление набором запросов вместо удаления по одной
+    записи с пересчётом рейтинга на каждую. В списке видны все записи,
+    включая скрытые и удалённые.
+    """
+
+    actions = (
+        hide_selected,
+        soft_delete_selected,
+        restore_selected,
+        delete_authors_content,
+    )
+
+    def get_queryset(self, request):
+        queryset = self.model.all_objects.get_queryset()
+        ordering = self.get_ordering(request)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
 
 
 class UserAdmin(admin.ModelAdmin):
-    list_display = [i.name for i in User._meta.fields if i != 'id']
+    list_display = (
+        'pk', 'username', 'email', 'role', 'is_active', 'date_joined'
+    )
+    search_fields = ('=username', '=email')
+    list_filter = ('role', 'is_active')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(
+    PreviewAdminMixin, BulkModerationAdminMixin, admin.ModelAdmin
+):
     """Класс для отображения полей отзыва в админке."""
 
     list_display = (
         'pk',
-        'text',
+        'text_preview',
         'author',
         'score',
         'pub_date',
         'title',
+        'visibility',
     )
-    search_fields = ('text',)
-    list_filter = ('pub_date',)
+    list_select_related = ('author', 'title')
+    raw_id_fields = ('author', 'title')
+    search_fields = ('=author__username',)
+    list_filter = ('visibility',)
+    date_hierarchy = 'pub_date'
     empty_value_display = '-пусто-'
 
 
-class CommentsAdmin(admin.ModelAdmin):
+class CommentsAdmin(
+    PreviewAdminMixin, BulkModerationAdminMixin, admin.ModelAdmin
+):
     """Класс для отображения полей комментария в админке."""
 
     list_display = (
         'pk',
-        'text',
+        'text_preview',
         'author',
         'pub_date',
-        'review',
+        'review_preview',
+        'visibility',
     )
-    search_fields = ('text',)
-    list_filter = ('pub_date',)
+    list_select_related = ('author',)
+    raw_id_fields = ('author', 'review')
+    search_fields = ('=author__username',)
+    list_filter = ('visibility',)
+    date_hierarchy = 'pub_date'
     empty_value_display = '-пусто-'
+    preview_fields = {
+        'text_preview': 'text',
+        'review_preview': 'review__text',
+    }
+
+    def review_preview(self, obj):
+        return obj.review_preview
+    review_preview.short_description = 'Отзыв'
 
 
 class CategoriesAdmin(admin.ModelAdmin):
@@ -65,9 +201,61 @@ class TitleAdmin(admin.ModelAdmin):
     empty_value_display = '-пусто-'
 
 
+class ConfirmationDeliveryAdmin(admin.ModelAdmin):
+    """Класс для отображения статуса доставки кодов в админке"""
+
+    list_display = (
+        'pk', 'email', 'transport', 'status', 'created', 'sent_at', 'error'
+    )
+    search_fields = ('email',)
+    list_filter = ('status', 'transport')
+    raw_id_fields = ('user',)
+    empty_value_display = '-пусто-'
+
+
+class SubscriberAdmin(admin.ModelAdmin):
+    """Класс для отображения подписчиков на события в админке"""
+
+    list_display = ('pk', 'name', 'url', 'events', 'is_active')
+    list_filter = ('is_active',)
+    empty_value_display = '-пусто-'
+
+
+class EventDeliveryAdmin(admin.ModelAdmin):
+    """Класс для отображения очереди событий в админке"""
+
+    list_display = (
+        'pk', 'event', 'subscriber', 'status', 'attempts',
+        'next_attempt_at', 'sent_at', 'error',
+    )
+    list_filter = ('status', 'event')
+    list_select_related = ('subscriber',)
+    raw_id_fields = ('subscriber',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    empty_value_display = '-пусто-'
+
+
+class JobAdmin(admin.ModelAdmin):
+    """Класс для отображения очереди задач в админке"""
+
+    list_display = (
+        'pk', 'name', 'status', 'priority', 'run_at', 'attempts',
+        'finished_at', 'error',
+    )
+    list_filter = ('status', 'name')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    empty_value_display = '-пусто-'
+
+
 admin.site.register(User, UserAdmin)
 admin.site.register(Review, ReviewAdmin)
 admin.site.register(Comments, CommentsAdmin)
 admin.site.register(Categories, CategoriesAdmin)
 admin.site.register(Genres, GenresAdmin)
 admin.site.register(Title, TitleAdmin)
+admin.site.register(ConfirmationDelivery, ConfirmationDeliveryAdmin)
+admin.site.register(Subscriber, SubscriberAdmin)
+admin.site.register(EventDelivery, EventDeliveryAdmin)
+admin.site.register(Job, JobAdmin)
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from reviews.models import Change
+
+
+class Command(BaseCommand):
+    help = (
+        'Сжимает журнал изменений до последней записи по объекту и удаляет '
+        'записи старше CHANGES_RETENTION.'
+    )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        expired = Change.objects.filter(
+            created__lt=now - settings.CHANGES_RETENTION
+        ).delete()[0]
+        compacted = Change.objects.compact(
+            now - settings.CHANGES_COMPACT_AFTER
+        )
+        self.stdout.write(f'Удалено устаревших записей: {expired}')
+        self.stdout.write(f'Удалено при сжатии: {compacted}')
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from reviews.models import DELETED, Comments, Review
+
+
+class Command(BaseCommand):
+    help = (
+        'Физически удаляет пачками отзывы и комментарии, удалённые '
+        'раньше CONTENT_PURGE_AFTER.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.CONTENT_PURGE_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - settings.CONTENT_PURGE_AFTER
+        for model in (Comments, Review):
+            deleted = self.purge(model, cutoff, options['batch_size'])
+            self.stdout.write(
+                f'Удалено ({model._meta.verbose_name_plural}): {deleted}'
+            )
+
+    def purge(self, model, cutoff, batch_size):
+        stale = (
+            model.all_objects.filter(DELETED, visibility_changed__lt=cutoff)
+            .order_by('visibility_changed')
+            .values_list('pk', flat=True)
+        )
+        total = 0
+        while True:
+            ids = list(stale[:batch_size])
+            if not ids:
+                return total
+            total += model.all_objects.filter(pk__in=ids).bulk_delete()
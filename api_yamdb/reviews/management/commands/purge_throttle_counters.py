@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from reviews.models import ThrottleCounter
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет окна счётчиков ограничения частоты запросов, которые '
+        'уже не участвуют в оценке.'
+    )
+
+    def handle(self, *args, **options):
+        deleted = ThrottleCounter.objects.using(
+            settings.THROTTLE_DATABASE
+        ).purge()
+        self.stdout.write(f'Удалено окон: {deleted}')
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models import Title, TitleListing
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает витрину списка произведений пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        titles = Title.objects.order_by('pk').values_list('pk', flat=True)
+        last, total = 0, 0
+        while True:
+            ids = list(titles.filter(pk__gt=last)[:options['batch_size']])
+            if not ids:
+                break
+            total += TitleListing.objects.refresh(ids)
+            last = ids[-1]
+        TitleListing.objects.exclude(
+            pk__in=Title.objects.values('pk')
+        ).delete()
+        self.stdout.write(f'Обновлено произведений: {total}')
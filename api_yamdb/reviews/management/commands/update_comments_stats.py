@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models import Review
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает число комментариев и дату последнего у отзывов.'
+
+    def handle(self, *args, **options):
+        updated = Review.all_objects.update_comments_stats()
+        self.stdout.write(f'Обновлено отзывов: {updated}')
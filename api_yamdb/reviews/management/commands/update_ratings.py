@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённый рейтинг и число отзывов произведений.'
+
+    def handle(self, *args, **options):
+        updated = Title.objects.all().update_rating()
+        self.stdout.write(f'Обновлено произведений: {updated}')
@@ -0,0 +1,48 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:32
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_comments_stats(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Comments = apps.get_model('reviews', 'Comments')
+    comments = (
+        Comments.objects.filter(review=OuterRef('pk'))
+        .order_by()
+        .values('review')
+    )
+    Review.objects.update(
+        comments_count=Coalesce(
+            Subquery(comments.annotate(value=Count('pk')).values('value')), 0
+        ),
+        last_comment_at=Subquery(
+            comments.annotate(value=Max('pub_date')).values('value')
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_title_rating'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество комментариев'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='last_comment_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Дата последнего комментария'),
+        ),
+        migrations.AddIndex(
+            model_name='comments',
+            index=models.Index(fields=['review', 'pub_date'], name='comment_review_date_idx'),
+        ),
+        migrations.RunPython(fill_comments_stats, migrations.RunPython.noop),
+    ]
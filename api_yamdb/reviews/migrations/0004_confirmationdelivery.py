@@ -0,0 +1,33 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:36
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_review_comments_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConfirmationDelivery',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email', models.EmailField(max_length=254, verbose_name='Адрес')),
+                ('transport', models.CharField(max_length=16, verbose_name='Транспорт')),
+                ('status', models.CharField(choices=[('pending', 'pending'), ('sent', 'sent'), ('failed', 'failed')], db_index=True, default='pending', max_length=16, verbose_name='Статус')),
+                ('error', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Создана')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Отправлена')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Доставка кода',
+                'verbose_name_plural': 'Доставки кодов',
+                'ordering': ['-id'],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_confirmationdelivery'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConfirmationAttempt',
+            fields=[
+                ('username', models.CharField(max_length=150, primary_key=True, serialize=False)),
+                ('failures', models.PositiveSmallIntegerField(default=0)),
+                ('last_failure', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Попытки ввода кода',
+                'verbose_name_plural': 'Попытки ввода кода',
+            },
+        ),
+    ]
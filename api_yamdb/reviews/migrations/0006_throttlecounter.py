@@ -0,0 +1,30 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_confirmationattempt'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ThrottleCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255)),
+                ('window', models.BigIntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Счётчик запросов',
+                'verbose_name_plural': 'Счётчики запросов',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='throttlecounter',
+            constraint=models.UniqueConstraint(fields=('key', 'window'), name='unique_throttle_window'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_throttlecounter'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comments',
+            name='comment_review_date_idx',
+        ),
+        migrations.AddField(
+            model_name='comments',
+            name='visibility',
+            field=models.CharField(choices=[('visible', 'visible'), ('hidden', 'hidden'), ('deleted', 'deleted')], default='visible', editable=False, max_length=16, verbose_name='Видимость'),
+        ),
+        migrations.AddField(
+            model_name='comments',
+            name='visibility_changed',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Дата изменения видимости'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='visibility',
+            field=models.CharField(choices=[('visible', 'visible'), ('hidden', 'hidden'), ('deleted', 'deleted')], default='visible', editable=False, max_length=16, verbose_name='Видимость'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='visibility_changed',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Дата изменения видимости'),
+        ),
+        migrations.AddIndex(
+            model_name='comments',
+            index=models.Index(condition=models.Q(visibility='visible'), fields=['review', 'pub_date'], name='comment_visible_review_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comments',
+            index=models.Index(condition=models.Q(visibility='deleted'), fields=['visibility_changed'], name='comment_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(visibility='visible'), fields=['title', 'id'], name='review_visible_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(visibility='deleted'), fields=['visibility_changed'], name='review_deleted_idx'),
+        ),
+    ]
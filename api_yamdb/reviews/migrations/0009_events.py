@@ -0,0 +1,53 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_change'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Subscriber',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=150, verbose_name='Название')),
+                ('url', models.URLField(verbose_name='Адрес')),
+                ('events', models.CharField(blank=True, help_text='Через запятую, например review.created; пусто — все', max_length=256, verbose_name='События')),
+                ('secret', models.CharField(blank=True, help_text='Если задан, тело подписывается HMAC-SHA256', max_length=128, verbose_name='Ключ подписи')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Активен')),
+            ],
+            options={
+                'verbose_name': 'Подписчик',
+                'verbose_name_plural': 'Подписчики',
+            },
+        ),
+        migrations.CreateModel(
+            name='EventDelivery',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event', models.CharField(max_length=64, verbose_name='Событие')),
+                ('payload', models.TextField(verbose_name='Данные')),
+                ('status', models.CharField(choices=[('pending', 'pending'), ('sent', 'sent'), ('dead', 'dead')], default='pending', max_length=16, verbose_name='Статус')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попыток')),
+                ('next_attempt_at', models.DateTimeField(verbose_name='Следующая попытка')),
+                ('error', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Отправлено')),
+                ('subscriber', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='reviews.Subscriber', verbose_name='Подписчик')),
+            ],
+            options={
+                'verbose_name': 'Отправка события',
+                'verbose_name_plural': 'Отправки событий',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='eventdelivery',
+            index=models.Index(condition=models.Q(status='pending'), fields=['next_attempt_at'], name='event_pending_idx'),
+        ),
+    ]
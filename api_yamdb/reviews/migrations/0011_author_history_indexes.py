@@ -0,0 +1,21 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_cacheversion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comments',
+            index=models.Index(condition=models.Q(visibility='visible'), fields=['author', '-pub_date', '-id'], name='comment_author_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(visibility='visible'), fields=['author', '-pub_date', '-id'], name='review_author_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:05
+
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+def fill_normalized(apps, schema_editor):
+    User = apps.get_model('reviews', 'User')
+    User.objects.using(schema_editor.connection.alias).update(
+        username_normalized=Lower('username'),
+        email_normalized=Lower('email'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_author_history_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='email_normalized',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=254),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='username_normalized',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=150),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role', 'id'], name='user_role_idx'),
+        ),
+        migrations.RunPython(fill_normalized, migrations.RunPython.noop),
+    ]
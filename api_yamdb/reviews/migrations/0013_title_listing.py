@@ -0,0 +1,46 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_user_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleListing',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('name', models.TextField(db_index=True, verbose_name='Название произведения')),
+                ('year', models.IntegerField(verbose_name='Дата выхода произведения')),
+                ('description', models.TextField(verbose_name='Описание')),
+                ('category_name', models.CharField(max_length=256, null=True)),
+                ('category_slug', models.CharField(max_length=50, null=True)),
+                ('genres', models.TextField(default='[]', verbose_name='Жанры в JSON')),
+                ('rating', models.FloatField(null=True, verbose_name='Рейтинг')),
+                ('reviews_count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('category', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='reviews.Categories')),
+            ],
+            options={
+                'verbose_name': 'Строка витрины произведений',
+                'verbose_name_plural': 'Витрина произведений',
+                'ordering': ['-id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='titlelisting',
+            index=models.Index(fields=['rating', 'id'], name='listing_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titlelisting',
+            index=models.Index(fields=['year', 'id'], name='listing_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titlelisting',
+            index=models.Index(fields=['reviews_count', 'id'], name='listing_reviews_count_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0014_job'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='review',
+            name='unique_review',
+        ),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(condition=models.Q(_negated=True, visibility='deleted'), fields=('author', 'title'), name='unique_review'),
+        ),
+    ]
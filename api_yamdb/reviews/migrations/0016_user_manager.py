@@ -0,0 +1,20 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:49
+
+from django.db import migrations
+import reviews.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0015_review_unique_not_deleted'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', reviews.models.NormalizedUserManager()),
+            ],
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:53
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0016_user_manager'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='throttlecounter',
+            name='expires',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
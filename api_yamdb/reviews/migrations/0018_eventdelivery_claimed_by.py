@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 11:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0017_throttlecounter_expires'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventdelivery',
+            name='claimed_by',
+            field=models.CharField(blank=True, max_length=32, verbose_name='Обработчик'),
+        ),
+    ]
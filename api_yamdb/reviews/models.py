@@ -1,11 +1,29 @@
+import json
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
 from enum import Enum
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.core.validators import (
     MaxValueValidator,
     MinValueValidator,
     RegexValidator
 )
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import (
+    Avg,
+    Case,
+    Count,
+    Exists,
+    F,
+    Max,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Lower
+from django.utils import timezone
 
 from .validators import validate_year
 
@@ -20,10 +38,112 @@ class UserRole(Enum):
         return(tuple((i.name, i.value) for i in cls))
 
 
+class DeliveryStatus(Enum):
+    pending = 'pending'
+    sent = 'sent'
+    failed = 'failed'
+
+    @classmethod
+    def choices(cls):
+        return tuple((i.name, i.value) for i in cls)
+
+
+class EventStatus(Enum):
+    pending = 'pending'
+    sent = 'sent'
+    dead = 'dead'
+
+    @classmethod
+    def choices(cls):
+        return tuple((i.name, i.value) for i in cls)
+
+
+class JobStatus(Enum):
+    pending = 'pending'
+    done = 'done'
+    failed = 'failed'
+
+    @classmethod
+    def choices(cls):
+        return tuple((i.name, i.value) for i in cls)
+
+
+class ChangeAction(Enum):
+    created = 'created'
+    updated = 'updated'
+    deleted = 'deleted'
+
+    @classmethod
+    def choices(cls):
+        return tuple((i.name, i.value) for i in cls)
+
+
+class Visibility(Enum):
+    visible = 'visible'
+    hidden = 'hidden'
+    deleted = 'deleted'
+
+    @classmethod
+    def choices(cls):
+        return tuple((i.name, i.value) for i in cls)
+
+    @property
+    def change_action(self):
+        """Действие в журнале изменений: скрытая запись считается удалённой."""
+        if self is Visibility.visible:
+            return ChangeAction.updated
+        return ChangeAction.deleted
+
+
+VISIBLE = Q(visibility=Visibility.visible.value)
+DELETED = Q(visibility=Visibility.deleted.value)
+
+
+class VisibleManager(models.Manager):
+    """Менеджер, который возвращает только видимые записи."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(VISIBLE)
+
+
 def username_not_me(value):
     return value != 'me'
 
 
+class UserQuerySet(models.QuerySet):
+    """
+    Заполняет поисковые колонки `*_normalized` и при массовых операциях,
+    которые обходят `User.save()`.
+    """
+
+    normalized_fields = {
+        'username': 'username_normalized',
+        'email': 'email_normalized',
+    }
+
+    def update(self, **kwargs):
+        for field, normalized in self.normalized_fields.items():
+            if field in kwargs and normalized not in kwargs:
+                value = kwargs[field]
+                kwargs[normalized] = (
+                    value.lower() if isinstance(value, str) else Lower(value)
+                )
+        return super().update(**kwargs)
+
+    update.alters_data = True
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.username_normalized = obj.username.lower()
+            obj.email_normalized = obj.email.lower()
+        return super().bulk_create(objs, *args, **kwargs)
+
+
+class NormalizedUserManager(UserManager.from_queryset(UserQuerySet)):
+    """Менеджер пользователей с поддержкой поисковых колонок."""
+
+
 class User(AbstractUser):
     """Модель пользователя."""
 
@@ -46,6 +166,34 @@ class User(AbstractUser):
     confirmation_code = models.CharField(
         max_length=254, default='XXXX', null=True
     )
+    # username и email в нижнем регистре для поиска по префиксу без
+    # учёта регистра: по ним построены обычные индексы
+    username_normalized = models.CharField(
+        max_length=150, db_index=True, editable=False
+    )
+    email_normalized = models.CharField(
+        max_length=254, db_index=True, editable=False
+    )
+
+    objects = NormalizedUserManager()
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['role', 'id'], name='user_role_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.username_normalized = self.username.lower()
+        self.email_normalized = self.email.lower()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if 'username' in update_fields:
+                update_fields.add('username_normalized')
+            if 'email' in update_fields:
+                update_fields.add('email_normalized')
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
 
     @property
     def is_admin(self):
@@ -59,6 +207,162 @@ class User(AbstractUser):
         return self.username
 
 
+class ConfirmationDelivery(models.Model):
+    """Доставка кода подтверждения пользователю."""
+
+    user = models.ForeignKey(
+        User,
+        verbose_name='Пользователь',
+        on_delete=models.CASCADE,
+        related_name='deliveries',
+    )
+    email = models.EmailField('Адрес', max_length=254)
+    transport = models.CharField('Транспорт', max_length=16)
+    status = models.CharField(
+        'Статус',
+        max_length=16,
+        choices=DeliveryStatus.choices(),
+        default=DeliveryStatus.pending.value,
+        db_index=True,
+    )
+    error = models.TextField('Ошибка', blank=True)
+    created = models.DateTimeField('Создана', auto_now_add=True)
+    sent_at = models.DateTimeField('Отправлена', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Доставка кода'
+        verbose_name_plural = 'Доставки кодов'
+        ordering = ['-id']
+
+    def __str__(self):
+        return f'{self.email}: {self.status}'
+
+
+class ConfirmationAttemptQuerySet(models.QuerySet):
+    def register_failure(self, username, now, window_start):
+        """
+        Увеличивает счётчик неудачных попыток одним UPDATE; счётчик,
+        последняя ошибка в котором старше `window_start`, начинается заново.
+        """
+        updated = self.filter(username=username).update(
+            failures=Case(
+                When(last_failure__lt=window_start, then=Value(1)),
+                default=F('failures') + 1,
+            ),
+            last_failure=now,
+        )
+        if updated:
+            return
+        try:
+            with transaction.atomic():
+                self.create(username=username, failures=1, last_failure=now)
+        except IntegrityError:
+            self.register_failure(username, now, window_start)
+
+
+class ConfirmationAttempt(models.Model):
+    """Неудачные попытки ввода кода подтверждения для блокировки подбора."""
+
+    username = models.CharField(max_length=150, primary_key=True)
+    failures = models.PositiveSmallIntegerField(default=0)
+    last_failure = models.DateTimeField()
+
+    objects = ConfirmationAttemptQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Попытки ввода кода'
+        verbose_name_plural = 'Попытки ввода кода'
+
+    def __str__(self):
+        return f'{self.username}: {self.failures}'
+
+
+class ThrottleCounterQuerySet(models.QuerySet):
+    def hit(self, key, window, duration):
+        """
+        Увеличивает счётчик запросов ключа в окне длиной `duration` секунд;
+        при открытии нового окна удаляет устаревшие окна этого ключа.
+        """
+        updated = self.filter(key=key, window=window).update(
+            count=F('count') + 1
+        )
+        if updated:
+            return
+        # окно нужно, пока оно текущее или предыдущее
+        expires = datetime.fromtimestamp(
+            (window + 2) * duration, tz=dt_timezone.utc
+        )
+        try:
+            with transaction.atomic(using=self.db):
+                self.create(key=key, window=window, count=1, expires=expires)
+        except IntegrityError:
+            self.hit(key, window, duration)
+            return
+        self.filter(key=key, window__lt=window - 1).delete()
+
+    def purge(self):
+        """
+        Удаляет отслужившие окна, в том числе ключей, которые больше
+        не появлялись и поэтому не чистятся в `hit`.
+        """
+        return self.filter(expires__lt=timezone.now()).delete()[0]
+
+
+class ThrottleCounter(models.Model):
+    """Счётчик запросов для ограничения частоты по скользящему окну."""
+
+    key = models.CharField(max_length=255)
+    window = models.BigIntegerField()
+    count = models.PositiveIntegerField(default=0)
+    expires = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = ThrottleCounterQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Счётчик запросов'
+        verbose_name_plural = 'Счётчики запросов'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['key', 'window'], name='unique_throttle_window'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.key}: {self.count}'
+
+
+class CacheVersionQuerySet(models.QuerySet):
+    def current(self, key):
+        version = self.filter(key=key).values_list('version', flat=True)
+        return version.first() or 0
+
+    def bump(self, key):
+        """Увеличивает версию ключа одним UPDATE, создавая запись при нужде."""
+        if self.filter(key=key).update(version=F('version') + 1):
+            return
+        try:
+            with transaction.atomic(using=self.db):
+                self.create(key=key, version=1)
+        except IntegrityError:
+            self.bump(key)
+
+
+class CacheVersion(models.Model):
+    """Общая для всех процессов версия кэшированных в памяти данных."""
+
+    key = models.CharField(max_length=64, primary_key=True)
+    version = models.PositiveIntegerField(default=0)
+
+    objects = CacheVersionQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Версия кэша'
+        verbose_name_plural = 'Версии кэша'
+
+    def __str__(self):
+        return f'{self.key}: {self.version}'
+
+
 class Categories(models.Model):
     """Категории произведений (Фильмы, книги и тд)."""
 
@@ -87,6 +391,33 @@ class Genres(models.Model):
         return self.name
 
 
+class TitleQuerySet(models.QuerySet):
+    def update_rating(self):
+        """
+        Пересчитывает рейтинг и число отзывов одним UPDATE. Сигналы
+        произведений не вызываются, поэтому изменение в журнал
+        записывает вызывающий код.
+        """
+        reviews = (
+            Review.objects.filter(title=OuterRef('pk'))
+            .order_by()
+            .values('title')
+        )
+        updated = self.update(
+            rating=Subquery(
+                reviews.annotate(value=Avg('score')).values('value')
+            ),
+            reviews_count=Coalesce(
+                Subquery(
+                    reviews.annotate(value=Count('pk')).values('value')
+                ),
+                0,
+            ),
+        )
+        TitleListing.objects.filter(pk__in=self.values('pk')).update_rating()
+        return updated
+
+
 class Title(models.Model):
     """Произведения."""
 
@@ -107,16 +438,219 @@ class Title(models.Model):
         blank=True,
         null=True,
     )
+    rating = models.FloatField(
+        'Рейтинг', null=True, blank=True, editable=False
+    )
+    reviews_count = models.PositiveIntegerField(
+        'Количество отзывов', default=0, editable=False
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Произведении'
         verbose_name_plural = 'Произведении'
         ordering = ['-id']
+        indexes = [
+            models.Index(fields=['rating', 'id'], name='title_rating_idx'),
+            models.Index(fields=['year', 'id'], name='title_year_idx'),
+            models.Index(
+                fields=['reviews_count', 'id'], name='title_reviews_count_idx'
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class TitleListingQuerySet(models.QuerySet):
+    def refresh(self, title_ids):
+        """
+        Пересобирает строки витрины для произведений `title_ids`: одним
+        запросом блокирует строки произведений, тремя читает данные
+        и записывает одним DELETE и INSERT.
+        """
+        title_ids = list(title_ids)
+        with transaction.atomic(using=self.db):
+            # параллельная пересборка тех же произведений ждёт блокировку,
+            # а не падает на INSERT уже вставленных строк
+            titles = list(
+                Title.objects.using(self.db).select_for_update()
+                .filter(pk__in=title_ids).order_by('pk')
+                .values_list('pk', flat=True)
+            )
+            titles = Title.objects.using(self.db).filter(
+                pk__in=titles
+            ).values_list(
+                'pk', 'name', 'year', 'description', 'rating',
+                'reviews_count', 'category', 'category__name',
+                'category__slug',
+            )
+            genres = defaultdict(list)
+            links = (
+                Title.genre.through.objects.using(self.db)
+                .filter(title__in=title_ids)
+                .order_by('genres')
+                .values_list('title', 'genres__name', 'genres__slug')
+            )
+            for title_id, name, slug in links:
+                genres[title_id].append({'name': name, 'slug': slug})
+            rows = [
+                TitleListing(
+                    id=pk,
+                    name=name,
+                    year=year,
+                    description=description,
+                    rating=rating,
+                    reviews_count=reviews_count,
+                    category_id=category_id,
+                    category_name=category_name,
+                    category_slug=category_slug,
+                    genres=json.dumps(genres[pk], ensure_ascii=False),
+                )
+                for (
+                    pk, name, year, description, rating, reviews_count,
+                    category_id, category_name, category_slug,
+                ) in titles
+            ]
+            self.filter(pk__in=title_ids).delete()
+            self.bulk_create(rows)
+        return len(rows)
+
+    def update_rating(self):
+        """Копирует рейтинг и число отзывов из произведений одним UPDATE."""
+        titles = Title.objects.filter(pk=OuterRef('pk'))
+        return self.update(
+            rating=Subquery(titles.values('rating')),
+            reviews_count=Subquery(titles.values('reviews_count')),
+        )
+
+
+class TitleListing(models.Model):
+    """
+    Витрина списка произведений: всё, что отдаёт `/titles/`, в одной
+    строке без JOIN и агрегатов. Обновляется сигналами при изменении
+    произведений, жанров и категорий и вместе с рейтингом; целиком
+    пересобирается командой `refresh_title_listing`.
+    """
+
+    # id совпадает с id произведения
+    id = models.IntegerField(primary_key=True)
+    name = models.TextField('Название произведения', db_index=True)
+    year = models.IntegerField('Дата выхода произведения')
+    description = models.TextField('Описание')
+    category = models.ForeignKey(
+        Categories,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+        null=True,
+    )
+    category_name = models.CharField(max_length=256, null=True)
+    category_slug = models.CharField(max_length=50, null=True)
+    genres = models.TextField('Жанры в JSON', default='[]')
+    rating = models.FloatField('Рейтинг', null=True)
+    reviews_count = models.PositiveIntegerField(
+        'Количество отзывов', default=0
+    )
+
+    objects = TitleListingQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Строка витрины произведений'
+        verbose_name_plural = 'Витрина произведений'
+        ordering = ['-id']
+        indexes = [
+            models.Index(fields=['rating', 'id'], name='listing_rating_idx'),
+            models.Index(fields=['year', 'id'], name='listing_year_idx'),
+            models.Index(
+                fields=['reviews_count', 'id'],
+                name='listing_reviews_count_idx',
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
 
 
+class ReviewQuerySet(models.QuerySet):
+    def update_comments_stats(self):
+        """
+        Пересчитывает число комментариев и дату последнего. UPDATE и запись
+        в журнал изменений — только для отзывов, где значения разошлись.
+        """
+        comments = (
+            Comments.objects.filter(review=OuterRef('pk'))
+            .order_by()
+            .values('review')
+        )
+        stats = {
+            'comments_count': Coalesce(
+                Subquery(
+                    comments.annotate(value=Count('pk')).values('value'),
+                    output_field=models.PositiveIntegerField(),
+                ),
+                0,
+            ),
+            'last_comment_at': Subquery(
+                comments.annotate(value=Max('pub_date')).values('value'),
+                output_field=models.DateTimeField(),
+            ),
+        }
+        rows = self.order_by().annotate(
+            new_count=stats['comments_count'],
+            new_last=stats['last_comment_at'],
+        ).values_list(
+            'pk', 'comments_count', 'last_comment_at', 'new_count', 'new_last'
+        )
+        with transaction.atomic(using=self.db):
+            changed = [
+                pk for pk, count, last, new_count, new_last in rows
+                if (count, last) != (new_count, new_last)
+            ]
+            if not changed:
+                return 0
+            updated = self.model.all_objects.filter(
+                pk__in=changed
+            ).update(**stats)
+            Change.objects.record(Review, changed, ChangeAction.updated)
+        return updated
+
+    def set_visibility(self, visibility):
+        """
+        Меняет видимость отзывов одним UPDATE и один раз пересчитывает
+        рейтинг затронутых произведений.
+        """
+        changed = self.exclude(visibility=visibility.value).order_by()
+        with transaction.atomic(using=self.db):
+            rows = list(changed.values_list('pk', 'title'))
+            updated = changed.update(
+                visibility=visibility.value, visibility_changed=timezone.now()
+            )
+            title_ids = {title for _, title in rows}
+            Title.objects.filter(pk__in=title_ids).update_rating()
+            Change.objects.record(
+                Review, [pk for pk, _ in rows], visibility.change_action
+            )
+            Change.objects.record(Title, title_ids, ChangeAction.updated)
+        return updated
+
+    def bulk_delete(self):
+        """
+        Удаляет отзывы и их комментарии без сигналов по каждой строке и
+        один раз пересчитывает рейтинг затронутых произведений.
+        """
+        with transaction.atomic(using=self.db):
+            title_ids = list(
+                self.order_by().values_list('title', flat=True).distinct()
+            )
+            Comments.all_objects.filter(review__in=self)._raw_delete(self.db)
+            deleted = self.order_by()._raw_delete(self.db)
+            Title.objects.filter(pk__in=title_ids).update_rating()
+            Change.objects.record(Title, title_ids, ChangeAction.updated)
+        return deleted
+
+
 class Review(models.Model):
     """Отзывы на произведения."""
 
@@ -148,22 +682,96 @@ class Review(models.Model):
         auto_now_add=True,
         db_index=True,
     )
+    comments_count = models.PositiveIntegerField(
+        'Количество комментариев', default=0, editable=False
+    )
+    last_comment_at = models.DateTimeField(
+        'Дата последнего комментария', null=True, blank=True, editable=False
+    )
+    visibility = models.CharField(
+        'Видимость',
+        max_length=16,
+        choices=Visibility.choices(),
+        default=Visibility.visible.value,
+        editable=False,
+    )
+    visibility_changed = models.DateTimeField(
+        'Дата изменения видимости', null=True, blank=True, editable=False
+    )
+
+    objects = VisibleManager.from_queryset(ReviewQuerySet)()
+    all_objects = ReviewQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
         ordering = ['id']
         constraints = [
+            # удалённый отзыв не мешает автору написать новый
             models.UniqueConstraint(
                 fields=['author', 'title'],
                 name='unique_review',
+                condition=~DELETED,
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['title', 'id'],
+                name='review_visible_title_idx',
+                condition=VISIBLE,
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='review_author_idx',
+                condition=VISIBLE,
+            ),
+            models.Index(
+                fields=['visibility_changed'],
+                name='review_deleted_idx',
+                condition=DELETED,
+            ),
+        ]
 
     def __str__(self):
         return self.text
 
 
+class CommentsQuerySet(models.QuerySet):
+    def set_visibility(self, visibility):
+        """
+        Меняет видимость комментариев одним UPDATE и один раз
+        пересчитывает счётчики затронутых отзывов.
+        """
+        changed = self.exclude(visibility=visibility.value).order_by()
+        with transaction.atomic(using=self.db):
+            rows = list(changed.values_list('pk', 'review'))
+            updated = changed.update(
+                visibility=visibility.value, visibility_changed=timezone.now()
+            )
+            Review.all_objects.filter(
+                pk__in={review for _, review in rows}
+            ).update_comments_stats()
+            Change.objects.record(
+                Comments, [pk for pk, _ in rows], visibility.change_action
+            )
+        return updated
+
+    def bulk_delete(self):
+        """
+        Удаляет комментарии без сигналов по каждой строке и один раз
+        пересчитывает счётчики затронутых отзывов.
+        """
+        with transaction.atomic(using=self.db):
+            review_ids = list(
+                self.order_by().values_list('review', flat=True).distinct()
+            )
+            deleted = self.order_by()._raw_delete(self.db)
+            Review.all_objects.filter(
+                pk__in=review_ids
+            ).update_comments_stats()
+        return deleted
+
+
 class Comments(models.Model):
     """Коментарии к отзывам."""
 
@@ -187,11 +795,201 @@ class Comments(models.Model):
         auto_now_add=True,
         db_index=True,
     )
+    visibility = models.CharField(
+        'Видимость',
+        max_length=16,
+        choices=Visibility.choices(),
+        default=Visibility.visible.value,
+        editable=False,
+    )
+    visibility_changed = models.DateTimeField(
+        'Дата изменения видимости', null=True, blank=True, editable=False
+    )
+
+    objects = VisibleManager.from_queryset(CommentsQuerySet)()
+    all_objects = CommentsQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ['pub_date']
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date'],
+                name='comment_visible_review_idx',
+                condition=VISIBLE,
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='comment_author_idx',
+                condition=VISIBLE,
+            ),
+            models.Index(
+                fields=['visibility_changed'],
+                name='comment_deleted_idx',
+                condition=DELETED,
+            ),
+        ]
 
     def __str__(self):
         return self.text
+
+
+class ChangeQuerySet(models.QuerySet):
+    def record(self, model, object_ids, action):
+        """Записывает изменения объектов одной модели одним INSERT."""
+        return self.bulk_create(
+            Change(
+                model=model._meta.model_name,
+                object_id=object_id,
+                action=action.value,
+            )
+            for object_id in object_ids
+        )
+
+    def compact(self, before):
+        """
+        Удаляет записи старше `before`, для объектов которых в журнале
+        есть более поздняя запись.
+        """
+        newer = Change.objects.filter(
+            model=OuterRef('model'),
+            object_id=OuterRef('object_id'),
+            pk__gt=OuterRef('pk'),
+        )
+        stale = self.filter(created__lt=before).annotate(
+            has_newer=Exists(newer)
+        ).filter(has_newer=True)
+        return self.filter(pk__in=stale.values('pk')).delete()[0]
+
+
+class Change(models.Model):
+    """Журнал изменений для инкрементальной синхронизации."""
+
+    model = models.CharField('Модель', max_length=32)
+    object_id = models.PositiveIntegerField('id объекта')
+    action = models.CharField(
+        'Действие', max_length=16, choices=ChangeAction.choices()
+    )
+    created = models.DateTimeField('Дата', auto_now_add=True, db_index=True)
+
+    objects = ChangeQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Изменение'
+        verbose_name_plural = 'Изменения'
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['model', 'object_id', 'id'], name='change_object_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.model} {self.object_id}: {self.action}'
+
+
+class Subscriber(models.Model):
+    """Подписчик на события, которому они отправляются POST-запросом."""
+
+    name = models.CharField('Название', max_length=150)
+    url = models.URLField('Адрес')
+    events = models.CharField(
+        'События',
+        max_length=256,
+        blank=True,
+        help_text='Через запятую, например review.created; пусто — все',
+    )
+    secret = models.CharField(
+        'Ключ подписи', max_length=128, blank=True,
+        help_text='Если задан, тело подписывается HMAC-SHA256',
+    )
+    is_active = models.BooleanField('Активен', default=True)
+
+    class Meta:
+        verbose_name = 'Подписчик'
+        verbose_name_plural = 'Подписчики'
+
+    def __str__(self):
+        return self.name
+
+    def wants(self, event):
+        events = [name.strip() for name in self.events.split(',')]
+        return not self.events or event in events
+
+
+class EventDelivery(models.Model):
+    """Событие в очереди на отправку подписчику."""
+
+    subscriber = models.ForeignKey(
+        Subscriber,
+        verbose_name='Подписчик',
+        on_delete=models.CASCADE,
+        related_name='deliveries',
+    )
+    event = models.CharField('Событие', max_length=64)
+    payload = models.TextField('Данные')
+    status = models.CharField(
+        'Статус',
+        max_length=16,
+        choices=EventStatus.choices(),
+        default=EventStatus.pending.value,
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    next_attempt_at = models.DateTimeField('Следующая попытка')
+    error = models.TextField('Ошибка', blank=True)
+    created = models.DateTimeField('Создано', auto_now_add=True)
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+    claimed_by = models.CharField('Обработчик', max_length=32, blank=True)
+
+    class Meta:
+        verbose_name = 'Отправка события'
+        verbose_name_plural = 'Отправки событий'
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['next_attempt_at'],
+                name='event_pending_idx',
+                condition=Q(status=EventStatus.pending.value),
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.event} → {self.subscriber_id}: {self.status}'
+
+
+class Job(models.Model):
+    """Отложенная задача для `run_workers`."""
+
+    name = models.CharField('Задача', max_length=128)
+    payload = models.TextField('Аргументы')
+    priority = models.SmallIntegerField('Приоритет', default=0)
+    status = models.CharField(
+        'Статус',
+        max_length=16,
+        choices=JobStatus.choices(),
+        default=JobStatus.pending.value,
+    )
+    # время запуска; при захвате сдвигается на срок аренды JOBS_LEASE
+    run_at = models.DateTimeField('Запуск не раньше')
+    claimed_by = models.CharField('Обработчик', max_length=32, blank=True)
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    max_attempts = models.PositiveSmallIntegerField('Максимум попыток')
+    error = models.TextField('Ошибка', blank=True)
+    created = models.DateTimeField('Создана', auto_now_add=True)
+    finished_at = models.DateTimeField('Завершена', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Задача'
+        verbose_name_plural = 'Задачи'
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['-priority', 'run_at'],
+                name='job_pending_idx',
+                condition=Q(status=JobStatus.pending.value),
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.name}: {self.status}'
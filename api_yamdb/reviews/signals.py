@@ -0,0 +1,169 @@
+from django.db.models import F, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+
+from .models import (
+    Categories,
+    Change,
+    ChangeAction,
+    Comments,
+    Genres,
+    Review,
+    Title,
+    TitleListing,
+    Visibility,
+)
+
+TRACKED_MODELS = (Title, Review, Comments, Genres, Categories)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def update_title_rating(sender, instance, raw=False, **kwargs):
+    """
+    Обновляет сохранённый рейтинг произведения после изменения отзыва
+    и записывает изменение произведения в журнал: UPDATE рейтинга идёт
+    мимо сигналов произведения.
+    """
+    if raw:
+        return
+    Title.objects.filter(pk=instance.title_id).update_rating()
+    Change.objects.record(Title, [instance.title_id], ChangeAction.updated)
+
+
+@receiver(post_save, sender=Comments)
+def increment_comments_count(sender, instance, created, raw=False,
+                             **kwargs):
+    """
+    Учитывает новый комментарий в счётчике отзыва без COUNT; UPDATE идёт
+    мимо сигналов отзыва, поэтому изменение отзыва пишется в журнал здесь.
+    """
+    if not created or raw:
+        return
+    Review.all_objects.filter(pk=instance.review_id).update(
+        comments_count=F('comments_count') + 1,
+        last_comment_at=Greatest(
+            Coalesce('last_comment_at', instance.pub_date), instance.pub_date
+        ),
+    )
+    Change.objects.record(Review, [instance.review_id], ChangeAction.updated)
+
+
+@receiver(post_delete, sender=Comments)
+def decrement_comments_count(sender, instance, **kwargs):
+    """Уменьшает счётчик и берёт дату последнего оставшегося комментария."""
+    if instance.visibility != Visibility.visible.value:
+        return
+    last_comment_at = (
+        Comments.objects.filter(review=instance.review_id)
+        .order_by('-pub_date')
+        .values('pub_date')[:1]
+    )
+    Review.all_objects.filter(pk=instance.review_id).update(
+        comments_count=F('comments_count') - 1,
+        last_comment_at=Subquery(last_comment_at),
+    )
+    Change.objects.record(Review, [instance.review_id], ChangeAction.updated)
+
+
+def record_save(sender, instance, created, raw=False, **kwargs):
+    """Записывает создание или изменение объекта в журнал изменений."""
+    if raw:
+        return
+    action = ChangeAction.created if created else ChangeAction.updated
+    Change.objects.record(sender, [instance.pk], action)
+
+
+def record_delete(sender, instance, **kwargs):
+    """Записывает удаление объекта в журнал изменений."""
+    Change.objects.record(sender, [instance.pk], ChangeAction.deleted)
+
+
+for model in TRACKED_MODELS:
+    post_save.connect(record_save, sender=model)
+    post_delete.connect(record_delete, sender=model)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def record_title_genres(sender, instance, action, reverse, pk_set, **kwargs):
+    """Записывает изменение жанров произведения."""
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            Change.objects.record(Title, [instance.pk], ChangeAction.updated)
+        return
+    if action == 'pre_clear':
+        pk_set = instance.titles.values_list('pk', flat=True)
+    elif action not in ('post_add', 'post_remove'):
+        return
+    Change.objects.record(Title, pk_set, ChangeAction.updated)
+
+
+@receiver(pre_delete, sender=Categories)
+@receiver(pre_delete, sender=Genres)
+def record_related_titles(sender, instance, **kwargs):
+    """
+    Записывает изменение произведений удаляемой категории или жанра:
+    связи с ними удаляются одним запросом без сигналов по произведениям.
+    """
+    Change.objects.record(
+        Title,
+        instance.titles.values_list('pk', flat=True),
+        ChangeAction.updated,
+    )
+
+
+def refresh_title_listing(sender, instance, raw=False, **kwargs):
+    """Пересобирает строку витрины сохранённого или удалённого произведения."""
+    if not raw:
+        TitleListing.objects.refresh([instance.pk])
+
+
+post_save.connect(refresh_title_listing, sender=Title)
+post_delete.connect(refresh_title_listing, sender=Title)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def refresh_listing_genres(sender, instance, action, reverse, pk_set,
+                           **kwargs):
+    """Обновляет жанры в витрине после изменения связей."""
+    if action == 'pre_clear' and reverse:
+        instance._listing_titles = list(
+            instance.titles.values_list('pk', flat=True)
+        )
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        pk_set = [instance.pk]
+    elif action == 'post_clear':
+        pk_set = instance.__dict__.pop('_listing_titles', [])
+    TitleListing.objects.refresh(pk_set)
+
+
+@receiver(pre_delete, sender=Categories)
+@receiver(pre_delete, sender=Genres)
+def remember_listing_titles(sender, instance, **kwargs):
+    """Запоминает произведения удаляемой категории или жанра."""
+    instance._listing_titles = list(
+        instance.titles.values_list('pk', flat=True)
+    )
+
+
+@receiver(post_save, sender=Categories)
+@receiver(post_save, sender=Genres)
+@receiver(post_delete, sender=Categories)
+@receiver(post_delete, sender=Genres)
+def refresh_listing_taxonomy(sender, instance, created=False, raw=False,
+                             **kwargs):
+    """Обновляет в витрине произведения изменённой категории или жанра."""
+    if created or raw:
+        return
+    title_ids = instance.__dict__.pop('_listing_titles', None)
+    if title_ids is None:
+        title_ids = instance.titles.values_list('pk', flat=True)
+    TitleListing.objects.refresh(title_ids)
@@ -0,0 +1,114 @@
+"""Сравнение WSGI и ASGI при множестве медленных клиентов.
+
+Медленный клиент моделируется задержкой при передаче запроса и при
+приёме ответа. В WSGI-модели (поток на соединение) задержки занимают
+рабочий поток, в ASGI-модели они ожидаются в цикле событий, а поток
+занят только выполнением представления. Размер пула потоков одинаков.
+"""
+import argparse
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .common import report, setup_django
+
+PATH = '/api/v1/titles/'
+
+
+def wsgi_environ():
+    return {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': PATH,
+        'QUERY_STRING': '',
+        'SERVER_NAME': 'testserver',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': 'testserver',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': io.StringIO(),
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+
+
+def run_wsgi(application, clients, workers, delay):
+    def handle():
+        time.sleep(delay)
+        result = application(wsgi_environ(), lambda status, headers: None)
+        for _ in result:
+            time.sleep(delay)
+        result.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(handle) for _ in range(clients)]:
+            future.result()
+    return time.perf_counter() - start
+
+
+def run_asgi(application, clients, delay):
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'path': PATH,
+        'query_string': b'',
+        'headers': [(b'host', b'testserver')],
+        'server': ('testserver', 80),
+    }
+
+    async def handle():
+        async def receive():
+            await asyncio.sleep(delay)
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            if message['type'] == 'http.response.body':
+                await asyncio.sleep(delay)
+
+        await application(scope, receive, send)
+
+    async def run():
+        await asyncio.gather(*(handle() for _ in range(clients)))
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--delay', type=float, default=0.05)
+    args = parser.parse_args()
+
+    setup_django()
+    from api_yamdb.asgi_adapter import ASGIHandler
+    from api_yamdb.wsgi import application as wsgi_application
+    from reviews.models import Title
+
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {i}', year=2000, description='')
+        for i in range(100)
+    )
+    asgi_application = ASGIHandler(wsgi_application, args.workers)
+    print(
+        f'clients={args.clients} workers={args.workers} '
+        f'delay={args.delay}s'
+    )
+    for name, elapsed in (
+        ('WSGI', run_wsgi(
+            wsgi_application, args.clients, args.workers, args.delay
+        )),
+        ('ASGI', run_asgi(asgi_application, args.clients, args.delay)),
+    ):
+        report(f'{name} total time', elapsed * 1000)
+        report(f'{name} throughput', args.clients / elapsed, 'req/s')
+
+
+if __name__ == '__main__':
+    main()
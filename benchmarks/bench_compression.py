@@ -0,0 +1,77 @@
+"""Измерение выигрыша от сжатия ответов `/titles/` и `/reviews/`.
+
+Для каждой кодировки и уровня сжатия выводит размер тела, долю
+сэкономленных байт и время сжатия одной страницы.
+"""
+import argparse
+import zlib
+
+from .common import measure, report, setup_django
+
+
+def populate(titles, reviews):
+    from reviews.models import Categories, Genres, Review, Title, User
+
+    category = Categories.objects.create(name='Фильм', slug='films')
+    genre = Genres.objects.create(name='Драма', slug='drama')
+    User.objects.bulk_create(
+        User(username=f'bench{i}', email=f'bench{i}@yamdb.fake')
+        for i in range(reviews)
+    )
+    authors = list(User.objects.values_list('id', flat=True))
+    for i in range(titles):
+        title = Title.objects.create(
+            name=f'Произведение {i}', year=2000,
+            description='Описание произведения. ' * 10, category=category,
+        )
+        title.genre.add(genre)
+    title = Title.objects.first()
+    Review.objects.bulk_create(
+        Review(
+            title=title, author_id=author, score=author % 10 + 1,
+            text=f'Отзыв {author}: ' + 'подробный текст отзыва. ' * 40,
+        )
+        for author in authors
+    )
+    return title.pk
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--limit', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    import brotli
+    from rest_framework.test import APIClient
+
+    title_id = populate(args.limit, args.limit)
+    client = APIClient()
+    pages = {
+        'titles': f'/api/v1/titles/?limit={args.limit}',
+        'reviews': f'/api/v1/titles/{title_id}/reviews/?limit={args.limit}',
+    }
+    for name, url in pages.items():
+        content = client.get(url).content
+        report(f'{name} raw size', len(content), 'B')
+        for level in (1, 6, 9):
+            def compress():
+                compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+                return compressor.compress(content) + compressor.flush()
+            size = len(compress())
+            report(f'{name} gzip level={level} size', size, 'B')
+            report(f'{name} gzip level={level} saved',
+                   100 * (1 - size / len(content)), '%')
+            report(f'{name} gzip level={level} time', measure(compress))
+        for quality in (1, 4, 11):
+            def compress():
+                return brotli.compress(content, quality=quality)
+            size = len(compress())
+            report(f'{name} br quality={quality} size', size, 'B')
+            report(f'{name} br quality={quality} saved',
+                   100 * (1 - size / len(content)), '%')
+            report(f'{name} br quality={quality} time', measure(compress))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Бенчмарк JSON-рендерера по размеру страницы.
+
+Сравнивает рендерер DRF (stdlib json) с `api.renderers.JSONRenderer`
+на страницах отзывов с датами и длинным текстом.
+"""
+import argparse
+import datetime
+
+from .common import measure, report, setup_django
+
+
+def make_page(size):
+    from django.utils import timezone
+
+    pub_date = timezone.now() - datetime.timedelta(days=1)
+    return {
+        'count': size,
+        'next': None,
+        'previous': None,
+        'results': [
+            {
+                'id': i,
+                'title': f'Произведение {i}',
+                'text': 'Длинный текст отзыва. ' * 50,
+                'author': f'user{i}',
+                'score': i % 10 + 1,
+                'pub_date': pub_date,
+            }
+            for i in range(size)
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from rest_framework.renderers import JSONRenderer as DRFJSONRenderer
+
+    from api.renderers import JSONRenderer
+
+    for size in (10, 100, 1000):
+        # сериализатор отдаёт даты строками, как в реальном ответе
+        data = make_page(size)
+        for row in data['results']:
+            row['pub_date'] = row['pub_date'].isoformat()
+        drf = measure(
+            lambda: DRFJSONRenderer().render(data), repeat=args.repeat
+        )
+        report(f'page={size} DRF stdlib json', drf)
+        for backend in ('json', 'orjson'):
+            settings.JSON_BACKEND = backend
+            value = measure(
+                lambda: JSONRenderer().render(data), repeat=args.repeat
+            )
+            report(f'page={size} api.renderers ({backend})', value)
+            report(f'page={size} speedup ({backend})', drf / value, 'x')
+
+
+if __name__ == '__main__':
+    main()
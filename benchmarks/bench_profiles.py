@@ -0,0 +1,108 @@
+"""Сравнение профилей full и api (переменная окружения APP_PROFILE).
+
+Каждый запуск — отдельный процесс с холодным стартом: измеряется время
+`django.setup()` и создания `wsgi.application` с первым разрешением URL,
+число загруженных модулей и время обработки `GET /api/v1/titles/`
+через WSGI-приложение со всеми middleware профиля.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from .common import PROJECT_DIR, ROOT_DIR, measure, report
+
+PATH = '/api/v1/titles/'
+
+
+def child(args):
+    start = time.perf_counter()
+    sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    import django
+    django.setup()
+    from django.core.wsgi import get_wsgi_application
+    from django.urls import resolve
+    application = get_wsgi_application()
+    resolve(PATH)
+    startup = (time.perf_counter() - start) * 1000
+    modules = len(sys.modules)
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    from api.views import TitleViewSet
+    from reviews.models import Categories, Title
+
+    from .bench_asgi import wsgi_environ
+
+    # сравниваются профили, а не ограничение частоты запросов
+    TitleViewSet.throttle_classes = []
+    setup_test_environment()
+    connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, keepdb=False
+    )
+    category = Categories.objects.create(name='Фильмы', slug='films')
+    for number in range(args.titles):
+        Title.objects.create(
+            name=f'Произведение {number}', year=2000,
+            description='Описание', category=category,
+        )
+
+    def get():
+        for _ in range(args.requests):
+            body = application(wsgi_environ(), lambda *args: None)
+            b''.join(body)
+            body.close()
+
+    request = measure(get) / args.requests
+    print(json.dumps(
+        {'startup': startup, 'modules': modules, 'request': request}
+    ))
+
+
+def run_profile(profile, args):
+    results = []
+    for _ in range(args.starts):
+        output = subprocess.run(
+            [
+                sys.executable, '-m', 'benchmarks.bench_profiles', '--child',
+                '--titles', str(args.titles),
+                '--requests', str(args.requests),
+            ],
+            cwd=ROOT_DIR,
+            env=dict(os.environ, APP_PROFILE=profile),
+            stdout=subprocess.PIPE,
+            check=True,
+        ).stdout
+        results.append(json.loads(output.decode().splitlines()[-1]))
+    return {
+        key: statistics.median(result[key] for result in results)
+        for key in results[0]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--titles', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--starts', type=int, default=5)
+    parser.add_argument('--child', action='store_true')
+    args = parser.parse_args()
+    if args.child:
+        return child(args)
+
+    for profile in ('full', 'api'):
+        result = run_profile(profile, args)
+        report(f'{profile}: startup (setup + wsgi.application)',
+               result['startup'])
+        report(f'{profile}: loaded modules', result['modules'], 'modules')
+        report(f'{profile}: GET {PATH}', result['request'])
+
+
+if __name__ == '__main__':
+    main()
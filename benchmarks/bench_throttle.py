@@ -0,0 +1,60 @@
+"""Измерение накладных расходов ограничения частоты запросов.
+
+Выводит время одной проверки `RoleRateThrottle` для анонимного
+пользователя и для пользователя с токеном, а также время запроса
+к `/titles/` с ограничением и без него.
+"""
+import argparse
+
+from .common import measure, report, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.test import override_settings
+    from rest_framework.request import Request
+    from rest_framework.test import APIClient, APIRequestFactory
+
+    from api.throttling import RoleRateThrottle
+    from api.views import TitleViewSet
+    from reviews.models import User
+
+    rates = {'anon': '1000000/min', 'user': '1000000/min'}
+    config = dict(settings.REST_FRAMEWORK, DEFAULT_THROTTLE_RATES=rates)
+    user = User.objects.create(username='bench', email='bench@yamdb.fake')
+    view = TitleViewSet()
+    with override_settings(REST_FRAMEWORK=config):
+        for name, request_user in (('anon', None), ('user', user)):
+            request = Request(APIRequestFactory().get('/api/v1/titles/'))
+            request.user = request_user
+
+            def check():
+                for _ in range(args.requests):
+                    RoleRateThrottle().allow_request(request, view)
+
+            report(
+                f'throttle check ({name})',
+                measure(check) / args.requests,
+            )
+
+        client = APIClient()
+
+        def get_titles():
+            for _ in range(args.requests):
+                client.get('/api/v1/titles/')
+
+        with_throttle = measure(get_titles) / args.requests
+        TitleViewSet.throttle_classes = []
+        without_throttle = measure(get_titles) / args.requests
+        report('GET /titles/ with throttle', with_throttle)
+        report('GET /titles/ without throttle', without_throttle)
+        report('overhead per request', with_throttle - without_throttle)
+
+
+if __name__ == '__main__':
+    main()
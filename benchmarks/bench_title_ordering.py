@@ -0,0 +1,82 @@
+"""Бенчмарк сортировки `/api/v1/titles/` по рейтингу.
+
+Сравнивает сортировку по сохранённому полю `Title.rating` (индекс
+`title_rating_idx`) с прежним вариантом через `annotate(Avg(...))`,
+который сортирует результат GROUP BY.
+"""
+import argparse
+import random
+
+from .common import measure, report, setup_django
+
+
+def populate(titles, users):
+    from reviews.models import Categories, Review, Title, User
+
+    category = Categories.objects.create(name='Фильм', slug='films')
+    User.objects.bulk_create(
+        User(username=f'bench{i}', email=f'bench{i}@yamdb.fake')
+        for i in range(users)
+    )
+    authors = list(User.objects.values_list('id', flat=True))
+    Title.objects.bulk_create(
+        Title(
+            name=f'Произведение {i}',
+            year=random.randint(1950, 2020),
+            description='',
+            category=category,
+        )
+        for i in range(titles)
+    )
+    reviews = []
+    for title_id in Title.objects.values_list('id', flat=True).iterator():
+        for author in random.sample(authors, random.randint(0, 5)):
+            reviews.append(Review(
+                title_id=title_id,
+                author_id=author,
+                text='bench',
+                score=random.randint(1, 10),
+            ))
+    Review.objects.bulk_create(reviews)
+    Title.objects.all().update_rating()
+    return len(reviews)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--titles', type=int, default=100000)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db.models import Avg
+    from rest_framework.test import APIClient
+    from reviews.models import Title
+
+    reviews = populate(args.titles, args.users)
+    print(f'titles={args.titles} reviews={reviews} limit={args.limit}')
+
+    persisted = Title.objects.order_by('-rating', '-id')
+    aggregated = (
+        Title.objects.annotate(avg_score=Avg('reviews__score'))
+        .order_by('-avg_score', '-id')
+    )
+    report(
+        'persisted rating, top page',
+        measure(lambda: list(persisted[:args.limit])),
+    )
+    report(
+        'Avg() GROUP BY, top page',
+        measure(lambda: list(aggregated[:args.limit])),
+    )
+    print(persisted[:args.limit].explain())
+
+    client = APIClient()
+    for ordering in ('-rating', 'year', 'name', '-reviews_count'):
+        url = f'/api/v1/titles/?ordering={ordering}&limit={args.limit}'
+        report(f'GET {url}', measure(lambda: client.get(url)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Измерение поиска и пагинации списка пользователей.
+
+Создаёт `--users` пользователей (для оценки на реальном объёме —
+``--users 1000000`` на PostgreSQL) и выводит время запросов
+`/users/?search=`, `/users/?role=` и `/users/?since=`, а также время
+чтения глубокой страницы по ключу и, для сравнения, через OFFSET с
+полным COUNT(*), как было до пагинации по ключу.
+"""
+import argparse
+
+from .common import measure, report, setup_django
+
+
+def create_users(count, batch_size=10000):
+    from reviews.models import User, UserRole
+
+    roles = [role.value for role in UserRole]
+    for start in range(0, count, batch_size):
+        User.objects.bulk_create(
+            User(
+                username=f'User{i:07d}',
+                email=f'user{i:07d}@yamdb.fake',
+                username_normalized=f'user{i:07d}',
+                email_normalized=f'user{i:07d}@yamdb.fake',
+                role=roles[i % len(roles)],
+            )
+            for i in range(start, min(start + batch_size, count))
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--requests', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.test import APIClient
+
+    from reviews.models import User
+
+    create_users(args.users)
+    admin = User.objects.create(
+        username='bench', email='bench@yamdb.fake', role='admin'
+    )
+    client = APIClient()
+    client.force_authenticate(admin)
+    deep = User.objects.order_by('pk').values_list('pk', flat=True)[
+        args.users - 20
+    ]
+
+    cases = (
+        ('GET /users/?search=USER00123', {'search': 'USER00123'}),
+        ('GET /users/?role=moderator', {'role': 'moderator'}),
+        ('GET /users/?since=<deep>', {'since': deep}),
+    )
+    for name, params in cases:
+        def get():
+            for _ in range(args.requests):
+                client.get('/api/v1/users/', data=params)
+
+        report(name, measure(get) / args.requests)
+
+    queryset = User.objects.order_by('pk')
+
+    def keyset_page():
+        for _ in range(args.requests):
+            list(queryset.filter(pk__gt=deep)[:10])
+
+    def offset_page():
+        for _ in range(args.requests):
+            list(queryset[args.users - 20:args.users - 10])
+            queryset.count()
+
+    report('deep page by key', measure(keyset_page) / args.requests)
+    report(
+        'deep page by OFFSET + COUNT(*)',
+        measure(offset_page) / args.requests,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Микробенчмарк быстрого пути сериализации списков.
+
+Сравнивает `Serializer(many=True).data` на экземплярах моделей с
+`represent_rows()` на строках `values()` для страниц разного размера.
+"""
+import argparse
+import random
+
+from .common import measure, report, setup_django
+
+
+def populate(titles):
+    from reviews.models import Categories, Comments, Genres, Review, Title
+    from reviews.models import User
+
+    author = User.objects.create(username='bench', email='bench@yamdb.fake')
+    category = Categories.objects.create(name='Фильм', slug='films')
+    Genres.objects.bulk_create(
+        Genres(name=f'Жанр {i}', slug=f'genre-{i}') for i in range(10)
+    )
+    genres = list(Genres.objects.all())
+    for i in range(titles):
+        title = Title.objects.create(
+            name=f'Произведение {i}',
+            year=2000,
+            description='Описание ' * 20,
+            category=category,
+        )
+        title.genre.set(random.sample(genres, 3))
+        review = Review.objects.create(
+            title=title, author=author, text='Отзыв ' * 50, score=7
+        )
+        Comments.objects.create(
+            review=review, author=author, text='Комментарий ' * 10
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--titles', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from api.serializers import (CommentsSerializer, ReviewSerializer,
+                                 TitleReadSerializer)
+    from reviews.models import Comments, Review, Title
+
+    populate(args.titles)
+    querysets = (
+        (
+            TitleReadSerializer,
+            Title.objects.select_related('category')
+            .prefetch_related('genre').order_by('id'),
+        ),
+        (
+            ReviewSerializer,
+            Review.objects.select_related('title', 'author').order_by('id'),
+        ),
+        (
+            CommentsSerializer,
+            Comments.objects.select_related('author').order_by('id'),
+        ),
+    )
+    for serializer_class, queryset in querysets:
+        name = serializer_class.__name__
+        for size in (10, 100, args.titles):
+            page = queryset[:size]
+            slow = measure(
+                lambda: serializer_class(page.all(), many=True).data
+            )
+            fast = measure(lambda: serializer_class.represent_rows(
+                list(serializer_class.values_queryset(page.all()))
+            ))
+            report(f'{name} page={size} serializer', slow)
+            report(f'{name} page={size} values()', fast)
+            report(f'{name} page={size} speedup', slow / fast, 'x')
+
+
+if __name__ == '__main__':
+    main()
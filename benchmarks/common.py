@@ -0,0 +1,44 @@
+"""Общие утилиты для бенчмарков.
+
+Бенчмарки запускаются из корня репозитория, например:
+``python -m benchmarks.bench_title_ordering --titles 100000``.
+Данные создаются во временной тестовой базе, рабочая база не затрагивается.
+"""
+import os
+import statistics
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.join(ROOT_DIR, 'api_yamdb')
+
+
+def setup_django():
+    """Настраивает Django и создаёт временную тестовую базу."""
+    if PROJECT_DIR not in sys.path:
+        sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    import django
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, keepdb=False
+    )
+
+
+def measure(func, repeat=5):
+    """Возвращает медиану времени выполнения `func` в миллисекундах."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def report(name, value, unit='ms'):
+    print(f'{name:<55} {value:>12.2f} {unit}')
@@ -0,0 +1,56 @@
+import pytest
+
+from .common import create_reviews
+
+
+class Test08TitleOrderingAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_ordering(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        response = client.get('/api/v1/titles/?ordering=-rating')
+        assert response.status_code == 200, (
+            'Проверьте, что при GET запросе `/api/v1/titles/?ordering=-rating` возвращается статус 200'
+        )
+        results = response.json()['results']
+        assert [title['id'] for title in results] == [titles[0]['id'], titles[1]['id']], (
+            'Проверьте, что `/api/v1/titles/` сортируется по убыванию `rating`'
+        )
+        assert results[0]['rating'] == 4, (
+            'Проверьте, что при сортировке `/api/v1/titles/` возвращается правильное значение `rating`'
+        )
+        response = client.get('/api/v1/titles/?ordering=-year')
+        results = response.json()['results']
+        assert [title['year'] for title in results] == [2020, 2000], (
+            'Проверьте, что `/api/v1/titles/` сортируется по убыванию `year`'
+        )
+        response = client.get('/api/v1/titles/?ordering=reviews_count')
+        results = response.json()['results']
+        assert [title['id'] for title in results] == [titles[1]['id'], titles[0]['id']], (
+            'Проверьте, что `/api/v1/titles/` сортируется по количеству отзывов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_rating_updated_on_delete(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/')
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json().get('rating') == 4, (
+            'Проверьте, что после удаления отзыва пересчитывается `rating` произведения '
+            '(средняя оценка 3.5 округляется до 4)'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_write_response_fields(self, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        fields = {'id', 'name', 'year', 'description', 'genre', 'category'}
+        response = admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Другое'})
+        assert response.status_code == 200 and set(response.json()) == fields, (
+            'Проверьте, что ответ на PATCH `/api/v1/titles/{title_id}/` не содержит `rating` и `reviews_count`'
+        )
+        data = {'name': 'Новое', 'year': 2001, 'genre': titles[0]['genre'], 'category': titles[0]['category'],
+                'description': 'Описание'}
+        response = admin_client.post('/api/v1/titles/', data=data, format='json')
+        assert response.status_code == 201 and set(response.json()) == fields, (
+            'Проверьте, что ответ на POST `/api/v1/titles/` не содержит `rating` и `reviews_count`'
+        )
@@ -0,0 +1,80 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_comments
+
+
+class Test09SparseFieldsAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_fields(self, client, admin_client, admin):
+        _, _, titles, _, _ = create_comments(admin_client, admin)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/v1/titles/?fields=id,name,rating')
+        assert response.status_code == 200, (
+            'Проверьте, что при GET запросе `/api/v1/titles/?fields=` возвращается статус 200'
+        )
+        for title in response.json()['results']:
+            assert set(title) == {'id', 'name', 'rating'}, (
+                'Проверьте, что `/api/v1/titles/?fields=` возвращает только запрошенные поля'
+            )
+        sql = ' '.join(query['sql'] for query in queries.captured_queries)
+        assert 'reviews_genres' not in sql and 'reviews_categories' not in sql, (
+            'Проверьте, что для `/api/v1/titles/?fields=` не загружаются незапрошенные связи'
+        )
+        assert '"description"' not in sql, (
+            'Проверьте, что для `/api/v1/titles/?fields=` не загружаются незапрошенные колонки'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_expand(self, client, admin_client, admin):
+        _, _, titles, _, _ = create_comments(admin_client, admin)
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/?expand=genre')
+        data = response.json()
+        assert data['category'] == titles[0]['category'], (
+            'Проверьте, что нераскрытая категория возвращается в виде `slug`'
+        )
+        assert {genre['slug'] for genre in data['genre']} == set(titles[0]['genre']), (
+            'Проверьте, что раскрытые жанры возвращаются объектами'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_review_comment_fields(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/?fields=id,score')
+        for review in response.json()['results']:
+            assert set(review) == {'id', 'score'}, (
+                'Проверьте, что `/api/v1/titles/{title_id}/reviews/?fields=` возвращает только запрошенные поля'
+            )
+        response = client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/?fields=text,author'
+        )
+        for comment in response.json()['results']:
+            assert set(comment) == {'text', 'author'}, (
+                'Проверьте, что `/api/v1/titles/{title_id}/reviews/{review_id}/comments/?fields=` '
+                'возвращает только запрошенные поля'
+            )
+        response = admin_client.get('/api/v1/users/?fields=username,role')
+        for user in response.json()['results']:
+            assert set(user) == {'username', 'role'}, (
+                'Проверьте, что `/api/v1/users/?fields=` возвращает только запрошенные поля'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_fields_ignored_on_write(self, admin_client, admin):
+        from reviews.models import Review
+
+        _, _, titles, _, _ = create_comments(admin_client, admin)
+        Review.objects.filter(author=admin).delete()
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/?fields=id'
+        response = admin_client.post(url, data={'text': 'Сохранённый текст', 'score': 2})
+        assert response.status_code == 201
+        review = Review.objects.get(pk=response.json()['id'])
+        assert (review.text, review.score) == ('Сохранённый текст', 2), (
+            'Проверьте, что `?fields=` не отбрасывает записываемые поля при POST'
+        )
+        response = admin_client.post(url, data={'score': 2})
+        assert response.status_code == 400, (
+            'Проверьте, что при POST с `?fields=` обязательные поля по-прежнему проверяются'
+        )
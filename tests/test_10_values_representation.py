@@ -0,0 +1,55 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from .common import create_comments
+
+
+def render_both(serializer_class, queryset):
+    slow = serializer_class(queryset, many=True).data
+    fast = serializer_class.represent_rows(
+        list(serializer_class.values_queryset(queryset))
+    )
+    return JSONRenderer().render(slow), JSONRenderer().render(fast)
+
+
+class Test10ValuesRepresentation:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_parity(self, admin_client, admin):
+        from api.serializers import (CommentsSerializer, ReviewSerializer,
+                                     TitleReadSerializer)
+        from reviews.models import Comments, Review, Title
+
+        create_comments(admin_client, admin)
+        Title.objects.create(
+            name='Без категории', year=1999, description='',
+            category=None,
+        )
+        querysets = (
+            (TitleReadSerializer, Title.objects.order_by('id')),
+            (ReviewSerializer, Review.objects.order_by('id')),
+            (CommentsSerializer, Comments.objects.order_by('id')),
+        )
+        for serializer_class, queryset in querysets:
+            slow, fast = render_both(serializer_class, queryset)
+            assert slow == fast, (
+                f'Проверьте, что быстрый путь `{serializer_class.__name__}` '
+                'возвращает тот же JSON, что и `to_representation`'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_list_response(self, client, admin_client, admin):
+        from api.serializers import ReviewSerializer
+        from reviews.models import Review
+
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+        expected = ReviewSerializer(
+            Review.objects.filter(title_id=titles[0]['id']), many=True
+        ).data
+        assert response.content.decode().endswith(
+            JSONRenderer().render(expected).decode() + '}'
+        ), (
+            'Проверьте, что список `/api/v1/titles/{title_id}/reviews/` '
+            'совпадает с полным сериализатором'
+        )
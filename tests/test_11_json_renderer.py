@@ -0,0 +1,48 @@
+import datetime
+import decimal
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer as DRFJSONRenderer
+
+
+DATA = {
+    'pub_date': timezone.make_aware(datetime.datetime(2022, 4, 14, 13, 3, 1, 5)),
+    'utc': datetime.datetime(2022, 4, 14, 13, 3, tzinfo=datetime.timezone.utc),
+    'day': datetime.date(2022, 4, 14),
+    'score': decimal.Decimal('7.5'),
+    'detail': gettext_lazy('This field is required.'),
+    'text': 'Отзыв\u2028с переносом\u2029',
+    'results': [{'id': 1, 'rating': None, 'genre': []}],
+}
+
+
+class Test11JSONRenderer:
+
+    @pytest.mark.parametrize('backend', ['json', 'orjson'])
+    def test_01_same_output(self, settings, backend):
+        from api.renderers import JSONRenderer, orjson
+
+        if backend == 'orjson' and orjson is None:
+            pytest.skip('orjson не установлен')
+        settings.JSON_BACKEND = backend
+        assert JSONRenderer().render(DATA) == DRFJSONRenderer().render(DATA), (
+            f'Проверьте, что `JSONRenderer` с бэкендом `{backend}` '
+            'возвращает тот же JSON, что и рендерер DRF'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_parse_json(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/genres/', data={'name': 'Ужасы', 'slug': 'horror'}, format='json'
+        )
+        assert response.status_code == 201, (
+            'Проверьте, что API принимает JSON в теле запроса'
+        )
+        response = admin_client.post(
+            '/api/v1/genres/', data='{"name": ', content_type='application/json'
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что на некорректный JSON возвращается статус 400'
+        )
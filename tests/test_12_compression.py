@@ -0,0 +1,83 @@
+import gzip
+
+import pytest
+
+from .common import create_reviews
+
+
+class Test12Compression:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_gzip(self, client, admin_client, admin, settings):
+        settings.COMPRESSION_MIN_SIZE = 200
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        plain = client.get(url)
+        assert not plain.has_header('Content-Encoding'), (
+            'Проверьте, что без `Accept-Encoding` ответ не сжимается'
+        )
+        response = client.get(url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        assert response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что при `Accept-Encoding: gzip` ответ сжимается gzip'
+        )
+        assert gzip.decompress(response.content) == plain.content, (
+            'Проверьте, что сжатый ответ распаковывается в исходный'
+        )
+        assert 'Accept-Encoding' in response['Vary'], (
+            'Проверьте, что сжатый ответ содержит `Vary: Accept-Encoding`'
+        )
+        response = client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=0')
+        assert not response.has_header('Content-Encoding'), (
+            'Проверьте, что кодировка с весом `q=0` не используется'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_small_and_brotli(self, client, admin_client, admin, settings):
+        settings.COMPRESSION_MIN_SIZE = 200
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        response = client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/?fields=id',
+            HTTP_ACCEPT_ENCODING='gzip',
+        )
+        assert not response.has_header('Content-Encoding'), (
+            'Проверьте, что ответы меньше `COMPRESSION_MIN_SIZE` не сжимаются'
+        )
+        brotli = pytest.importorskip('brotli')
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url, HTTP_ACCEPT_ENCODING='gzip, br')
+        assert response['Content-Encoding'] == 'br', (
+            'Проверьте, что brotli предпочитается gzip'
+        )
+        assert brotli.decompress(response.content) == client.get(url).content
+        response = client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=1, br;q=0.1')
+        assert response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что выбирается кодировка с наибольшим весом `q`'
+        )
+
+    def test_03_streaming(self, rf, settings):
+        from django.http import StreamingHttpResponse
+
+        from api.middleware import CompressionMiddleware
+
+        chunks = [b'{"results": [', b'"x"' * 1000, b']}']
+        middleware = CompressionMiddleware(
+            lambda request: StreamingHttpResponse(iter(chunks), content_type='application/json')
+        )
+        response = middleware(rf.get('/', HTTP_ACCEPT_ENCODING='gzip'))
+        assert response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что потоковые ответы тоже сжимаются'
+        )
+        assert gzip.decompress(b''.join(response.streaming_content)) == b''.join(chunks)
+
+    def test_04_json_only(self, rf, settings):
+        from django.http import HttpResponse
+
+        from api.middleware import CompressionMiddleware
+
+        settings.COMPRESSION_MIN_SIZE = 200
+        page = '<html><input name="csrfmiddlewaretoken" value="token">' + 'x' * 1000 + '</html>'
+        middleware = CompressionMiddleware(lambda request: HttpResponse(page))
+        response = middleware(rf.get('/admin/', HTTP_ACCEPT_ENCODING='gzip'))
+        assert not response.has_header('Content-Encoding'), (
+            'Проверьте, что HTML-страницы, например админка, не сжимаются'
+        )
@@ -0,0 +1,74 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from .common import create_titles
+
+
+def asgi_get(application, path, query_string=b''):
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'path': path,
+        'query_string': query_string,
+        'headers': [(b'host', b'testserver')],
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 12345),
+    }
+    asyncio.run(application(scope, receive, send))
+    body = b''.join(m['body'] for m in messages if m['type'] == 'http.response.body')
+    return messages[0]['status'], body
+
+
+class Test13ASGI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_asgi_titles(self, admin_client):
+        from api_yamdb.asgi import application
+
+        titles, _, _ = create_titles(admin_client)
+        status, body = asgi_get(application, '/api/v1/titles/', b'ordering=id')
+        assert status == 200, (
+            'Проверьте, что `/api/v1/titles/` доступен через `api_yamdb.asgi.application`'
+        )
+        data = json.loads(body)
+        assert [title['id'] for title in data['results']] == [title['id'] for title in titles], (
+            'Проверьте, что через ASGI возвращается тот же список произведений'
+        )
+        status, _ = asgi_get(application, f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+        assert status == 200, (
+            'Проверьте, что `/api/v1/titles/{title_id}/reviews/` доступен через ASGI'
+        )
+
+    def test_02_close_in_same_thread(self):
+        from api_yamdb.asgi_adapter import ASGIHandler
+
+        threads = {}
+
+        class Result:
+            def __iter__(self):
+                threads['iter'] = threading.get_ident()
+                yield b'ok'
+
+            def close(self):
+                threads['close'] = threading.get_ident()
+
+        def wsgi_application(environ, start_response):
+            start_response('200 OK', [('Content-Type', 'text/plain')])
+            return Result()
+
+        status, body = asgi_get(ASGIHandler(wsgi_application, 4), '/')
+        assert status == 200 and body == b'ok'
+        assert threads['close'] == threads['iter'], (
+            'Проверьте, что ответ закрывается в том же потоке, где читается'
+        )
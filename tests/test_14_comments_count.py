@@ -0,0 +1,67 @@
+import io
+
+import pytest
+
+from .common import create_comments
+
+
+class Test14CommentsCount:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_comments_count(self, client, admin_client, admin):
+        comments, reviews, titles, user, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data = client.get(f'{url}{reviews[0]["id"]}/').json()
+        assert data.get('comments_count') == 3, (
+            'Проверьте, что отзыв возвращает `comments_count` — число комментариев'
+        )
+        assert data.get('last_comment_at'), (
+            'Проверьте, что отзыв возвращает `last_comment_at` — дату последнего комментария'
+        )
+        results = {review['id']: review for review in client.get(url).json()['results']}
+        assert results[reviews[1]['id']]['comments_count'] == 0, (
+            'Проверьте, что у отзыва без комментариев `comments_count` равен 0'
+        )
+        assert results[reviews[1]['id']]['last_comment_at'] is None
+
+        admin_client.delete(f'{url}{reviews[0]["id"]}/comments/{comments[0]["id"]}/')
+        assert client.get(f'{url}{reviews[0]["id"]}/').json()['comments_count'] == 2, (
+            'Проверьте, что при удалении комментария уменьшается `comments_count`'
+        )
+        user.delete()
+        data = client.get(f'{url}{reviews[0]["id"]}/').json()
+        assert data['comments_count'] == 1, (
+            'Проверьте, что при удалении автора учитываются удалённые комментарии'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_rebuild_command(self, admin_client, admin):
+        from django.core.management import call_command
+        from reviews.models import Review
+
+        _, reviews, _, _, _ = create_comments(admin_client, admin)
+        Review.objects.update(comments_count=0, last_comment_at=None)
+        call_command('update_comments_stats', stdout=io.StringIO())
+        review = Review.objects.get(pk=reviews[0]['id'])
+        assert review.comments_count == 3 and review.last_comment_at, (
+            'Проверьте, что команда `update_comments_stats` пересчитывает счётчики'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_raw_load(self, admin_client, admin):
+        from django.core import serializers
+        from reviews.models import Change, Comments, Review
+
+        _, reviews, _, _, _ = create_comments(admin_client, admin)
+        review = Review.objects.get(pk=reviews[0]['id'])
+        dump = serializers.serialize('json', [review, *Comments.all_objects.filter(review=review)])
+        review.delete()
+        changes = Change.objects.count()
+        for obj in serializers.deserialize('json', dump):
+            obj.save()
+        assert Review.objects.get(pk=reviews[0]['id']).comments_count == 3, (
+            'Проверьте, что `loaddata` не учитывает загруженные комментарии второй раз'
+        )
+        assert Change.objects.count() == changes, (
+            'Проверьте, что `loaddata` не пишет записи в журнал изменений'
+        )
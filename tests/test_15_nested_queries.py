@@ -0,0 +1,61 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_reviews
+
+# Журналы и очереди, которые пишутся попутно с основной работой запроса
+SIDE_TABLES = ('"reviews_throttlecounter"', '"reviews_change"', '"reviews_subscriber"')
+
+
+def count_queries(func):
+    with CaptureQueriesContext(connection) as context:
+        response = func()
+    return response, [
+        query['sql'] for query in context.captured_queries
+        if not query['sql'].startswith(('BEGIN', 'SAVEPOINT', 'RELEASE'))
+        and not any(table in query['sql'] for table in SIDE_TABLES)
+    ]
+
+
+class Test15NestedQueries:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_review_create_queries(self, admin_client, admin, user):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        client = auth_client(user)
+        response, queries = count_queries(lambda: client.post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/', data={'text': 'Текст', 'score': 5}
+        ))
+        assert response.status_code == 201
+        title_selects = [sql for sql in queries if sql.startswith('SELECT') and 'FROM "reviews_title"' in sql]
+        assert len(title_selects) == 1, (
+            'Проверьте, что при создании отзыва произведение загружается один раз'
+        )
+        assert len(queries) <= 5, (
+            'Проверьте количество запросов к БД при создании отзыва'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comment_create_queries(self, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        response, queries = count_queries(lambda: admin_client.post(url, data={'text': 'Текст'}))
+        assert response.status_code == 201
+        review_selects = [sql for sql in queries if sql.startswith('SELECT') and 'FROM "reviews_review"' in sql]
+        assert len(review_selects) == 1, (
+            'Проверьте, что при создании комментария отзыв и произведение загружаются одним запросом'
+        )
+        assert len(queries) <= 4, (
+            'Проверьте количество запросов к БД при создании комментария'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_wrong_title(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        response = client.get(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        )
+        assert response.status_code == 404, (
+            'Проверьте, что комментарии отзыва недоступны по адресу чужого произведения'
+        )
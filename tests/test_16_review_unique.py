@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_titles
+
+MESSAGE = 'Вы уже оставили отзыв на данное произведение'
+
+
+class Test16ReviewUnique:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_duplicate_without_precheck(self, admin_client, user):
+        titles, _, _ = create_titles(admin_client)
+        client = auth_client(user)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        assert client.post(url, data={'text': 'Первый', 'score': 5}).status_code == 201
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(url, data={'text': 'Второй', 'score': 1})
+        assert response.status_code == 400, (
+            'Проверьте, что нельзя добавить второй отзыв на то же произведение'
+        )
+        assert response.json() == {'non_field_errors': [MESSAGE]}, (
+            'Проверьте текст ошибки при повторном отзыве'
+        )
+        statements = [query['sql'] for query in context.captured_queries if 'reviews_review' in query['sql']]
+        insert = next(i for i, sql in enumerate(statements) if sql.startswith('INSERT'))
+        assert not any(sql.startswith('SELECT') for sql in statements[:insert]), (
+            'Проверьте, что повторный отзыв отсекается ограничением БД без предварительного SELECT'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_concurrent_duplicates(self, admin_client, user):
+        from django.db import connections
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        clients = [auth_client(user) for _ in range(5)]
+        barrier = threading.Barrier(len(clients))
+        statuses = []
+
+        def post(client):
+            barrier.wait()
+            try:
+                statuses.append(client.post(url, data={'text': 'Отзыв', 'score': 5}).status_code)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=post, args=(client,)) for client in clients]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(statuses) == [201] + [400] * (len(clients) - 1), (
+            'Проверьте, что при одновременных запросах создаётся ровно один отзыв, '
+            'а остальные получают статус 400'
+        )
+        assert Review.objects.filter(title_id=titles[0]['id'], author=user).count() == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_review_after_delete(self, admin_client, user):
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        client = auth_client(user)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        review = client.post(url, data={'text': 'Первый', 'score': 5}).json()
+        assert client.delete(f'{url}{review["id"]}/').status_code == 204
+        response = client.post(url, data={'text': 'Снова', 'score': 3})
+        assert response.status_code == 201, (
+            'Проверьте, что после удаления отзыва автор может написать новый'
+        )
+        assert Review.objects.get(title_id=titles[0]['id'], author=user).text == 'Снова'
+        assert client.post(url, data={'text': 'Третий', 'score': 1}).status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_other_integrity_errors(self, admin_client, user):
+        from api.serializers import ReviewSerializer
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title = Title.objects.get(pk=titles[0]['id'])
+        with pytest.raises(IntegrityError):
+            ReviewSerializer().create({'author': user, 'title': title, 'text': None, 'score': 5})
@@ -0,0 +1,50 @@
+import json
+import os
+
+import pytest
+
+
+class Test17ConfirmationDelivery:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_file_transport_async(self, client, settings, tmp_path):
+        from api.delivery import dispatcher
+        from reviews.models import ConfirmationDelivery
+
+        settings.CONFIRMATION_TRANSPORT = 'file'
+        settings.CONFIRMATION_DELIVERY_ASYNC = True
+        settings.CONFIRMATION_FILE_DIR = str(tmp_path)
+        emails = [f'user{i}@yamdb.fake' for i in range(5)]
+        for number, email in enumerate(emails):
+            response = client.post(
+                '/api/v1/auth/signup/', data={'email': email, 'username': f'user{number}'}
+            )
+            assert response.status_code == 200
+        dispatcher.join()
+        deliveries = ConfirmationDelivery.objects.filter(email__in=emails)
+        assert {delivery.status for delivery in deliveries} == {'sent'}, (
+            'Проверьте, что фоновая доставка отмечает коды отправленными'
+        )
+        sent = [json.loads((tmp_path / name).read_text(encoding='utf-8')) for name in os.listdir(tmp_path)]
+        assert sorted(message['email'] for message in sent) == sorted(emails), (
+            'Проверьте, что файловый транспорт сохраняет сообщение для каждого адреса'
+        )
+        assert all(message['body'].startswith('code: ') for message in sent)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_failed_delivery(self, client, settings):
+        from reviews.models import ConfirmationDelivery
+
+        settings.CONFIRMATION_TRANSPORT = 'webhook'
+        settings.CONFIRMATION_WEBHOOK_URL = 'http://127.0.0.1:9/'
+        settings.CONFIRMATION_WEBHOOK_TIMEOUT = 1
+        response = client.post(
+            '/api/v1/auth/signup/', data={'email': 'fail@yamdb.fake', 'username': 'fail'}
+        )
+        assert response.status_code == 503, (
+            'Проверьте, что ошибка синхронной доставки кода возвращается клиенту'
+        )
+        delivery = ConfirmationDelivery.objects.get(email='fail@yamdb.fake')
+        assert delivery.status == 'failed' and delivery.error, (
+            'Проверьте, что неудачная доставка сохраняет статус и текст ошибки'
+        )
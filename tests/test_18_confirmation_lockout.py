@@ -0,0 +1,53 @@
+import pytest
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+URL_SIGNUP = '/api/v1/auth/signup/'
+URL_TOKEN = '/api/v1/auth/token/'
+
+
+def signup(client, username):
+    client.post(URL_SIGNUP, data={'email': f'{username}@yamdb.fake', 'username': username})
+    return mail.outbox[-1].body.split('code: ')[1]
+
+
+class Test18ConfirmationLockout:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_token_updates_only_is_active(self, client):
+        code = signup(client, 'newuser')
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(URL_TOKEN, data={'username': 'newuser', 'confirmation_code': code})
+        assert response.status_code == 200, (
+            'Проверьте, что с верным кодом подтверждения возвращается токен'
+        )
+        writes = [query['sql'] for query in context.captured_queries
+                  if query['sql'].startswith(('UPDATE', 'INSERT', 'DELETE'))
+                  and 'reviews_throttlecounter' not in query['sql']]
+        assert len(writes) == 1 and writes[0].startswith('UPDATE "reviews_user" SET "is_active" = ') \
+            and '"password"' not in writes[0], (
+            'Проверьте, что при выдаче токена обновляется только поле `is_active`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_lockout(self, client, settings):
+        from reviews.models import ConfirmationAttempt, User
+
+        code = signup(client, 'victim')
+        for _ in range(settings.CONFIRMATION_MAX_ATTEMPTS):
+            response = client.post(URL_TOKEN, data={'username': 'victim', 'confirmation_code': 'wrong'})
+            assert response.status_code == 400
+        response = client.post(URL_TOKEN, data={'username': 'victim', 'confirmation_code': code})
+        assert response.status_code == 429, (
+            'Проверьте, что после превышения числа попыток ввод кода блокируется'
+        )
+        assert not User.objects.get(username='victim').is_active, (
+            'Проверьте, что неудачные попытки не изменяют пользователя'
+        )
+        settings.CONFIRMATION_MAX_ATTEMPTS += 1
+        response = client.post(URL_TOKEN, data={'username': 'victim', 'confirmation_code': code})
+        assert response.status_code == 200
+        assert not ConfirmationAttempt.objects.filter(username='victim').exists(), (
+            'Проверьте, что после успешного ввода кода счётчик попыток сбрасывается'
+        )
@@ -0,0 +1,126 @@
+import pytest
+
+URL_TITLES = '/api/v1/titles/'
+URL_CATEGORIES = '/api/v1/categories/'
+
+
+def set_rates(settings, rates):
+    settings.REST_FRAMEWORK = dict(
+        settings.REST_FRAMEWORK, DEFAULT_THROTTLE_RATES=rates
+    )
+
+
+class Test19Throttling:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_anon_limit(self, client, settings):
+        set_rates(settings, {'anon': '2/min', 'user': None, 'moderator': None, 'admin': None})
+        for _ in range(2):
+            assert client.get(URL_TITLES).status_code == 200
+        response = client.get(URL_TITLES)
+        assert response.status_code == 429, (
+            'Проверьте, что анонимные запросы сверх лимита отклоняются'
+        )
+        assert int(response['Retry-After']) > 0, (
+            'Проверьте, что при превышении лимита возвращается заголовок `Retry-After`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_roles(self, client, user_client, moderator_client, admin_client, settings):
+        set_rates(settings, {'anon': '1/min', 'user': '2/min', 'moderator': '3/min', 'admin': None})
+        for api_client, limit in ((client, 1), (user_client, 2), (moderator_client, 3)):
+            for _ in range(limit):
+                assert api_client.get(URL_TITLES).status_code == 200
+            assert api_client.get(URL_TITLES).status_code == 429, (
+                'Проверьте, что лимит запросов зависит от роли пользователя'
+            )
+        for _ in range(5):
+            assert admin_client.get(URL_TITLES).status_code == 200, (
+                'Проверьте, что для администратора ограничение снимается'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_scopes(self, user_client, settings):
+        set_rates(settings, {'anon': None, 'user': '1/min', 'catalog.user': '3/min', 'moderator': None, 'admin': None})
+        for _ in range(3):
+            assert user_client.get(URL_CATEGORIES).status_code == 200, (
+                'Проверьте, что лимит группы эндпоинтов важнее лимита роли'
+            )
+        assert user_client.get(URL_TITLES).status_code == 429, (
+            'Проверьте, что эндпоинты одной группы используют общий счётчик'
+        )
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == 200, (
+            'Проверьте, что у каждой группы эндпоинтов свой счётчик'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_sliding_window(self, client, settings, monkeypatch):
+        from api.throttling import RoleRateThrottle
+
+        set_rates(settings, {'anon': '4/min', 'user': None, 'moderator': None, 'admin': None})
+        now = [650.0]
+        monkeypatch.setattr(RoleRateThrottle, 'timer', lambda self: now[0])
+        for _ in range(4):
+            assert client.get(URL_TITLES).status_code == 200
+        now[0] = 670.0
+        assert client.get(URL_TITLES).status_code == 200
+        now[0] = 671.0
+        assert client.get(URL_TITLES).status_code == 429, (
+            'Проверьте, что запросы прошлого окна учитываются с весом'
+        )
+        now[0] = 700.0
+        assert client.get(URL_TITLES).status_code == 200, (
+            'Проверьте, что вес прошлого окна уменьшается со временем'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_concurrent_hit(self, client, settings, monkeypatch):
+        from reviews.models import ThrottleCounter, ThrottleCounterQuerySet
+
+        set_rates(settings, {'anon': '2/min', 'user': None, 'moderator': None, 'admin': None})
+        assert client.get(URL_TITLES).status_code == 200
+        hit = ThrottleCounterQuerySet.hit
+
+        def concurrent_hit(self, *args):
+            # между проверкой и учётом запроса успевает пройти параллельный
+            hit(self, *args)
+            hit(self, *args)
+
+        monkeypatch.setattr(ThrottleCounterQuerySet, 'hit', concurrent_hit)
+        assert client.get(URL_TITLES).status_code == 429, (
+            'Проверьте, что решение принимается по счётчику после увеличения'
+        )
+        assert ThrottleCounter.objects.get().count == 2, (
+            'Проверьте, что отклонённый запрос не расходует лимит'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_purge(self, client, settings, monkeypatch):
+        from django.core.management import call_command
+
+        from api.throttling import RoleRateThrottle
+        from reviews.models import ThrottleCounter
+
+        set_rates(settings, {'anon': '2/min', 'user': None, 'moderator': None, 'admin': None})
+        now = [650.0]
+        monkeypatch.setattr(RoleRateThrottle, 'timer', lambda self: now[0])
+        assert client.get(URL_TITLES, REMOTE_ADDR='10.0.0.1').status_code == 200
+        monkeypatch.undo()
+        assert client.get(URL_TITLES, REMOTE_ADDR='10.0.0.2').status_code == 200
+        assert ThrottleCounter.objects.count() == 2
+        call_command('purge_throttle_counters')
+        assert list(ThrottleCounter.objects.values_list('count', flat=True)) == [1], (
+            'Проверьте, что `purge_throttle_counters` удаляет только отслужившие окна'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_zero_rate(self, client, settings):
+        set_rates(settings, {'anon': '0/min', 'user': None, 'moderator': None, 'admin': None})
+        response = client.get(URL_TITLES)
+        assert response.status_code == 429, (
+            'Проверьте, что нулевой лимит закрывает эндпоинт'
+        )
+        assert not response.has_header('Retry-After'), (
+            'Проверьте, что при нулевом лимите не возвращается `Retry-After`'
+        )
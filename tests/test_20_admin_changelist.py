@@ -0,0 +1,65 @@
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+
+def create_content(user, start, stop):
+    from reviews.models import Categories, Comments, Review, Title, User
+
+    category = Categories.objects.get_or_create(name='Фильм', slug='films')[0]
+    for i in range(start, stop):
+        author = User.objects.create(username=f'author{i}', email=f'author{i}@yamdb.fake')
+        title = Title.objects.create(name=f'Произведение {i}', year=2000, category=category)
+        review = Review.objects.create(title=title, author=author, text='Отзыв ' * 100, score=5)
+        Comments.objects.create(review=review, author=user, text='Комментарий ' * 100)
+
+
+def changelist_queries(user_superuser, url):
+    client = Client()
+    client.force_login(user_superuser)
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return response, len(context.captured_queries)
+
+
+class Test20AdminChangelist:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('url', ['/admin/reviews/review/', '/admin/reviews/comments/'])
+    def test_01_queries_do_not_grow(self, user_superuser, url):
+        create_content(user_superuser, 0, 2)
+        _, few = changelist_queries(user_superuser, url)
+        create_content(user_superuser, 2, 10)
+        _, many = changelist_queries(user_superuser, url)
+        assert many == few, (
+            'Проверьте, что число запросов списка в админке не зависит от числа строк'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_text_preview(self, user_superuser):
+        create_content(user_superuser, 0, 1)
+        response, _ = changelist_queries(user_superuser, '/admin/reviews/comments/')
+        content = response.content.decode()
+        assert 'Комментарий ' * 4 in content and 'Комментарий ' * 10 not in content, (
+            'Проверьте, что в списке комментариев текст обрезается'
+        )
+        assert 'Отзыв ' * 10 not in content, (
+            'Проверьте, что в списке комментариев текст отзыва обрезается'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_estimated_count(self, user_superuser, monkeypatch):
+        from reviews.admin import EstimatedCountPaginator
+        from reviews.models import Review
+
+        create_content(user_superuser, 0, 5)
+        monkeypatch.setattr(EstimatedCountPaginator, 'count_limit', 3)
+        paginator = EstimatedCountPaginator(Review.objects.all(), 2)
+        with CaptureQueriesContext(connection) as context:
+            assert paginator.count == 3, (
+                'Проверьте, что пагинатор админки не считает строки дальше `count_limit`'
+            )
+        assert 'LIMIT 3' in context.captured_queries[0]['sql']
+        assert EstimatedCountPaginator(Review.objects.filter(score=1), 2).count == 0
@@ -0,0 +1,88 @@
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_comments
+
+URL_MODERATION = '/api/v1/moderation/'
+
+
+class Test21BulkModeration:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_permissions(self, client, user_client, moderator_client, admin_client):
+        assert client.post(URL_MODERATION, data={'reviews': [1]}).status_code == 401
+        assert user_client.post(URL_MODERATION, data={'reviews': [1]}).status_code == 403, (
+            'Проверьте, что массовая модерация недоступна пользователю'
+        )
+        response = moderator_client.post(URL_MODERATION, data={}, format='json')
+        assert response.status_code == 400, (
+            'Проверьте, что без автора и списка id возвращается ошибка'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_delete_by_author(self, admin_client, admin):
+        from reviews.models import Comments, Review, Title
+
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        response = admin_client.post(URL_MODERATION, data={'author': user.username}, format='json')
+        assert response.status_code == 200
+        assert response.json() == {'reviews': 1, 'comments': 1}
+        assert not Review.objects.filter(author=user).exists()
+        assert not Comments.objects.filter(author=user).exists()
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert title.reviews_count == 2 and title.rating == 4.5, (
+            'Проверьте, что после массового удаления рейтинг произведения пересчитывается'
+        )
+        review = Review.objects.get(pk=reviews[0]['id'])
+        assert review.comments_count == 2, (
+            'Проверьте, что после массового удаления счётчик комментариев пересчитывается'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_delete_by_ids(self, admin_client, admin):
+        from reviews.models import Comments, Review, Title
+
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        data = {'reviews': [reviews[1]['id'], reviews[2]['id']], 'comments': [comments[0]['id']]}
+        with CaptureQueriesContext(connection) as context:
+            response = auth_client(moderator).post(URL_MODERATION, data=data, format='json')
+        assert response.status_code == 200
+        assert response.json() == {'reviews': 2, 'comments': 1}
+        assert list(Review.objects.values_list('pk', flat=True)) == [reviews[0]['id']]
+        assert Comments.objects.count() == 2
+        assert Title.objects.get(pk=titles[0]['id']).rating == 5
+        title_updates = [query for query in context.captured_queries
+                         if query['sql'].startswith('UPDATE "reviews_title"')]
+        assert len(title_updates) == 1, (
+            'Проверьте, что рейтинг пересчитывается одним запросом на все затронутые произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_admin_actions(self, admin_client, admin, user_superuser):
+        from reviews.models import Comments, Review
+
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        client = Client()
+        client.force_login(user_superuser)
+        response = client.post('/admin/reviews/comments/', data={
+            'action': 'delete_authors_content', '_selected_action': [comments[2]['id']],
+        })
+        assert response.status_code == 302
+        assert not Review.objects.filter(author=moderator).exists()
+        assert not Comments.objects.filter(author=moderator).exists(), (
+            'Проверьте, что действие админки удаляет все записи авторов выбранных комментариев'
+        )
+        response = client.post('/admin/reviews/review/', data={
+            'action': 'soft_delete_selected', '_selected_action': [reviews[0]['id']],
+        })
+        assert response.status_code == 302
+        assert not Review.objects.filter(pk=reviews[0]['id']).exists()
+        response = client.post('/admin/reviews/review/', data={
+            'action': 'restore_selected', '_selected_action': [reviews[0]['id']],
+        })
+        assert response.status_code == 302
+        assert Review.objects.filter(pk=reviews[0]['id']).exists(), (
+            'Проверьте, что действие админки восстанавливает удалённые отзывы'
+        )
@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from .common import create_comments
+
+URL_MODERATION = '/api/v1/moderation/'
+
+
+class Test22Visibility:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_soft_delete_review(self, admin_client, admin):
+        from reviews.models import Comments, Review, Title
+
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = admin_client.delete(f'{url}{reviews[1]["id"]}/')
+        assert response.status_code == 204
+        assert Review.all_objects.filter(pk=reviews[1]['id'], visibility='deleted').exists(), (
+            'Проверьте, что отзыв удаляется мягко и остаётся в базе'
+        )
+        assert Comments.all_objects.count() == 3
+        ids = [review['id'] for review in admin_client.get(url).json()['results']]
+        assert reviews[1]['id'] not in ids, (
+            'Проверьте, что удалённый отзыв не попадает в список'
+        )
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert title.reviews_count == 2 and title.rating == 4.5, (
+            'Проверьте, что рейтинг учитывает только видимые отзывы'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_hide_comments(self, admin_client, admin):
+        from reviews.models import Comments, Review
+
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        response = admin_client.post(
+            URL_MODERATION, data={'comments': [comments[1]['id']], 'visibility': 'hidden'}, format='json'
+        )
+        assert response.json() == {'reviews': 0, 'comments': 1}
+        assert Comments.all_objects.get(pk=comments[1]['id']).visibility == 'hidden'
+        assert Review.objects.get(pk=reviews[0]['id']).comments_count == 2, (
+            'Проверьте, что скрытые комментарии не учитываются в счётчике'
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        response = admin_client.delete(f'{url}{comments[1]["id"]}/')
+        assert response.status_code == 404, (
+            'Проверьте, что скрытый комментарий недоступен через API'
+        )
+        response = admin_client.delete(f'{url}{comments[0]["id"]}/')
+        assert response.status_code == 204
+        assert Review.objects.get(pk=reviews[0]['id']).comments_count == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_purge(self, admin_client, admin, settings):
+        from reviews.models import Comments, Review
+
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        Review.objects.filter(pk=reviews[0]['id']).update(
+            visibility='deleted', visibility_changed=timezone.now() - timedelta(days=31)
+        )
+        Review.objects.filter(pk=reviews[1]['id']).update(
+            visibility='deleted', visibility_changed=timezone.now()
+        )
+        Comments.objects.filter(pk=comments[2]['id']).update(visibility='hidden')
+        call_command('purge_deleted', batch_size=1)
+        assert set(Review.all_objects.values_list('pk', flat=True)) == {reviews[1]['id'], reviews[2]['id']}, (
+            'Проверьте, что команда purge_deleted удаляет только давно удалённые отзывы'
+        )
+        assert not Comments.all_objects.exists(), (
+            'Проверьте, что вместе с отзывом физически удаляются его комментарии'
+        )
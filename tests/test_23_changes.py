@@ -0,0 +1,147 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from .common import create_comments, create_titles
+
+URL_CHANGES = '/api/v1/changes/'
+
+
+def changes(client, since=0, **params):
+    response = client.get(URL_CHANGES, data={'since': since, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+class Test23Changes:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_feed(self, client, admin_client, admin, settings):
+        settings.CHANGES_COMMIT_LAG = timedelta(0)
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        data = changes(client)
+        recorded = {(row['model'], row['object_id'], row['action']) for row in data['results']}
+        assert ('title', titles[0]['id'], 'created') in recorded
+        assert ('review', reviews[0]['id'], 'created') in recorded
+        assert ('comments', comments[0]['id'], 'created') in recorded
+        assert {('genres', 'created'), ('categories', 'created')} <= {row[::2] for row in recorded}, (
+            'Проверьте, что в журнал попадают изменения всех отслеживаемых моделей'
+        )
+        sequences = [row['sequence'] for row in data['results']]
+        assert sequences == sorted(sequences) and data['last'] == sequences[-1]
+
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/')
+        admin_client.patch(f'/api/v1/titles/{titles[1]["id"]}/', data={'name': 'Новое имя'})
+        data = changes(client, data['last'])
+        assert [(row['model'], row['object_id'], row['action']) for row in data['results']] == [
+            ('review', reviews[1]['id'], 'deleted'),
+            ('title', titles[0]['id'], 'updated'),
+            ('title', titles[1]['id'], 'updated'),
+        ], (
+            'Проверьте, что `since` возвращает только изменения после переданной позиции, '
+            'а пересчёт рейтинга записывается как изменение произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_keyset_pages(self, client, admin_client, settings):
+        settings.CHANGES_COMMIT_LAG = timedelta(0)
+        create_titles(admin_client)
+        total = changes(client)['results']
+        seen = []
+        data = changes(client, limit=2)
+        while True:
+            seen.extend(row['sequence'] for row in data['results'])
+            assert len(data['results']) <= 2
+            if data['next'] is None:
+                break
+            response = client.get(data['next'])
+            data = response.json()
+        assert seen == [row['sequence'] for row in total], (
+            'Проверьте, что страницы по ссылке `next` проходят журнал целиком без пропусков'
+        )
+        assert client.get(URL_CHANGES, data={'since': 'abc'}).status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_compaction(self, admin_client, settings):
+        from reviews.models import Change
+
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Новое имя'})
+        Change.objects.update(created=timezone.now() - timedelta(days=10))
+        before = Change.objects.filter(model='title', object_id=titles[0]['id']).count()
+        assert before > 1
+        call_command('compact_changes')
+        rows = list(Change.objects.filter(model='title', object_id=titles[0]['id']))
+        assert len(rows) == 1 and rows[0].action == 'updated', (
+            'Проверьте, что сжатие оставляет только последнюю запись по объекту'
+        )
+        settings.CHANGES_RETENTION = timedelta(days=5)
+        call_command('compact_changes')
+        assert not Change.objects.exists(), (
+            'Проверьте, что записи старше CHANGES_RETENTION удаляются'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_rating_changes(self, client, admin_client, admin, settings):
+        settings.CHANGES_COMMIT_LAG = timedelta(0)
+        from reviews.models import Review, Visibility
+
+        titles, _, _ = create_titles(admin_client)
+        last = changes(client)['last']
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        review = admin_client.post(url, data={'text': 'Отзыв', 'score': 7}).json()
+        data = changes(client, last)
+        assert ('title', titles[0]['id'], 'updated') in {
+            (row['model'], row['object_id'], row['action']) for row in data['results']
+        }, 'Проверьте, что новый отзыв записывает изменение рейтинга произведения в журнал'
+        Review.objects.filter(pk=review['id']).set_visibility(Visibility.hidden)
+        data = changes(client, data['last'])
+        assert [(row['model'], row['object_id'], row['action']) for row in data['results']] == [
+            ('review', review['id'], 'deleted'),
+            ('title', titles[0]['id'], 'updated'),
+        ], 'Проверьте, что скрытие отзыва записывает изменение произведения в журнал'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_comment_stats_changes(self, client, admin_client, admin, settings):
+        settings.CHANGES_COMMIT_LAG = timedelta(0)
+        from reviews.models import Comments, Review, Visibility
+
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        last = changes(client)['last']
+        comment = admin_client.post(url, data={'text': 'Ещё комментарий'}).json()
+        data = changes(client, last)
+        assert {(row['model'], row['object_id'], row['action']) for row in data['results']} == {
+            ('comments', comment['id'], 'created'),
+            ('review', reviews[0]['id'], 'updated'),
+        }, 'Проверьте, что новый комментарий записывает изменение счётчика отзыва в журнал'
+        Comments.objects.filter(pk=comment['id']).set_visibility(Visibility.hidden)
+        data = changes(client, data['last'])
+        assert ('review', reviews[0]['id'], 'updated') in {
+            (row['model'], row['object_id'], row['action']) for row in data['results']
+        }, 'Проверьте, что скрытие комментария записывает изменение отзыва в журнал'
+        Review.objects.filter(pk=reviews[1]['id']).update(comments_count=5)
+        call_command('update_comments_stats')
+        data = changes(client, data['last'])
+        assert [(row['model'], row['object_id'], row['action']) for row in data['results']] == [
+            ('review', reviews[1]['id'], 'updated'),
+        ], 'Проверьте, что пересчёт счётчиков записывает в журнал только изменившиеся отзывы'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_commit_lag(self, client, admin_client, settings):
+        from reviews.models import Change
+
+        settings.CHANGES_COMMIT_LAG = timedelta(seconds=60)
+        create_titles(admin_client)
+        young = Change.objects.order_by('pk')[3]
+        Change.objects.filter(pk__lt=young.pk).update(created=timezone.now() - timedelta(minutes=5))
+        data = changes(client)
+        assert [row['sequence'] for row in data['results']] == list(
+            Change.objects.filter(pk__lt=young.pk).values_list('pk', flat=True)
+        ), 'Проверьте, что журнал не отдаёт записи моложе `CHANGES_COMMIT_LAG` и все после них'
+        Change.objects.filter(pk=young.pk + 1).update(created=timezone.now() - timedelta(minutes=5))
+        assert changes(client, data['last'])['results'] == [], (
+            'Проверьте, что курсор не перешагивает свежую запись'
+        )
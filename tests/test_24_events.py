@@ -0,0 +1,111 @@
+import hashlib
+import hmac
+from datetime import timedelta
+
+import pytest
+from django.db import transaction
+from django.utils import timezone
+
+from .common import create_reviews
+from .webhook_stub import WebhookStub
+
+
+def subscribe(url, **kwargs):
+    from reviews.models import Subscriber
+
+    return Subscriber.objects.create(name='partner', url=url, **kwargs)
+
+
+class Test24Events:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_enqueue_on_commit(self, admin_client, admin):
+        from reviews.models import EventDelivery, Title
+
+        subscribe('http://127.0.0.1:1/', events='review.created')
+        try:
+            with transaction.atomic():
+                Title.objects.create(name='Произведение', year=2000)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        assert not EventDelivery.objects.exists(), (
+            'Проверьте, что события откатанной транзакции не попадают в очередь'
+        )
+        reviews, _, _, _ = create_reviews(admin_client, admin)
+        assert sorted(EventDelivery.objects.values_list('event', flat=True)) == ['review.created'] * 3, (
+            'Проверьте, что подписчик получает только выбранные события'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_batched_delivery(self, admin_client, admin, settings):
+        from api.events import SIGNATURE_HEADER, deliver_pending
+        from reviews.models import EventDelivery
+
+        settings.EVENTS_BATCH_SIZE = 2
+        with WebhookStub() as stub:
+            subscribe(stub.url, secret='key')
+            reviews, _, _, _ = create_reviews(admin_client, admin)
+            total = EventDelivery.objects.count()
+            assert deliver_pending() == total
+        assert all(len(request['json']['events']) <= 2 for request in stub.requests), (
+            'Проверьте, что события отправляются пачками не больше EVENTS_BATCH_SIZE'
+        )
+        assert len(stub.requests) == (total + 1) // 2
+        assert {event['data']['id'] for event in stub.events if event['event'] == 'review.created'} == {
+            review['id'] for review in reviews
+        }
+        request = stub.requests[0]
+        digest = hmac.new(b'key', request['body'], hashlib.sha256).hexdigest()
+        assert request['headers'][SIGNATURE_HEADER] == f'sha256={digest}', (
+            'Проверьте, что тело запроса подписывается ключом подписчика'
+        )
+        assert not EventDelivery.objects.exclude(status='sent').exists()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_retry_and_dead_letter(self, settings):
+        from api.events import deliver_pending
+        from reviews.models import EventDelivery, Title
+
+        settings.EVENTS_MAX_ATTEMPTS = 2
+        with WebhookStub(statuses=[500, 500]) as stub:
+            subscribe(stub.url)
+            Title.objects.create(name='Произведение', year=2000)
+            assert deliver_pending() == 1
+            delivery = EventDelivery.objects.get()
+            assert delivery.status == 'pending' and delivery.attempts == 1
+            assert delivery.next_attempt_at > timezone.now(), (
+                'Проверьте, что повтор откладывается с задержкой'
+            )
+            assert deliver_pending() == 0
+            EventDelivery.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+            assert deliver_pending() == 1
+        delivery.refresh_from_db()
+        assert delivery.status == 'dead' and delivery.attempts == 2, (
+            'Проверьте, что после EVENTS_MAX_ATTEMPTS попыток событие уходит в dead'
+        )
+        assert len(stub.requests) == 2 and stub.events == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_claim_once(self):
+        from api.events import claim, mark_failed
+        from reviews.models import EventDelivery, Title
+
+        subscribe('http://127.0.0.1:9/')
+        for number in range(3):
+            Title.objects.create(name=f'Произведение {number}', year=2000)
+        first = claim(2)
+        second = claim(10)
+        assert len(first) == 2 and len(second) == 1 and not (
+            {delivery.pk for delivery in first} & {delivery.pk for delivery in second}
+        ), 'Проверьте, что каждую отправку захватывает только один процесс'
+        assert claim(10) == []
+        EventDelivery.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        reclaimed = claim(10)
+        assert len(reclaimed) == 3, (
+            'Проверьте, что отправки снова доступны после окончания аренды'
+        )
+        mark_failed(first, 'ошибка')
+        assert not EventDelivery.objects.filter(attempts__gt=0).exists(), (
+            'Проверьте, что результат отправки с истёкшей арендой не записывается'
+        )
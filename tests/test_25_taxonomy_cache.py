@@ -0,0 +1,75 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+TAXONOMY_TABLES = ('"reviews_genres"', '"reviews_categories"')
+
+
+def taxonomy_queries(func):
+    with CaptureQueriesContext(connection) as context:
+        response = func()
+    return response, [
+        query['sql'] for query in context.captured_queries
+        if any(table in query['sql'] for table in TAXONOMY_TABLES)
+    ]
+
+
+class Test25TaxonomyCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_warm_cache(self, admin_client, settings):
+        settings.TAXONOMY_CACHE_CHECK_INTERVAL = 60
+        titles, categories, genres = create_titles(admin_client)
+        data = {'name': 'Новое', 'year': 2001, 'genre': [genres[0]['slug']], 'category': categories[0]['slug'],
+                'description': 'Описание'}
+        response, queries = taxonomy_queries(lambda: admin_client.post('/api/v1/titles/', data=data))
+        assert response.status_code == 201
+        # витрина произведений читает жанры при обновлении строки, но
+        # поиска по slug в базе быть не должно
+        assert [sql for sql in queries if '."slug" IN' in sql or '."slug" =' in sql] == [], (
+            'Проверьте, что slug жанров и категорий при создании произведения ищутся в кэше'
+        )
+        response, queries = taxonomy_queries(lambda: admin_client.get('/api/v1/titles/'))
+        assert queries == [], (
+            'Проверьте, что список произведений берёт жанры и категории из кэша'
+        )
+        result = {title['name']: title for title in response.json()['results']}
+        assert result['Поворот туда']['genre'] == [
+            {'name': genre['name'], 'slug': genre['slug']} for genre in genres[:2]
+        ]
+        assert result['Проект']['category'] == categories[1]
+        response, queries = taxonomy_queries(
+            lambda: admin_client.get('/api/v1/titles/', data={'genre': genres[2]['slug']})
+        )
+        assert queries == [] and [title['name'] for title in response.json()['results']] == ['Проект'], (
+            'Проверьте, что фильтр по жанру использует кэш'
+        )
+        response = admin_client.get('/api/v1/titles/', data={'genre': genres[2]['slug'].upper()})
+        assert [title['name'] for title in response.json()['results']] == ['Проект'], (
+            'Проверьте, что фильтр по жанру не учитывает регистр, как `icontains`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_invalidation(self, admin_client, settings):
+        from api.taxonomy import genres_cache
+        from reviews.models import CacheVersion, Genres
+
+        settings.TAXONOMY_CACHE_CHECK_INTERVAL = 60
+        titles, categories, genres = create_titles(admin_client)
+        version = CacheVersion.objects.current('genres')
+        admin_client.delete(f'/api/v1/genres/{genres[2]["slug"]}/')
+        assert CacheVersion.objects.current('genres') == version + 1, (
+            'Проверьте, что удаление жанра увеличивает общую версию кэша'
+        )
+        assert genres_cache.get_by_slug(genres[2]['slug']) is None
+
+        # Изменение в другом процессе: данные и версия меняются без сигналов.
+        Genres.objects.filter(slug=genres[0]['slug']).update(name='Другое имя')
+        CacheVersion.objects.bump('genres')
+        assert genres_cache.get_by_slug(genres[0]['slug']).name == genres[0]['name']
+        settings.TAXONOMY_CACHE_CHECK_INTERVAL = 0
+        assert genres_cache.get_by_slug(genres[0]['slug']).name == 'Другое имя', (
+            'Проверьте, что кэш перечитывается после смены общей версии'
+        )
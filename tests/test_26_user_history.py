@@ -0,0 +1,121 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .common import auth_client, create_comments
+
+
+def create_history(user, count):
+    from reviews.models import Comments, Review, Title
+
+    reviews = []
+    for i in range(count):
+        title = Title.objects.create(name=f'Произведение {i}', year=2000)
+        review = Review.objects.create(title=title, author=user, text=f'Отзыв {i}', score=5)
+        Comments.objects.create(review=review, author=user, text=f'Комментарий {i}')
+        reviews.append(review)
+    # одинаковая дата у части записей проверяет порядок по id внутри даты
+    Review.objects.filter(pk__in=[review.pk for review in reviews[:3]]).update(pub_date=timezone.now())
+    return reviews
+
+
+def walk(client, url, limit):
+    results, pages = [], 0
+    response = client.get(url, data={'limit': limit})
+    while True:
+        assert response.status_code == 200
+        data = response.json()
+        results.extend(data['results'])
+        pages += 1
+        if data['next'] is None:
+            return results, pages
+        response = client.get(data['next'])
+
+
+class Test26UserHistory:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_user_reviews_and_comments(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        response = client.get(f'/api/v1/users/{user.username}/reviews/')
+        assert response.status_code == 200, (
+            'Проверьте, что история отзывов пользователя доступна без токена'
+        )
+        assert response.json() == {'next': None, 'results': [{
+            'id': reviews[1]['id'],
+            'title_id': titles[0]['id'],
+            'title': titles[0]['name'],
+            'text': 'qwerty123',
+            'score': 3,
+            'pub_date': response.json()['results'][0]['pub_date'],
+            'comments_count': 0,
+        }]}
+        response = client.get(f'/api/v1/users/{user.username}/comments/')
+        assert response.status_code == 200
+        result = response.json()['results']
+        assert [(row['id'], row['review_id'], row['title_id'], row['title']) for row in result] == [
+            (comments[1]['id'], reviews[0]['id'], titles[0]['id'], titles[0]['name'])
+        ], 'Проверьте, что в истории комментариев есть отзыв и название произведения'
+        assert client.get('/api/v1/users/nobody/reviews/').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_me(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        assert client.get('/api/v1/users/me/reviews/').status_code == 401
+        response = auth_client(moderator).get('/api/v1/users/me/reviews/')
+        assert response.status_code == 200
+        assert [row['id'] for row in response.json()['results']] == [reviews[2]['id']], (
+            'Проверьте, что `/users/me/reviews/` возвращает отзывы текущего пользователя'
+        )
+        response = auth_client(moderator).get('/api/v1/users/me/comments/')
+        assert [row['id'] for row in response.json()['results']] == [comments[2]['id']]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_keyset_pages(self, client, admin):
+        from reviews.models import Review, Visibility
+
+        reviews = create_history(admin, 7)
+        Review.objects.filter(pk=reviews[6].pk).set_visibility(Visibility.deleted)
+        url = f'/api/v1/users/{admin.username}/reviews/'
+        results, pages = walk(client, url, 2)
+        expected = list(
+            Review.objects.filter(author=admin).order_by('-pub_date', '-pk').values_list('pk', flat=True)
+        )
+        assert len(expected) == 6
+        assert [row['id'] for row in results] == expected, (
+            'Проверьте, что страницы истории идут от новых записей к старым без пропусков и повторов'
+        )
+        assert pages == 3
+        results, _ = walk(client, f'/api/v1/users/{admin.username}/comments/', 4)
+        assert len(results) == 6, (
+            'Проверьте, что в истории нет комментариев к удалённым отзывам'
+        )
+        Review.objects.filter(pk=reviews[5].pk).set_visibility(Visibility.hidden)
+        results, _ = walk(client, f'/api/v1/users/{admin.username}/comments/', 4)
+        assert reviews[5].pk not in [row['review_id'] for row in results], (
+            'Проверьте, что в истории нет комментариев к скрытым отзывам'
+        )
+        results, _ = walk(auth_client(admin), '/api/v1/users/me/comments/', 4)
+        assert len(results) == 5
+        response = client.get(url, data={'cursor': 'broken'})
+        assert response.status_code == 400, (
+            'Проверьте, что неверный курсор возвращает ошибку'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_queries(self, client, admin):
+        create_history(admin, 5)
+        url = f'/api/v1/users/{admin.username}/reviews/'
+        first = client.get(url, data={'limit': 2}).json()
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(first['next'])
+        assert response.status_code == 200
+        queries = [query['sql'] for query in context.captured_queries
+                   if '"reviews_review"' in query['sql']]
+        assert len(queries) == 1, (
+            'Проверьте, что страница истории читается одним запросом'
+        )
+        assert 'OFFSET' not in queries[0] and '"reviews_title"."name"' in queries[0], (
+            'Проверьте, что история пагинируется по ключу, а название произведения берётся через JOIN'
+        )
@@ -0,0 +1,87 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+URL_USERS = '/api/v1/users/'
+
+
+def create_users():
+    from reviews.models import User
+
+    User.objects.create(username='Alice', email='Alice@Yamdb.fake')
+    User.objects.create(username='alina', email='second@yamdb.fake', role='moderator')
+    User.objects.create(username='bob', email='ALbert@yamdb.fake')
+    User.objects.create(username='carol', email='carol@yamdb.fake', role='moderator')
+
+
+def usernames(response):
+    assert response.status_code == 200
+    return [row['username'] for row in response.json()['results']]
+
+
+class Test27UserSearch:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_search(self, admin_client):
+        create_users()
+        assert usernames(admin_client.get(URL_USERS, data={'search': 'AL'})) == ['Alice', 'alina', 'bob'], (
+            'Проверьте, что поиск идёт по началу username и email без учёта регистра'
+        )
+        assert usernames(admin_client.get(URL_USERS, data={'search': 'lic'})) == []
+        with CaptureQueriesContext(connection) as context:
+            admin_client.get(URL_USERS, data={'search': 'Car'})
+        queries = [query['sql'] for query in context.captured_queries
+                   if 'FROM "reviews_user"' in query['sql'] and 'LIKE' in query['sql']]
+        assert queries and all('"username_normalized" LIKE' in sql for sql in queries), (
+            'Проверьте, что поиск использует колонки в нижнем регистре'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_normalized_columns(self):
+        from reviews.models import User
+
+        user = User.objects.create(username='Dave', email='Dave@Yamdb.fake')
+        user.email = 'NEW@yamdb.fake'
+        user.save(update_fields=['email'])
+        user.refresh_from_db()
+        assert (user.username_normalized, user.email_normalized) == ('dave', 'new@yamdb.fake'), (
+            'Проверьте, что колонки для поиска обновляются при сохранении пользователя'
+        )
+        User.objects.filter(pk=user.pk).update(username='Frank')
+        User.objects.bulk_create([User(username='Grace', email='Grace@Yamdb.fake')])
+        assert set(User.objects.values_list('username_normalized', 'email_normalized')) == {
+            ('frank', 'new@yamdb.fake'), ('grace', 'grace@yamdb.fake'),
+        }, 'Проверьте, что колонки для поиска заполняются при update() и bulk_create()'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_role_filter(self, admin_client):
+        create_users()
+        assert usernames(admin_client.get(URL_USERS, data={'role': 'moderator'})) == ['alina', 'carol'], (
+            'Проверьте, что список пользователей фильтруется по роли'
+        )
+        assert admin_client.get(URL_USERS, data={'role': 'king'}).status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_keyset_pages(self, admin_client):
+        from reviews.models import User
+
+        create_users()
+        response = admin_client.get(URL_USERS, data={'limit': 2})
+        data = response.json()
+        assert data['count'] == User.objects.count() and data['previous'] is None
+        seen = [row['username'] for row in data['results']]
+        while data['next']:
+            assert 'since=' in data['next']
+            data = admin_client.get(data['next']).json()
+            seen.extend(row['username'] for row in data['results'])
+        assert seen == list(User.objects.order_by('pk').values_list('username', flat=True)), (
+            'Проверьте, что страницы списка пользователей идут по id без пропусков и повторов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_offset_rejected(self, admin_client):
+        create_users()
+        response = admin_client.get(URL_USERS, data={'limit': 2, 'offset': 2})
+        assert response.status_code == 400 and 'offset' in response.json(), (
+            'Проверьте, что `offset` в списке пользователей отклоняется, а не игнорируется'
+        )
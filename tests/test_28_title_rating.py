@@ -0,0 +1,70 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+URL_TITLES = '/api/v1/titles/'
+
+
+def create_rated_titles():
+    from reviews.models import Genres, Review, Title, User
+
+    horror = Genres.objects.create(name='Ужасы', slug='horror')
+    comedy = Genres.objects.create(name='Комедия', slug='comedy')
+    drama = Genres.objects.create(name='Драма', slug='drama')
+    authors = [
+        User.objects.create(username=f'critic{i}', email=f'critic{i}@yamdb.fake')
+        for i in range(3)
+    ]
+    titles = []
+    for name, genres, scores in (
+        ('Оба жанра', [horror, comedy], [4, 5]),
+        ('Комедия', [comedy], [3, 4]),
+        ('Драма', [drama], [2, 3, 3]),
+    ):
+        title = Title.objects.create(name=name, year=2000, description='Описание')
+        title.genre.set(genres)
+        for author, score in zip(authors, scores):
+            Review.objects.create(title=title, author=author, text='Отзыв', score=score)
+        titles.append(title)
+    return titles
+
+
+class Test28TitleRating:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rounding(self, client):
+        titles = create_rated_titles()
+        expected = {titles[0].pk: 5, titles[1].pk: 4, titles[2].pk: 3}
+        response = client.get(URL_TITLES)
+        assert {row['id']: row['rating'] for row in response.json()['results']} == expected, (
+            'Проверьте, что `rating` округляется до целого, а половина — вверх'
+        )
+        response = client.get(URL_TITLES, data={'fields': 'id,rating'})
+        assert {row['id']: row['rating'] for row in response.json()['results']} == expected, (
+            'Проверьте, что `rating` округляется одинаково при выборе полей через `?fields=`'
+        )
+        response = client.get(f'{URL_TITLES}{titles[1].pk}/')
+        assert response.json()['rating'] == 4
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_genre_filter_without_duplicates(self, client):
+        titles = create_rated_titles()
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(URL_TITLES, data={'genre': 'o'})
+        data = response.json()
+        assert data['count'] == 2 and sorted(row['id'] for row in data['results']) == [
+            titles[0].pk, titles[1].pk
+        ], 'Проверьте, что произведение с несколькими подходящими жанрами выдаётся один раз'
+        assert [row['rating'] for row in data['results'] if row['id'] == titles[0].pk] == [5], (
+            'Проверьте, что фильтр по жанрам не искажает рейтинг'
+        )
+        queries = [query['sql'] for query in context.captured_queries
+                   if query['sql'].startswith('SELECT') and 'FROM "reviews_title"' in query['sql']]
+        assert queries
+        for sql in queries:
+            assert 'GROUP BY' not in sql and '"reviews_review"' not in sql, (
+                'Проверьте, что список произведений читает сохранённый рейтинг без агрегации отзывов'
+            )
+            assert 'JOIN "reviews_title_genre"' not in sql and 'IN (SELECT' in sql, (
+                'Проверьте, что фильтр по жанрам проверяет связи подзапросом, а не JOIN'
+            )
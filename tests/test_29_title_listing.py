@@ -0,0 +1,90 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_comments
+
+URL_TITLES = '/api/v1/titles/'
+QUERIES = (
+    {},
+    {'fields': 'id,name,rating'},
+    {'expand': 'genre'},
+    {'genre': 'o'},
+    {'category': 'films'},
+    {'ordering': '-rating'},
+    {'ordering': 'reviews_count', 'limit': 1},
+)
+
+
+def both_modes(client, settings, url, params=None):
+    settings.TITLES_READ_MODEL = False
+    expected = client.get(url, data=params)
+    settings.TITLES_READ_MODEL = True
+    actual = client.get(url, data=params)
+    assert actual.status_code == expected.status_code == 200
+    return expected.json(), actual.json()
+
+
+class Test29TitleListing:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_same_responses(self, client, admin_client, admin, settings):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        for params in QUERIES:
+            expected, actual = both_modes(client, settings, URL_TITLES, params)
+            assert actual == expected, (
+                f'Проверьте, что витрина отдаёт тот же ответ `/api/v1/titles/` для {params}'
+            )
+        expected, actual = both_modes(client, settings, f'{URL_TITLES}{titles[0]["id"]}/')
+        assert actual == expected
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_maintained_on_writes(self, client, admin_client, admin, settings):
+        from reviews.models import TitleListing
+
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        admin_client.patch(f'{URL_TITLES}{titles[0]["id"]}/', data={'name': 'Другое название'})
+        admin_client.delete(f'{URL_TITLES}{titles[1]["id"]}/')
+        admin_client.delete('/api/v1/genres/comedy/')
+        admin_client.delete('/api/v1/categories/films/')
+        admin_client.post('/api/v1/moderation/', data={'author': user.username}, format='json')
+        admin_client.post('/api/v1/genres/', data={'name': 'Новый', 'slug': 'new'})
+        admin_client.patch(f'{URL_TITLES}{titles[0]["id"]}/', data={'genre': ['new', 'horror']}, format='json')
+        listing = TitleListing.objects.get(pk=titles[0]['id'])
+        assert listing.name == 'Другое название' and listing.rating == 4.5 and listing.reviews_count == 2, (
+            'Проверьте, что витрина обновляется вместе с произведением и рейтингом'
+        )
+        assert not TitleListing.objects.filter(pk=titles[1]['id']).exists()
+        expected, actual = both_modes(client, settings, URL_TITLES)
+        assert actual == expected, (
+            'Проверьте, что витрина обновляется при изменении жанров и категорий'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_single_scan(self, client, admin_client, admin, settings):
+        create_comments(admin_client, admin)
+        settings.TITLES_READ_MODEL = True
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(URL_TITLES, data={'ordering': '-rating'})
+        assert response.status_code == 200
+        queries = [query['sql'] for query in context.captured_queries
+                   if query['sql'].startswith('SELECT') and '"reviews_titlelisting"' in query['sql']]
+        assert len(queries) == 2 and all('JOIN' not in sql for sql in queries), (
+            'Проверьте, что список из витрины читается без JOIN: страница и её размер'
+        )
+        assert not any('"reviews_title"' in query['sql'] for query in context.captured_queries)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_refresh_command(self, client, admin_client, admin, settings):
+        from reviews.models import TitleListing
+
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        expected, _ = both_modes(client, settings, URL_TITLES)
+        TitleListing.objects.all().delete()
+        TitleListing.objects.create(id=10 ** 6, name='Лишняя', year=2000, description='')
+        call_command('refresh_title_listing', batch_size=1)
+        _, actual = both_modes(client, settings, URL_TITLES)
+        assert actual == expected, (
+            'Проверьте, что команда `refresh_title_listing` пересобирает витрину'
+        )
@@ -0,0 +1,168 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from api.jobs import claim, job, run
+
+calls = []
+
+
+@job(name='tests.record')
+def record(value):
+    calls.append(value)
+
+
+@job(name='tests.broken', max_attempts=2)
+def broken():
+    raise ValueError('сломано')
+
+
+class Test30Jobs:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_priority_and_schedule(self):
+        from reviews.models import Job
+
+        calls.clear()
+        record.delay('low')
+        record.enqueue(['high'], priority=5)
+        later = record.enqueue(['later'], run_at=timezone.now() + timedelta(hours=1))
+        assert [claimed.name for claimed in claim(10)] == ['tests.record', 'tests.record']
+        Job.objects.update(run_at=timezone.now() - timedelta(seconds=1), claimed_by='')
+        Job.objects.filter(pk=later.pk).update(run_at=timezone.now() + timedelta(hours=1))
+        call_command('run_workers', concurrency=1, once=True)
+        assert calls == ['high', 'low'], (
+            'Проверьте, что задачи выполняются по приоритету, а отложенные ждут своего времени'
+        )
+        assert set(Job.objects.values_list('status', flat=True)) == {'done', 'pending'}
+        assert Job.objects.get(pk=later.pk).status == 'pending'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_claim_once(self):
+        from reviews.models import Job
+
+        for value in range(5):
+            record.delay(value)
+        first = claim(3)
+        second = claim(10)
+        assert len(first) == 3 and len(second) == 2
+        assert not {claimed.pk for claimed in first} & {claimed.pk for claimed in second}, (
+            'Проверьте, что одну задачу не захватывают два обработчика'
+        )
+        assert claim(10) == []
+        stale = first[0]
+        Job.objects.filter(pk=stale.pk).update(run_at=timezone.now() - timedelta(seconds=1))
+        reclaimed = claim(10)
+        assert [claimed.pk for claimed in reclaimed] == [stale.pk], (
+            'Проверьте, что после окончания аренды задача снова доступна'
+        )
+        run(stale)
+        assert Job.objects.get(pk=stale.pk).status == 'pending', (
+            'Проверьте, что обработчик с истёкшей арендой не отмечает задачу выполненной'
+        )
+        run(reclaimed[0])
+        assert Job.objects.get(pk=stale.pk).status == 'done'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_retries(self):
+        from reviews.models import Job
+
+        created = broken.delay()
+        run(claim(1)[0])
+        retried = Job.objects.get(pk=created.pk)
+        assert retried.status == 'pending' and retried.attempts == 1 and retried.run_at > timezone.now(), (
+            'Проверьте, что неудачная задача откладывается для повтора'
+        )
+        assert 'сломано' in retried.error
+        Job.objects.filter(pk=created.pk).update(run_at=timezone.now())
+        run(claim(1)[0])
+        assert Job.objects.get(pk=created.pk).status == 'failed', (
+            'Проверьте, что после `max_attempts` попыток задача получает статус `failed`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_confirmation_jobs(self, client, settings, tmp_path):
+        from reviews.models import ConfirmationDelivery, Job
+
+        settings.CONFIRMATION_TRANSPORT = 'file'
+        settings.CONFIRMATION_DELIVERY_JOBS = True
+        settings.CONFIRMATION_FILE_DIR = str(tmp_path)
+        emails = [f'worker{i}@yamdb.fake' for i in range(4)]
+        for number, email in enumerate(emails):
+            response = client.post('/api/v1/auth/signup/', data={'email': email, 'username': f'worker{number}'})
+            assert response.status_code == 200
+        assert Job.objects.filter(name='api.delivery.deliver_confirmation').count() == 4, (
+            'Проверьте, что при CONFIRMATION_DELIVERY_JOBS коды ставятся в очередь задач'
+        )
+        assert set(ConfirmationDelivery.objects.values_list('status', flat=True)) == {'pending'}
+        call_command('run_workers', concurrency=2, once=True)
+        assert set(ConfirmationDelivery.objects.values_list('status', flat=True)) == {'sent'}, (
+            'Проверьте, что `run_workers` отправляет коды из очереди'
+        )
+        assert len(list(tmp_path.iterdir())) == 4
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_confirmation_job_retried(self, client, settings, tmp_path):
+        from reviews.models import ConfirmationDelivery, Job
+
+        settings.CONFIRMATION_TRANSPORT = 'file'
+        settings.CONFIRMATION_DELIVERY_JOBS = True
+        blocker = tmp_path / 'blocker'
+        blocker.write_text('')
+        settings.CONFIRMATION_FILE_DIR = str(blocker / 'codes')
+        response = client.post('/api/v1/auth/signup/', data={'email': 'retry@yamdb.fake', 'username': 'retry'})
+        assert response.status_code == 200
+        call_command('run_workers', concurrency=1, once=True)
+        queued = Job.objects.get(name='api.delivery.deliver_confirmation')
+        assert queued.status == 'pending' and queued.attempts == 1 and queued.error, (
+            'Проверьте, что неудачная отправка кода оставляет задачу для повтора'
+        )
+        assert ConfirmationDelivery.objects.get().status == 'failed'
+        settings.CONFIRMATION_FILE_DIR = str(tmp_path / 'codes')
+        Job.objects.update(run_at=timezone.now())
+        call_command('run_workers', concurrency=1, once=True)
+        assert Job.objects.get().status == 'done'
+        assert ConfirmationDelivery.objects.get().status == 'sent', (
+            'Проверьте, что повторная попытка задачи отправляет код'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_confirmation_code_not_queued(self, client, settings, tmp_path):
+        import json
+
+        from reviews.models import Job
+
+        settings.CONFIRMATION_TRANSPORT = 'file'
+        settings.CONFIRMATION_DELIVERY_JOBS = True
+        settings.CONFIRMATION_FILE_DIR = str(tmp_path)
+        data = {'email': 'queued@yamdb.fake', 'username': 'queued'}
+        assert client.post('/api/v1/auth/signup/', data=data).status_code == 200
+        assert 'code' not in Job.objects.get().payload, (
+            'Проверьте, что код подтверждения не сохраняется в очереди задач'
+        )
+        call_command('run_workers', concurrency=1, once=True)
+        message = json.loads(next(tmp_path.iterdir()).read_text(encoding='utf-8'))
+        code = message['body'].split('code: ')[1]
+        response = client.post(
+            '/api/v1/auth/token/', data={'username': 'queued', 'confirmation_code': code}
+        )
+        assert response.status_code == 200, (
+            'Проверьте, что код, созданный задачей очереди, принимается при получении токена'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_purge_jobs(self):
+        from api.tasks import purge_jobs
+        from reviews.models import Job
+
+        old = timezone.now() - timedelta(days=30)
+        kept = [record.delay('новая'), record.delay('ждёт')]
+        Job.objects.filter(pk=kept[0].pk).update(status='done', finished_at=timezone.now())
+        for status in ('done', 'failed'):
+            Job.objects.filter(pk=record.delay(status).pk).update(status=status, finished_at=old)
+        purge_jobs()
+        assert sorted(Job.objects.values_list('pk', flat=True)) == [job.pk for job in kept], (
+            'Проверьте, что `purge_jobs` удаляет только старые завершённые задачи'
+        )
@@ -0,0 +1,78 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+
+CHECK = '''
+import json, sys
+import django
+django.setup()
+from django.conf import settings
+from django.db import connection
+from django.test import Client
+from django.urls import Resolver404, resolve
+try:
+    resolve('/admin/')
+    admin_url = True
+except Resolver404:
+    admin_url = False
+connection.settings_dict['TEST']['NAME'] = ''
+connection.creation.create_test_db(verbosity=0)
+response = Client().get('/api/v1/titles/')
+print(json.dumps({
+    'apps': settings.INSTALLED_APPS,
+    'middleware': settings.MIDDLEWARE,
+    'admin_url': admin_url,
+    'status': response.status_code,
+    'content_type': response['Content-Type'],
+    'modules': [name for name in (
+        'reviews.admin', 'django.contrib.sessions.models',
+        'django.contrib.messages.storage.session', 'django.contrib.staticfiles',
+    ) if name in sys.modules],
+}))
+'''
+
+
+def run_profile(profile):
+    env = dict(
+        os.environ,
+        APP_PROFILE=profile,
+        DJANGO_SETTINGS_MODULE='api_yamdb.settings',
+        SECRET_KEY='test',
+        PYTHONPATH=str(settings.BASE_DIR),
+    )
+    output = subprocess.run(
+        [sys.executable, '-W', 'ignore', '-c', CHECK],
+        cwd=str(settings.BASE_DIR), env=env, stdout=subprocess.PIPE, check=True,
+    ).stdout
+    return json.loads(output.decode().splitlines()[-1])
+
+
+class Test31ApiProfile:
+
+    def test_01_api_profile(self):
+        result = run_profile('api')
+        assert not {
+            'django.contrib.admin', 'django.contrib.sessions', 'django.contrib.messages',
+            'django.contrib.staticfiles', 'rest_framework.authtoken',
+        } & set(result['apps']), (
+            'Проверьте, что в профиле `api` не подключаются админка, сессии, сообщения и статика'
+        )
+        assert not any('sessions' in name or 'csrf' in name or 'messages' in name
+                       for name in result['middleware']), (
+            'Проверьте, что в профиле `api` нет middleware сессий, CSRF и сообщений'
+        )
+        assert not result['admin_url'], 'Проверьте, что в профиле `api` нет адреса `/admin/`'
+        assert result['modules'] == [], (
+            'Проверьте, что в профиле `api` не загружаются модули админки и сессий'
+        )
+        assert result['status'] == 200 and result['content_type'] == 'application/json'
+
+    def test_02_full_profile(self):
+        result = run_profile('full')
+        assert 'django.contrib.admin' in result['apps'] and result['admin_url'], (
+            'Проверьте, что профиль `full` по умолчанию сохраняет админку'
+        )
+        assert result['status'] == 200
@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+
+LAZY_MODULES = (
+    'rest_framework_simplejwt.tokens',
+    'django.contrib.auth.tokens',
+    'concurrent.futures',
+)
+
+CHECK = '''
+import sys
+import django
+django.setup()
+from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
+get_wsgi_application()
+get_resolver().url_patterns
+print(','.join(name for name in {modules} if name in sys.modules))
+'''
+
+
+class Test32ProfileStartup:
+
+    def test_01_command(self):
+        out = StringIO()
+        call_command('profile_startup', urls=True, repeat=1, limit=50, prefix=['api'], stdout=out)
+        lines = out.getvalue().splitlines()
+        assert lines[0].startswith('Холодный старт wsgi.application:'), (
+            'Проверьте, что `profile_startup` выводит время холодного старта'
+        )
+        modules = [line.split()[-1] for line in lines[2:]]
+        assert 'api.views' in modules and all(
+            name == 'api' or name.startswith('api.') for name in modules
+        ), 'Проверьте, что `profile_startup --prefix` показывает только модули с префиксом'
+
+    def test_02_lazy_imports(self):
+        env = dict(
+            os.environ,
+            APP_PROFILE='api',
+            DJANGO_SETTINGS_MODULE='api_yamdb.settings',
+            SECRET_KEY='test',
+        )
+        output = subprocess.run(
+            [sys.executable, '-W', 'ignore', '-c', CHECK.format(modules=LAZY_MODULES)],
+            cwd=str(settings.BASE_DIR), env=env, stdout=subprocess.PIPE, check=True,
+            universal_newlines=True,
+        ).stdout
+        assert output.strip() == '', (
+            'Проверьте, что токены, почта и пул потоков импортируются только при использовании'
+        )
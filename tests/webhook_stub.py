@@ -0,0 +1,56 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class WebhookStub:
+    """
+    Локальный HTTP-сервер для проверки рассылки событий: запоминает
+    принятые запросы и отвечает кодами из `statuses` по порядку, а когда
+    они закончатся — 200.
+
+        with WebhookStub(statuses=[500]) as stub:
+            Subscriber.objects.create(name='stub', url=stub.url)
+    """
+
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                with stub.lock:
+                    status = stub.statuses.pop(0) if stub.statuses else 200
+                    stub.requests.append({
+                        'status': status,
+                        'headers': dict(self.headers),
+                        'body': body,
+                        'json': json.loads(body),
+                    })
+                self.send_response(status)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @property
+    def events(self):
+        return [
+            event
+            for request in self.requests if request['status'] == 200
+            for event in request['json']['events']
+        ]